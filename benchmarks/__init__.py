@@ -0,0 +1 @@
+"""Benchmarks for the ShipEngine SDK, run them with `python -m benchmarks.<name>`."""
@@ -0,0 +1,86 @@
+"""
+Measure the per-call overhead the ShipEngineClient adds on top of the network.
+
+The session's transport is replaced by an adapter answering every request with a canned
+response, so the numbers only cover preparing the request, sending it through `requests`
+and checking the response::
+
+    python -m benchmarks.request_overhead --calls 20000
+"""
+
+import argparse
+import time
+from typing import Callable, Dict
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+
+from shipengine import ShipEngineConfig
+from shipengine.http_client import ShipEngineClient
+
+CANNED_BODY = b'{"carriers": [], "request_id": "benchmark"}'
+
+
+class CannedAdapter(BaseAdapter):
+    """A transport adapter that never touches the network."""
+
+    def send(self, request, **kwargs) -> Response:
+        response = Response()
+        response.status_code = 200
+        response._content = CANNED_BODY
+        response.request = request
+        response.url = request.url
+        response.headers["Content-Type"] = "application/json"
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def stub_client(config: ShipEngineConfig) -> ShipEngineClient:
+    """A ShipEngineClient whose sessions answer every request from a `CannedAdapter`."""
+    client = ShipEngineClient()
+    build_session = client.sessions._build_session
+
+    def build_canned_session(config: ShipEngineConfig):
+        session = build_session(config=config)
+        session.mount("http://", CannedAdapter())
+        session.mount("https://", CannedAdapter())
+        return session
+
+    client.sessions._build_session = build_canned_session
+    return client
+
+
+def measure(call: Callable[[], object], calls: int) -> float:
+    """Return the mean wall time of `call()` in microseconds."""
+    for _ in range(min(calls, 1000)):
+        call()
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def run(calls: int) -> Dict[str, float]:
+    config = ShipEngineConfig({"api_key": "TEST_benchmark", "coalesce_requests": False})
+    client = stub_client(config)
+    body = {"shipment_id": "se-28529731", "rate_options": {"carrier_ids": ["se-656171"]}}
+    return {
+        "get": measure(lambda: client.get(endpoint="v1/carriers", config=config), calls),
+        "post": measure(
+            lambda: client.post(endpoint="v1/rates", config=config, params=body), calls
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=10000, help="calls per method")
+    args = parser.parse_args()
+    for method, micros in run(calls=args.calls).items():
+        print(f"{method:>6}: {micros:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
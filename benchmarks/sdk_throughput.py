@@ -0,0 +1,368 @@
+"""
+Measure the throughput and per-call cost of every ShipEngine method calling the API, without the
+network.
+
+Each method is called against a `StubTransport`, or a `StubServer` with `--server`, answering
+with canned fixture responses encoded once, or replaying a cassette with `--cassette`, so the
+numbers cover the SDK alone: building and encoding the request, rate limiting, retries,
+decoding and error checks. Methods returning an iterator, such as `create_labels_bulk` or
+`iter_labels`, are timed until it is exhausted. Calls are timed
+sequentially (`sync`), from a thread pool (`threaded`) and with `AsyncShipEngine` (`async`)::
+
+    python -m benchmarks.sdk_throughput --calls 2000 --output baseline.json
+    python -m benchmarks.sdk_throughput --compare baseline.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import inspect
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from shipengine import AsyncShipEngine, ShipEngine
+from shipengine.testing import (
+    ReplayTransport,
+    StubResponse,
+    StubServer,
+    StubTransport,
+    fixtures,
+)
+from shipengine.testing.server import latency_distribution
+from shipengine.version import __version__
+
+CARRIER_IDS = [account["carrier_id"] for account in fixtures.CARRIERS]
+ADDRESS = {
+    "address_line1": "4 Jersey St",
+    "city_locality": "Boston",
+    "state_province": "MA",
+    "postal_code": "02215",
+    "country_code": "US",
+}
+SHIPMENT = {
+    "carrier_id": CARRIER_IDS[1],
+    "service_code": "ups_ground",
+    "ship_from": dict(ADDRESS, name="Warehouse"),
+    "ship_to": dict(ADDRESS, name="Customer", address_line1="1 Main St"),
+    "packages": [{"weight": {"value": 20, "unit": "ounce"}}],
+}
+ESTIMATE = {
+    "carrier_ids": CARRIER_IDS,
+    "from_country_code": "US",
+    "from_postal_code": "78756",
+    "to_country_code": "US",
+    "to_postal_code": "02215",
+    "weight": {"value": 20, "unit": "ounce"},
+}
+BULK_SIZE = 10
+"""The labels bought by each `create_labels_bulk` call and the shipments of each batch."""
+BATCH = fixtures.get_batch("v1/batches/se-1", None)
+
+
+def ids(i: int) -> List[str]:
+    return [f"se-{i}-{n}" for n in range(BULK_SIZE)]
+
+
+Arguments = Callable[[int], Tuple[Any, ...]]
+
+METHODS: Dict[str, Arguments] = {
+    "list_carriers": lambda i: (),
+    "get_rates_from_shipment": lambda i: (
+        {"shipment": SHIPMENT, "rate_options": {"carrier_ids": CARRIER_IDS[:1]}},
+    ),
+    "get_rate_estimate": lambda i: (ESTIMATE,),
+    "shop_rates": lambda i: ({"shipment": SHIPMENT}, CARRIER_IDS),
+    "create_label_from_shipment": lambda i: ({"shipment": SHIPMENT},),
+    "create_label_from_rate_id": lambda i: (f"se-{i}", {"label_format": "pdf"}),
+    "track_package_by_label_id": lambda i: (f"se-{i}",),
+    "track_package_by_carrier_code_and_tracking_number": lambda i: ("ups", f"1Z{i:016d}"),
+    # Distinct addresses, so every call misses the address validation cache.
+    "validate_addresses": lambda i: ([dict(ADDRESS, address_line1=f"{i} Jersey St")],),
+    "void_label_by_label_id": lambda i: (f"se-{i}", None),
+    "list_labels_by_tracking_number": lambda i: (f"1Z{i:016d}",),
+    # A fresh catalog every call, rather than the cached one.
+    "get_carrier_catalog": lambda i: (True,),
+    "create_labels_bulk": lambda i: (ids(i),),
+    "iter_labels": lambda i: (),
+    "iter_shipments": lambda i: (),
+    "create_batch": lambda i: (ids(i),),
+    "add_to_batch": lambda i: (f"se-{i}", ids(i)),
+    "process_batch": lambda i: (f"se-{i}",),
+    "get_batch": lambda i: (f"se-{i}",),
+    "wait_for_batch": lambda i: (f"se-{i}",),
+    "run_batch": lambda i: (ids(i),),
+    "iter_batch_labels": lambda i: (f"se-{i}",),
+    "iter_batch_errors": lambda i: (f"se-{i}",),
+    "download_batch_labels": lambda i: (BATCH,),
+}
+"""The arguments of the `i`th call of each public method."""
+
+CALL_NUMBERS = itertools.count()
+"""Numbers every call, so that no two calls share arguments and hit the SDK caches."""
+
+SAMPLE_ENDPOINTS = {
+    "GET v1/carriers": ("v1/carriers", None),
+    "POST v1/rates": ("v1/rates", {"shipment": SHIPMENT, "rate_options": {}}),
+    "POST v1/rates/estimate": ("v1/rates/estimate", ESTIMATE),
+    "POST v1/labels": ("v1/labels", {"shipment": SHIPMENT}),
+    "POST v1/labels/rates/{id}": ("v1/labels/rates/se-1", {}),
+    "GET v1/labels": ("v1/labels?tracking_number=1Z1", None),
+    "GET v1/labels/{id}/track": ("v1/labels/se-1/track", None),
+    "PUT v1/labels/{id}/void": ("v1/labels/se-1/void", None),
+    "GET v1/tracking": ("v1/tracking?carrier_code=ups&tracking_number=1Z1", None),
+    "POST v1/addresses/validate": ("v1/addresses/validate", [ADDRESS]),
+    "GET v1/shipments": ("v1/shipments", None),
+    "POST v1/batches": ("v1/batches", {"shipment_ids": ["se-1"]}),
+    "POST v1/batches/{id}/add": ("v1/batches/se-1/add", {"shipment_ids": ["se-1"]}),
+    "POST v1/batches/{id}/process/labels": ("v1/batches/se-1/process/labels", {}),
+    "GET v1/batches/{id}": ("v1/batches/se-1", None),
+    "GET v1/batches/{id}/errors": ("v1/batches/se-1/errors", None),
+    "GET v1/downloads/{id}/{id}/{id}": ("v1/downloads/1/se-1/batch-1.pdf", None),
+}
+
+
+def canned_transport(latency: Optional[str]) -> StubTransport:
+    """A `StubTransport` serving each fixture response rendered and encoded once."""
+    routes = {
+        route: StubResponse(fixtures.ROUTES[route](endpoint, body))
+        for route, (endpoint, body) in SAMPLE_ENDPOINTS.items()
+    }
+    return StubTransport(routes=routes, latency=latency_distribution(latency or "0", seed=1))
+
+
+def consume(result: Any) -> Any:
+    """Exhaust the iterator a streaming method returns, so its requests are timed as well."""
+    if isinstance(result, Iterator):
+        deque(result, maxlen=0)
+    return result
+
+
+async def aconsume(result: Any) -> Any:
+    """Await the result of an `AsyncShipEngine` method, or exhaust its async iterator."""
+    if inspect.isawaitable(result):
+        return await result
+    async for _ in result:
+        pass
+
+
+def summarize(durations: List[float], wall: float, cpu: float) -> Dict[str, float]:
+    """Calls per second, latency percentiles in milliseconds and CPU microseconds per call."""
+    cuts = statistics.quantiles(durations, n=100, method="inclusive")
+    return {
+        "calls_per_second": len(durations) / wall,
+        "p50_ms": cuts[49] * 1e3,
+        "p95_ms": cuts[94] * 1e3,
+        "p99_ms": cuts[98] * 1e3,
+        "cpu_us_per_call": cpu / len(durations) * 1e6,
+    }
+
+
+def timed(call: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    call()
+    return time.perf_counter() - started
+
+
+def run_sync(shipengine: ShipEngine, method: str, calls: int, **kwargs: Any) -> Dict[str, float]:
+    bound, arguments = getattr(shipengine, method), METHODS[method]
+    cpu, wall = time.process_time(), time.perf_counter()
+    numbers = [next(CALL_NUMBERS) for _ in range(calls)]
+    durations = [timed(lambda: consume(bound(*arguments(i)))) for i in numbers]
+    return summarize(durations, time.perf_counter() - wall, time.process_time() - cpu)
+
+
+def run_threaded(
+    shipengine: ShipEngine, method: str, calls: int, threads: int, **kwargs: Any
+) -> Dict[str, float]:
+    bound, arguments = getattr(shipengine, method), METHODS[method]
+    numbers = [next(CALL_NUMBERS) for _ in range(calls)]
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        cpu, wall = time.process_time(), time.perf_counter()
+        durations = list(
+            pool.map(lambda i: timed(lambda: consume(bound(*arguments(i)))), numbers, chunksize=16)
+        )
+        wall = time.perf_counter() - wall
+    return summarize(durations, wall, time.process_time() - cpu)
+
+
+def run_async(
+    shipengine: AsyncShipEngine,
+    method: str,
+    calls: int,
+    concurrency: int,
+    loop: asyncio.AbstractEventLoop,
+    **kwargs: Any,
+) -> Dict[str, float]:
+    bound, arguments = getattr(shipengine, method), METHODS[method]
+    numbers = [next(CALL_NUMBERS) for _ in range(calls)]
+
+    async def timed_call(i: int, slots: asyncio.Semaphore) -> float:
+        async with slots:
+            started = time.perf_counter()
+            await aconsume(bound(*arguments(i)))
+            return time.perf_counter() - started
+
+    async def run() -> List[float]:
+        slots = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(timed_call(i, slots) for i in numbers))
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    durations = loop.run_until_complete(run())
+    return summarize(durations, time.perf_counter() - wall, time.process_time() - cpu)
+
+
+def allocations(shipengine: ShipEngine, method: str, calls: int) -> Dict[str, float]:
+    """
+    The memory each sequential call allocates, traced with `tracemalloc`: the peak above the
+    memory in use before the call, and what the call leaves allocated behind it.
+    """
+    bound, arguments = getattr(shipengine, method), METHODS[method]
+    peaks, retained = list(), 0
+    tracemalloc.start()
+    try:
+        for _ in range(calls):
+            args = arguments(next(CALL_NUMBERS))
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            consume(bound(*args))
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained += current - before
+    finally:
+        tracemalloc.stop()
+    return {
+        "alloc_peak_kib_per_call": statistics.mean(peaks) / 1024,
+        "alloc_retained_b_per_call": retained / calls,
+    }
+
+
+RUNNERS = {"sync": run_sync, "threaded": run_threaded, "async": run_async}
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.cassette:
+        transport = ReplayTransport(args.cassette, latency_scale=args.latency_scale)
+    else:
+        transport = canned_transport(args.latency)
+    config: Dict[str, Any] = {
+        "api_key": "TEST_benchmark",
+        "coalesce_requests": False,
+        "max_concurrency": args.threads,
+        "pool_maxsize": max(args.threads, args.concurrency),
+    }
+    server = StubServer(transport).start() if args.server else None
+    config.update({"base_uri": server.url} if server else {"transport": transport})
+    loop = asyncio.new_event_loop()
+    clients = {"sync": ShipEngine(config), "async": AsyncShipEngine(config)}
+    try:
+        results = run_methods(args, clients, loop)
+    finally:
+        clients["sync"].close()
+        loop.run_until_complete(clients["async"].close())
+        loop.close()
+        if server is not None:
+            server.stop()
+    return {"environment": environment(args), "results": results}
+
+
+def run_methods(
+    args: argparse.Namespace, clients: Dict[str, Any], loop: asyncio.AbstractEventLoop
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    options = dict(threads=args.threads, concurrency=args.concurrency, loop=loop)
+    results: Dict[str, Dict[str, Dict[str, float]]] = {mode: dict() for mode in args.modes}
+    for method in args.methods:
+        for mode in args.modes:
+            client = clients["async" if mode == "async" else "sync"]
+            # A warm-up round fills the connection pools and the caches of the SDK.
+            RUNNERS[mode](client, method, min(args.calls, 100), **options)
+            results[mode][method] = RUNNERS[mode](client, method, args.calls, **options)
+            print(f"{mode:>8} {method}: {format_result(results[mode][method])}")
+        if "sync" in args.modes and args.alloc_calls:
+            results["sync"][method].update(allocations(clients["sync"], method, args.alloc_calls))
+    return results
+
+
+def environment(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "sdk_version": __version__,
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "platform": platform.platform(),
+        "target": "server" if args.server else args.cassette or "transport",
+        "latency": args.latency or "0",
+        "calls": args.calls,
+        "threads": args.threads,
+        "concurrency": args.concurrency,
+    }
+
+
+def format_result(result: Dict[str, float]) -> str:
+    return (
+        f"{result['calls_per_second']:9.0f} calls/s  p50 {result['p50_ms']:7.3f} ms  "
+        f"p95 {result['p95_ms']:7.3f} ms  p99 {result['p99_ms']:7.3f} ms  "
+        f"cpu {result['cpu_us_per_call']:7.1f} us/call"
+    )
+
+
+def regressions(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float) -> List[str]:
+    """The methods whose throughput fell, or CPU time per call grew, by more than `tolerance`."""
+    found = list()
+    for mode, methods in current["results"].items():
+        for method, result in methods.items():
+            before = baseline["results"].get(mode, dict()).get(method)
+            if before is None:
+                continue
+            speed = result["calls_per_second"] / before["calls_per_second"]
+            cpu = result["cpu_us_per_call"] / before["cpu_us_per_call"]
+            if speed < 1 - tolerance or cpu > 1 + tolerance:
+                found.append(f"{mode} {method}: {speed:.2f}x calls/s, {cpu:.2f}x cpu/call")
+    return found
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=1000, help="calls per method and mode")
+    parser.add_argument("--alloc-calls", type=int, default=100, help="calls traced for memory")
+    parser.add_argument("--methods", nargs="+", choices=sorted(METHODS), default=list(METHODS))
+    parser.add_argument("--modes", nargs="+", choices=["sync", "threaded", "async"])
+    parser.add_argument("--threads", type=int, default=8, help="threaded mode pool size")
+    parser.add_argument("--concurrency", type=int, default=32, help="async calls in flight")
+    parser.add_argument("--latency", help="stub latency, see shipengine.testing.server")
+    parser.add_argument("--server", action="store_true", help="call a local StubServer")
+    parser.add_argument("--cassette", help="replay this cassette instead of the fixtures")
+    parser.add_argument(
+        "--latency-scale", type=float, default=0.0, help="multiplies the cassette latencies"
+    )
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results with this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression")
+    args = parser.parse_args(argv)
+    if args.server and args.cassette:
+        parser.error("--cassette replays in-process, it cannot be combined with --server")
+    args.modes = args.modes or ["sync", "threaded", "async"]
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    current = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+    if not args.compare:
+        return 0
+    with open(args.compare) as f:
+        found = regressions(json.load(f), current, args.tolerance)
+    for regression in found:
+        print(f"REGRESSION {regression}")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
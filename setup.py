@@ -17,12 +17,14 @@ setup(
     author="ShipEngine",
     author_email="support@shipengine.com",
     url="https://www.shipengine.com/",
-    packages=find_packages(exclude=["tests", "tests.*"]),
+    packages=find_packages(exclude=["tests", "tests.*", "benchmarks", "benchmarks.*"]),
     include_package_data=True,
     license="Apache 2",
     install_requires=[
         "requests >= 2.21.0, <= 2.26.0",
+        "aiohttp >= 3.9.0",
     ],
+    extras_require={"orjson": ["orjson >= 3.6.0"]},
     project_urls={
         "Bug Tracker": "https://github.com/ShipEngine/shipengine-python/issues",
         "Documentation": "https://github.com/ShipEngine/shipengine-python/tree/main/docs",
@@ -6,7 +6,13 @@ import logging
 from logging import NullHandler
 
 # SDK imports here
+from .async_shipengine import AsyncShipEngine
+from .instrumentation import Instrumentation, RequestEvent
+from .json_codec import JSONCodec
+from .metrics import MetricsAggregator
+from .retry_policy import RetryPolicy
 from .shipengine import ShipEngine
 from .shipengine_config import ShipEngineConfig
+from .tracking_scheduler import TrackingScheduler
 
 logging.getLogger(__name__).addHandler(NullHandler())
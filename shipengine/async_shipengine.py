@@ -0,0 +1,633 @@
+"""The asyncio entrypoint to the ShipEngine API SDK."""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Union
+
+from shipengine.enums import Endpoints, RateShoppingStrategy
+
+from .base import BaseShipEngine
+from .batches import (
+    BATCH_CHUNK_SIZE,
+    BATCH_MAX_POLL_INTERVAL,
+    BATCH_POLL_INTERVAL,
+    BatchPolling,
+    batch_finished,
+    chunked,
+)
+from .bulk import (
+    BulkLabelResult,
+    BulkPurchase,
+    LabelRequest,
+    bulk_concurrency,
+    label_request,
+)
+from .cache import address_fingerprint
+from .carriers import CarrierCatalog
+from .http_client import AsyncShipEngineClient
+from .http_client.single_flight import AsyncSingleFlight
+from .idempotency import purchase_key
+from .pagination import aiter_pages, first_page_endpoint
+from .rate_shopping import (
+    RateShoppingResult,
+    collect_outcomes,
+    rate_shopping_strategy,
+    split_by_carrier,
+)
+from .shipengine_config import ShipEngineConfig
+
+
+class AsyncShipEngine(BaseShipEngine):
+    def __init__(self, config: Union[str, Dict[str, Any], ShipEngineConfig]) -> None:
+        """
+        Exposes the functionality of the ShipEngine API to `asyncio` applications. Every
+        method mirrors its counterpart on `ShipEngine` but is a coroutine, so many requests
+        can be in flight at once without occupying a thread each.
+
+        The `api_key` you pass in can be either a ShipEngine sandbox
+        or production API Key. (sandbox keys start with "TEST_")
+        """
+        super().__init__(config)
+        self.client = AsyncShipEngineClient()
+        self._purchases = AsyncSingleFlight()
+        self._carrier_catalog_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AsyncShipEngine":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying HTTP session and the address caches, release their connections."""
+        self._close_address_caches()
+        await self.client.close()
+
+    async def create_label_from_rate_id(
+        self,
+        rate_id: str,
+        params: Dict[str, Any],
+        config: Union[str, Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Purchase a label from a `rate_id` returned by `get_rates_from_shipment`.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/create_label_from_rate
+
+        :param str rate_id: The rate_id you wish to create a shipping label for.
+        :param Dict[str, Any] params: A dictionary of label params that will dictate the label
+        display and level of verification.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :param str idempotency_key: Identifies this logical purchase, one is generated if
+        omitted. Retries reuse it, and calling again with a key that already bought a label
+        returns that label from the idempotency ledger instead of buying another one. Without
+        it, a 5xx or a connection failure is not retried unless `retry_non_idempotent` is set.
+        :returns Dict[str, Any]: A label that corresponds the to shipment details for the
+        rate_id provided.
+        """
+        config = self.config.merge(new_config=config)
+        return await self._purchase_label(
+            endpoint=f"v1/labels/rates/{rate_id}",
+            params=params,
+            config=config,
+            idempotency_key=idempotency_key,
+        )
+
+    async def create_label_from_shipment(
+        self,
+        shipment: Dict[str, Any],
+        config: Union[str, Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Purchase and print a shipping label for a given shipment.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/create_label
+
+        :param Dict[str, Any] shipment: A dictionary of shipment details for the label creation.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :param str idempotency_key: Identifies this logical purchase, one is generated if
+        omitted. Retries reuse it, and calling again with a key that already bought a label
+        returns that label from the idempotency ledger instead of buying another one. Without
+        it, a 5xx or a connection failure is not retried unless `retry_non_idempotent` is set.
+        :returns Dict[str, Any]: A label that corresponds the to shipment details provided.
+        """
+        config = self.config.merge(new_config=config)
+        return await self._purchase_label(
+            endpoint="v1/labels", params=shipment, config=config, idempotency_key=idempotency_key
+        )
+
+    def create_labels_bulk(
+        self,
+        requests: Iterable[LabelRequest],
+        concurrency: Optional[int] = None,
+        config: Union[str, Dict[str, Any]] = None,
+    ) -> AsyncIterator[BulkLabelResult]:
+        """
+        Buy many labels concurrently, yielding a `BulkLabelResult` for each input as soon as
+        its purchase completes, with at most `concurrency` purchases in flight. A failed
+        purchase yields a result holding its error. See `ShipEngine.create_labels_bulk()`.
+
+        >>> async for result in shipengine.create_labels_bulk(shipments, concurrency=16):
+        ...     print(result.index, result.ok)
+        """
+        config = self.config.merge(new_config=config)
+        concurrency = bulk_concurrency(concurrency, default=config.max_concurrency)
+        return self._create_labels_bulk(requests=requests, concurrency=concurrency, config=config)
+
+    async def _create_labels_bulk(
+        self, requests: Iterable[LabelRequest], concurrency: int, config: ShipEngineConfig
+    ) -> AsyncIterator[BulkLabelResult]:
+        in_flight: Set["asyncio.Task[BulkLabelResult]"] = set()
+        try:
+            for index, request in enumerate(requests):
+                in_flight.add(asyncio.ensure_future(self._bulk_label(index, request, config)))
+                if len(in_flight) >= concurrency:
+                    done, in_flight = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for result in sorted((t.result() for t in done), key=lambda r: r.index):
+                        yield result
+            while in_flight:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for result in sorted((t.result() for t in done), key=lambda r: r.index):
+                    yield result
+        finally:
+            # Purchases already sent are let finish so their labels reach the idempotency ledger.
+            if in_flight:
+                await asyncio.wait(in_flight)
+
+    async def _bulk_label(
+        self, index: int, request: LabelRequest, config: ShipEngineConfig
+    ) -> BulkLabelResult:
+        with BulkPurchase(index, request) as purchase:
+            endpoint, params, idempotency_key = label_request(request)
+            purchase.idempotency_key, idempotent = purchase_key(idempotency_key)
+            purchase.bought(
+                await self._buy_label(
+                    endpoint, params, config, purchase.idempotency_key, idempotent
+                )
+            )
+        return purchase.result
+
+    async def get_rate_estimate(
+        self, params: Dict[str, Any], config: Union[str, Dict[str, Any]] = None
+    ) -> list[Dict[str, Any]]:
+        """
+        Get a rate estimate for a shipment given a minimal set of shipment details.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/estimate_rates
+
+        :param Dict[str, Any] params: A dictionary of rate estimate params including carrier_ids,
+        origin/destination postal codes and country codes, and package weight.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :returns list[Dict[str, Any]]: A list of rate estimates from the specified carriers.
+        """
+        config = self.config.merge(new_config=config)
+        return await self._cached_rates(
+            endpoint=Endpoints.GET_RATE_ESTIMATE.value, params=params, config=config
+        )
+
+    async def get_rates_from_shipment(
+        self, shipment: Dict[str, Any], config: Union[str, Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Given some shipment details and rate options, this endpoint returns a list of rate quotes.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/calculate_rates
+
+        :param Dict[str, Any] shipment: A dictionary of shipment details to rate.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :returns Dict[str, Any]: The shipment with its rate quotes.
+        """
+        config = self.config.merge(new_config=config)
+        return await self._cached_rates(
+            endpoint=Endpoints.GET_RATE_FROM_SHIPMENT.value, params=shipment, config=config
+        )
+
+    async def shop_rates(
+        self,
+        shipment: Dict[str, Any],
+        carrier_ids: Optional[Iterable[str]] = None,
+        strategy: Union[str, RateShoppingStrategy] = RateShoppingStrategy.CHEAPEST.value,
+        carrier_timeout: Optional[float] = None,
+        max_delivery_days: Optional[int] = None,
+        config: Union[str, Dict[str, Any]] = None,
+    ) -> RateShoppingResult:
+        """
+        Shop rates across carriers with one concurrent `get_rates_from_shipment` request per
+        carrier, dropping those that have not answered within `carrier_timeout` seconds, and
+        rank the rates collected by `strategy`. See `ShipEngine.shop_rates()`.
+        """
+        strategy = rate_shopping_strategy(strategy, max_delivery_days=max_delivery_days)
+        config = self._shopping_config(self.config.merge(new_config=config), carrier_timeout)
+
+        tasks = {
+            carrier_id: asyncio.ensure_future(
+                self._cached_rates(Endpoints.GET_RATE_FROM_SHIPMENT.value, params, config)
+            )
+            for carrier_id, params in split_by_carrier(shipment, carrier_ids).items()
+        }
+        done = set()
+        if tasks:
+            done, _ = await asyncio.wait(tasks.values(), timeout=carrier_timeout)
+        outcomes = collect_outcomes(tasks, done)
+        # The carriers dropped are cancelled, awaited until they unwind so none is left pending.
+        await asyncio.gather(
+            *(tasks[carrier_id] for carrier_id in outcomes[2]), return_exceptions=True
+        )
+        return RateShoppingResult(
+            *outcomes,
+            strategy=strategy,
+            max_delivery_days=max_delivery_days,
+        )
+
+    async def list_carriers(self, config: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Fetch the carrier accounts connected to your ShipEngine Account.
+
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :returns Dict[str, Any]: The carrier accounts associated with a given ShipEngine Account.
+        """
+        config = self.config.merge(new_config=config)
+        return await self.client.get(endpoint=Endpoints.LIST_CARRIERS.value, config=config)
+
+    async def get_carrier_catalog(
+        self, refresh: bool = False, config: Dict[str, Any] = None
+    ) -> CarrierCatalog:
+        """
+        Return an indexed catalog of the carrier accounts connected to your ShipEngine Account,
+        with constant time lookups of carriers, services and package types. The catalog is
+        cached per API key for `config.carrier_catalog_ttl` seconds, so repeated lookups do not
+        call `v1/carriers` again.
+
+        :param bool refresh: Fetch a new catalog even if the cached one has not expired.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :returns CarrierCatalog: The carrier accounts associated with a given ShipEngine Account.
+        """
+        config = self.config.merge(new_config=config)
+        catalog = self._cached_catalog(config.api_key, refresh=refresh)
+        if catalog is not None:
+            return catalog
+
+        async with self._carrier_catalog_lock:
+            catalog = self._cached_catalog(config.api_key, refresh=refresh)
+            if catalog is None:
+                response = await self.client.get(
+                    endpoint=Endpoints.LIST_CARRIERS.value, config=config
+                )
+                catalog = self._cache_catalog(response, config)
+            return catalog
+
+    async def track_package_by_label_id(
+        self, label_id: str, config: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieve a given shipping label's tracking information with a label_id.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/get_tracking_log_from_label
+
+        :param str label_id: The label_id for a shipment you wish to get tracking information for.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :returns Dict[str, Any]: Tracking information corresponding to the label_id provided.
+        """
+        config = self.config.merge(new_config=config)
+        return await self.client.get(endpoint=f"v1/labels/{label_id}/track", config=config)
+
+    async def track_package_by_carrier_code_and_tracking_number(
+        self, carrier_code: str, tracking_number: str, config: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieve the label's tracking information with Carrier Code and Tracking Number.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/get_tracking_log
+
+        :param str carrier_code: The carrier_code for the carrier servicing the shipment.
+        :param str tracking_number: The tracking_number of the shipment.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :returns Dict[str, Any]: Tracking information corresponding to the carrier_code and
+        tracking_number provided.
+        """
+        config = self.config.merge(new_config=config)
+        return await self.client.get(
+            endpoint=f"v1/tracking?carrier_code={carrier_code}&tracking_number={tracking_number}",
+            config=config,
+        )
+
+    async def validate_addresses(
+        self, address: List[Dict[str, Any]], config: Union[str, Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate and normalize one or more addresses.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/validate_address
+
+        :param List[Dict[str, Any]] address: A list containing the address(es) to be validated.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :returns: Dict[str, Any]: The response from ShipEngine API including the validated
+        and normalized address.
+        """
+        config = self.config.merge(new_config=config)
+        if config.address_cache_path is None:
+            return await self.client.post(
+                endpoint=Endpoints.ADDRESSES_VALIDATE.value, params=address, config=config
+            )
+        return await self._cached_address_validation(addresses=address, config=config)
+
+    async def void_label_by_label_id(
+        self, label_id: str, config: Union[str, Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Void label with a Label Id.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/void_label
+
+        :param str label_id: The label_id of the label you wish to void.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :returns Dict[str, Any]: The response from ShipEngine API confirming the label was
+        successfully voided or unable to be voided.
+        """
+        config = self.config.merge(new_config=config)
+        return await self.client.put(endpoint=f"v1/labels/{label_id}/void", config=config)
+
+    async def list_labels_by_tracking_number(
+        self, tracking_number: str, config: Union[str, Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Lists labels with the specified tracking_number
+
+        :param str tracking_number: The tracking_number of the label(s) you wish to get.
+        :returns Dict[str, Any]: The response from ShipEngine API including the label(s) with
+        the specified tracking_number.
+        """
+        config = self.config.merge(new_config=config)
+        return await self.client.get(
+            endpoint=f"v1/labels?tracking_number={tracking_number}", config=config
+        )
+
+    def iter_labels(
+        self, config: Union[str, Dict[str, Any]] = None, **params: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Lazily iterate over every label of the account, one page of `config.page_size` labels
+        at a time, prefetching the next page while the current one is being consumed.
+
+        >>> async for label in shipengine.iter_labels(label_status="completed"):
+        ...     reconcile(label)
+        """
+        return self._iter_resource(Endpoints.LIST_LABELS.value, "labels", config, params)
+
+    def iter_shipments(
+        self, config: Union[str, Dict[str, Any]] = None, **params: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Lazily iterate over every shipment of the account, one page of `config.page_size`
+        shipments at a time, prefetching the next page while the current one is being consumed.
+        """
+        return self._iter_resource(Endpoints.LIST_SHIPMENTS.value, "shipments", config, params)
+
+    async def create_batch(
+        self,
+        shipment_ids: Optional[List[str]] = None,
+        rate_ids: Optional[List[str]] = None,
+        config: Union[str, Dict[str, Any]] = None,
+        **params: Any,
+    ) -> Dict[str, Any]:
+        """Create a batch of shipments or rates, see `ShipEngine.create_batch()`."""
+        config = self.config.merge(new_config=config)
+        params = self._batch_params(shipment_ids, rate_ids, params)
+        return await self.client.post(
+            endpoint=Endpoints.BATCHES.value, params=params, config=config
+        )
+
+    async def add_to_batch(
+        self,
+        batch_id: str,
+        shipment_ids: Optional[Iterable[str]] = None,
+        rate_ids: Optional[Iterable[str]] = None,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        config: Union[str, Dict[str, Any]] = None,
+    ) -> None:
+        """Add shipments or rates to an open batch, `chunk_size` IDs per request."""
+        config = self.config.merge(new_config=config)
+        endpoint = f"{Endpoints.BATCHES.value}/{batch_id}/add"
+        for chunk in chunked(shipment_ids, chunk_size):
+            await self.client.post(endpoint=endpoint, params={"shipment_ids": chunk}, config=config)
+        for chunk in chunked(rate_ids, chunk_size):
+            await self.client.post(endpoint=endpoint, params={"rate_ids": chunk}, config=config)
+
+    async def process_batch(
+        self,
+        batch_id: str,
+        params: Optional[Dict[str, Any]] = None,
+        config: Union[str, Dict[str, Any]] = None,
+    ) -> None:
+        """Start buying the labels of a batch, follow it with `wait_for_batch()`."""
+        config = self.config.merge(new_config=config)
+        await self.client.post(
+            endpoint=f"{Endpoints.BATCHES.value}/{batch_id}/process/labels",
+            params=params or dict(),
+            config=config,
+        )
+
+    async def get_batch(
+        self, batch_id: str, config: Union[str, Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Retrieve a batch, including its `status` and processing counts."""
+        config = self.config.merge(new_config=config)
+        return await self.client.get(
+            endpoint=f"{Endpoints.BATCHES.value}/{batch_id}", config=config
+        )
+
+    async def wait_for_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        max_poll_interval: float = BATCH_MAX_POLL_INTERVAL,
+        timeout: Optional[float] = None,
+        config: Union[str, Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Poll a batch, without blocking the event loop, until it has finished processing.
+        See `ShipEngine.wait_for_batch()`.
+        """
+        polling = BatchPolling(poll_interval, max_poll_interval, timeout)
+        batch = await self.get_batch(batch_id=batch_id, config=config)
+        while not batch_finished(batch):
+            await asyncio.sleep(polling.next_wait())
+            previous, batch = batch, await self.get_batch(batch_id=batch_id, config=config)
+            polling.checked(batch, previous)
+        return batch
+
+    async def run_batch(
+        self,
+        shipment_ids: Optional[Iterable[str]] = None,
+        rate_ids: Optional[Iterable[str]] = None,
+        process_params: Optional[Dict[str, Any]] = None,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        max_poll_interval: float = BATCH_MAX_POLL_INTERVAL,
+        timeout: Optional[float] = None,
+        config: Union[str, Dict[str, Any]] = None,
+        **params: Any,
+    ) -> Dict[str, Any]:
+        """Create, fill, process and wait for a batch, see `ShipEngine.run_batch()`."""
+        shipment_chunks = chunked(shipment_ids, chunk_size)
+        rate_chunks = chunked(rate_ids, chunk_size)
+        batch = await self.create_batch(
+            shipment_ids=next(shipment_chunks, None),
+            rate_ids=next(rate_chunks, None),
+            config=config,
+            **params,
+        )
+        batch_id = batch["batch_id"]
+        for chunk in shipment_chunks:
+            await self.add_to_batch(
+                batch_id, shipment_ids=chunk, chunk_size=chunk_size, config=config
+            )
+        for chunk in rate_chunks:
+            await self.add_to_batch(batch_id, rate_ids=chunk, chunk_size=chunk_size, config=config)
+        await self.process_batch(batch_id, params=process_params, config=config)
+        return await self.wait_for_batch(
+            batch_id,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval,
+            timeout=timeout,
+            config=config,
+        )
+
+    def iter_batch_labels(
+        self, batch_id: str, config: Union[str, Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Lazily iterate over the labels bought by a batch, see `iter_labels()`."""
+        return self._iter_resource(
+            Endpoints.LIST_LABELS.value, "labels", config, {"batch_id": batch_id}
+        )
+
+    def iter_batch_errors(
+        self, batch_id: str, config: Union[str, Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Lazily iterate over the errors of a processed batch."""
+        return self._iter_resource(
+            f"{Endpoints.BATCHES.value}/{batch_id}/errors",
+            "errors",
+            config,
+            dict(),
+            page_size_name="pagesize",
+        )
+
+    def download_batch_labels(
+        self,
+        batch: Dict[str, Any],
+        label_format: str = "pdf",
+        config: Union[str, Dict[str, Any]] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the combined label file of a finished batch in chunks of bytes.
+
+        >>> async for chunk in shipengine.download_batch_labels(batch):
+        ...     f.write(chunk)
+        """
+        endpoint = self._batch_download_endpoint(batch, label_format=label_format)
+        config = self.config.merge(new_config=config)
+        return self.client.download(endpoint=endpoint, config=config)
+
+    async def _iter_resource(
+        self,
+        resource: str,
+        key: str,
+        config: Union[str, Dict[str, Any], None],
+        params: Dict[str, Any],
+        page_size_name: str = "page_size",
+    ) -> AsyncIterator[Dict[str, Any]]:
+        config = self.config.merge(new_config=config)
+        endpoint = first_page_endpoint(
+            resource, page_size=config.page_size, params=params, page_size_name=page_size_name
+        )
+        pages = aiter_pages(lambda e: self.client.get(endpoint=e, config=config), endpoint)
+        try:
+            async for page in pages:
+                for item in page.get(key) or list():
+                    yield item
+        finally:
+            await pages.aclose()
+
+    async def _cached_rates(
+        self, endpoint: str, params: Dict[str, Any], config: ShipEngineConfig
+    ) -> Dict[str, Any]:
+        key = self._rate_cache_key(endpoint, params, config)
+        rates = self._rates_from_cache(key)
+        if rates is None:
+            rates = self._cache_rates(
+                key, await self.client.post(endpoint=endpoint, params=params, config=config), config
+            )
+        return rates
+
+    async def _cached_address_validation(
+        self, addresses: List[Dict[str, Any]], config: ShipEngineConfig
+    ) -> List[Dict[str, Any]]:
+        cache = await asyncio.to_thread(self._address_cache, config)
+        keys = [address_fingerprint(address) for address in addresses]
+        results = await asyncio.to_thread(cache.get_many, keys)
+        misses = self._address_misses(keys, addresses, results)
+        if misses:
+            validated = await self.client.post(
+                endpoint=Endpoints.ADDRESSES_VALIDATE.value,
+                params=list(misses.values()),
+                config=config,
+            )
+            fetched = dict(zip(misses, validated))
+            await asyncio.to_thread(cache.set_many, fetched)
+            results.update(fetched)
+        return [results[key] for key in keys]
+
+    async def _purchase_label(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        config: ShipEngineConfig,
+        idempotency_key: Optional[str],
+    ) -> Dict[str, Any]:
+        idempotency_key, idempotent = purchase_key(idempotency_key)
+        return await self._buy_label(endpoint, params, config, idempotency_key, idempotent)
+
+    async def _buy_label(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        config: ShipEngineConfig,
+        idempotency_key: str,
+        idempotent: bool,
+    ) -> Dict[str, Any]:
+        if not idempotent:
+            return await self._post_label(endpoint, params, config, idempotency_key, idempotent)
+        # Concurrent purchases under the same key share one POST, the later callers receive
+        # a copy of its label instead of all missing the ledger and buying one each.
+        return await self._purchases.do(
+            idempotency_key,
+            lambda: self._post_label(endpoint, params, config, idempotency_key, idempotent),
+        )
+
+    async def _post_label(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        config: ShipEngineConfig,
+        idempotency_key: str,
+        idempotent: bool,
+    ) -> Dict[str, Any]:
+        label = self.idempotency_ledger.get(idempotency_key) if idempotent else None
+        if label is not None:
+            return label
+
+        label = await self.client.post(
+            endpoint=endpoint,
+            params=params,
+            config=config,
+            idempotency_key=idempotency_key,
+            idempotent=idempotent,
+        )
+        self.idempotency_ledger.record(idempotency_key, label)
+        return label
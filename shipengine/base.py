@@ -0,0 +1,139 @@
+"""The state and the decisions shared by `ShipEngine` and `AsyncShipEngine`, none doing I/O."""
+
+import copy
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .batches import label_download_endpoint
+from .cache import AddressValidationCache, TTLCache, shipment_fingerprint
+from .carriers import CarrierCatalog
+from .enums import ErrorSource
+from .errors import InvalidFieldValueError
+from .idempotency import IdempotencyLedger
+from .shipengine_config import ShipEngineConfig
+
+RateCacheKey = Tuple[str, str, str]
+
+
+class BaseShipEngine:
+    config: ShipEngineConfig
+    """
+    Global configuration for the ShipEngine API client, such as timeouts,
+    retries, page size, etc. This configuration applies to all method calls,
+    unless specifically overridden when calling a method.
+    """
+
+    def __init__(self, config: Union[str, Dict[str, Any], ShipEngineConfig]) -> None:
+        self.idempotency_ledger = IdempotencyLedger()
+        self._carrier_catalogs: Dict[str, CarrierCatalog] = dict()
+        self._address_caches: Dict[Tuple[str, int, float], AddressValidationCache] = dict()
+        self._address_caches_lock = threading.Lock()
+
+        if type(config) is str:
+            self.config = ShipEngineConfig({"api_key": config})
+        elif type(config) is dict:
+            self.config = ShipEngineConfig(config)
+        elif isinstance(config, ShipEngineConfig):
+            self.config = config
+
+        self.rate_cache = TTLCache(max_entries=self.config.rate_cache_max_entries)
+
+    @staticmethod
+    def _rate_cache_key(
+        endpoint: str, params: Dict[str, Any], config: ShipEngineConfig
+    ) -> Optional[RateCacheKey]:
+        """The rate cache entry of a rate request, `None` when rates are not cached."""
+        if not config.rate_cache_ttl:
+            return None
+        return config.api_key, endpoint, shipment_fingerprint(params)
+
+    def _rates_from_cache(self, key: Optional[RateCacheKey]) -> Optional[Dict[str, Any]]:
+        rates = None if key is None else self.rate_cache.get(key)
+        # Callers own the result they are handed, the cached copy must stay untouched.
+        return None if rates is None else copy.deepcopy(rates)
+
+    def _cache_rates(
+        self, key: Optional[RateCacheKey], rates: Dict[str, Any], config: ShipEngineConfig
+    ) -> Dict[str, Any]:
+        if key is None:
+            return rates
+        self.rate_cache.set(key, rates, ttl=config.rate_cache_ttl)
+        return copy.deepcopy(rates)
+
+    @staticmethod
+    def _address_misses(
+        keys: List[str], addresses: List[Dict[str, Any]], results: Dict[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        """The addresses missing from the cache, each distinct address once."""
+        misses: Dict[str, Dict[str, Any]] = dict()
+        for key, address in zip(keys, addresses):
+            if key not in results and key not in misses:
+                misses[key] = address
+        return misses
+
+    def _address_cache(self, config: ShipEngineConfig) -> AddressValidationCache:
+        cache_key = (
+            config.address_cache_path,
+            config.address_cache_max_entries,
+            config.address_cache_ttl,
+        )
+        with self._address_caches_lock:
+            cache = self._address_caches.get(cache_key)
+            if cache is None:
+                cache = AddressValidationCache(
+                    path=config.address_cache_path,
+                    max_entries=config.address_cache_max_entries,
+                    ttl=config.address_cache_ttl,
+                )
+                self._address_caches[cache_key] = cache
+            return cache
+
+    def _close_address_caches(self) -> None:
+        with self._address_caches_lock:
+            caches, self._address_caches = list(self._address_caches.values()), dict()
+        for cache in caches:
+            cache.close()
+
+    def _cached_catalog(self, api_key: str, refresh: bool) -> Optional[CarrierCatalog]:
+        """The cached carrier catalog of `api_key`, `None` when it must be fetched again."""
+        catalog = self._carrier_catalogs.get(api_key)
+        if refresh or catalog is None or catalog.is_expired():
+            return None
+        return catalog
+
+    def _cache_catalog(self, response: Dict[str, Any], config: ShipEngineConfig) -> CarrierCatalog:
+        catalog = CarrierCatalog(response=response, ttl=config.carrier_catalog_ttl)
+        self._carrier_catalogs[config.api_key] = catalog
+        return catalog
+
+    @staticmethod
+    def _shopping_config(
+        config: ShipEngineConfig, carrier_timeout: Optional[float]
+    ) -> ShipEngineConfig:
+        """The config of the per carrier requests, none of them outlasting `carrier_timeout`."""
+        if carrier_timeout is None:
+            return config
+        return config.merge(new_config={"timeout": min(config.timeout, carrier_timeout)})
+
+    @staticmethod
+    def _batch_params(
+        shipment_ids: Optional[List[str]], rate_ids: Optional[List[str]], params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        params = dict(params)
+        if shipment_ids:
+            params["shipment_ids"] = list(shipment_ids)
+        if rate_ids:
+            params["rate_ids"] = list(rate_ids)
+        return params
+
+    @staticmethod
+    def _batch_download_endpoint(batch: Dict[str, Any], label_format: str) -> str:
+        endpoint = label_download_endpoint(batch, label_format=label_format)
+        if endpoint is None:
+            raise InvalidFieldValueError(
+                field_name="batch",
+                reason="The batch has no label download, it may not be processed yet.",
+                field_value=batch.get("batch_id"),
+                error_source=ErrorSource.SHIPENGINE.value,
+            )
+        return endpoint
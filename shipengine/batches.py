@@ -0,0 +1,93 @@
+"""Helpers for the ShipEngine batch workflow: chunking, polling and result links."""
+
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .enums import ErrorSource
+from .errors import ClientTimeoutError
+from .pagination import relative_endpoint
+
+BATCH_CHUNK_SIZE: int = 500
+"""Default number of shipment or rate IDs sent per request when adding them to a batch."""
+
+BATCH_POLL_INTERVAL: float = 1.0
+"""Default delay in seconds before the first status check of a processing batch."""
+
+BATCH_MAX_POLL_INTERVAL: float = 30.0
+"""Default upper bound in seconds for the delay between two status checks."""
+
+BATCH_FINISHED_STATUSES = frozenset(("completed", "completed_with_errors", "archived", "invalid"))
+"""The batch statuses that end processing."""
+
+
+def chunked(ids: Optional[Iterable[str]], size: int) -> Iterator[List[str]]:
+    """Split `ids` into lists of at most `size` IDs."""
+    chunk: List[str] = list()
+    for id_ in ids or list():
+        chunk.append(id_)
+        if len(chunk) == size:
+            yield chunk
+            chunk = list()
+    if chunk:
+        yield chunk
+
+
+def batch_finished(batch: Dict[str, Any]) -> bool:
+    """Whether a batch has finished processing, successfully or not."""
+    return batch.get("status") in BATCH_FINISHED_STATUSES
+
+
+def next_poll_interval(
+    interval: float,
+    batch: Dict[str, Any],
+    previous: Dict[str, Any],
+    initial: float,
+    maximum: float,
+) -> float:
+    """
+    Adapt the delay between two status checks: it falls back to `initial` while the batch makes
+    visible progress, more of its labels processed than at the previous check, and grows by half
+    while it does not, up to `maximum`. Long queues are polled rarely, active ones closely.
+    """
+    if processed_count(batch) > processed_count(previous):
+        return initial
+    return min(maximum, interval * 1.5)
+
+
+class BatchPolling:
+    def __init__(
+        self, poll_interval: float, max_poll_interval: float, timeout: Optional[float]
+    ) -> None:
+        """
+        The schedule of the status checks of a processing batch, see `next_poll_interval()`,
+        within `timeout` seconds from now, `None` to wait as long as it takes.
+        """
+        self.initial = poll_interval
+        self.maximum = max_poll_interval
+        self.timeout = timeout
+        self.interval = poll_interval
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+
+    def next_wait(self) -> float:
+        """Seconds to wait before the next check, raise if it would end past the deadline."""
+        if self.deadline is not None and time.monotonic() + self.interval > self.deadline:
+            raise ClientTimeoutError(
+                retry_after=self.timeout, error_source=ErrorSource.SHIPENGINE.value
+            )
+        return self.interval
+
+    def checked(self, batch: Dict[str, Any], previous: Dict[str, Any]) -> None:
+        self.interval = next_poll_interval(
+            self.interval, batch, previous, initial=self.initial, maximum=self.maximum
+        )
+
+
+def processed_count(batch: Dict[str, Any]) -> int:
+    return (batch.get("completed") or 0) + (batch.get("errors") or 0)
+
+
+def label_download_endpoint(batch: Dict[str, Any], label_format: str) -> Optional[str]:
+    """The endpoint of the combined label file of a processed batch, in `label_format`."""
+    downloads = batch.get("label_download") or dict()
+    href = downloads.get(label_format) or downloads.get("href")
+    return relative_endpoint(href) if href else None
@@ -0,0 +1,101 @@
+"""Inputs and results of bulk label creation."""
+
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .enums import ErrorSource
+from .errors import InvalidFieldValueError
+
+LabelRequest = Union[str, Dict[str, Any]]
+
+
+def label_request(item: LabelRequest) -> Tuple[str, Dict[str, Any], Optional[str]]:
+    """
+    The endpoint, the params and the caller's idempotency key, if any, buying a label for one
+    bulk input: a `rate_id` string, a dictionary with a `rate_id` and the label params, or the
+    shipment details of `create_label_from_shipment`. A dictionary may carry its own
+    `idempotency_key`, which is not sent as a param.
+    """
+    if isinstance(item, str):
+        return f"v1/labels/rates/{item}", dict(), None
+    params = dict(item)
+    idempotency_key = params.pop("idempotency_key", None)
+    if "rate_id" in params:
+        rate_id = params.pop("rate_id")
+        return f"v1/labels/rates/{rate_id}", params, idempotency_key
+    return "v1/labels", params, idempotency_key
+
+
+def bulk_concurrency(concurrency: Optional[int], default: int) -> int:
+    """Validate the `concurrency` of a bulk operation, `None` falls back to `default`."""
+    if concurrency is None:
+        return default
+    if type(concurrency) is not int or concurrency < 1:
+        raise InvalidFieldValueError(
+            field_name="concurrency",
+            reason="Concurrency must be a whole number greater than zero.",
+            field_value=concurrency,
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+    return concurrency
+
+
+class BulkLabelResult:
+    def __init__(
+        self,
+        index: int,
+        request: LabelRequest,
+        idempotency_key: Optional[str],
+        label: Optional[Dict[str, Any]] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """
+        The outcome of one input of `create_labels_bulk`, either the `label` bought or the
+        `error` that prevented it, usually a `ShipEngineError`. `idempotency_key` is the key the
+        purchase was sent with: the input's own, or one generated for it, `None` when the input
+        was too malformed to send. As with a single purchase, only an input's own key is
+        retried after a 5xx or a lost connection, and retrying a failed purchase with a
+        generated key leaves spotting a duplicate label to ShipEngine.
+
+        :param int index: The position of the input in the iterable passed in.
+        :param LabelRequest request: The input itself.
+        """
+        self.index = index
+        self.request = request
+        self.idempotency_key = idempotency_key
+        self.label = label
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the label was bought."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        outcome = "ok" if self.ok else f"error={self.error!r}"
+        return f"BulkLabelResult(index={self.index}, {outcome})"
+
+
+class BulkPurchase:
+    def __init__(self, index: int, request: LabelRequest) -> None:
+        """
+        The purchase of one bulk input, used as a context manager around buying its label
+        under `idempotency_key`, set once it is known. Any exception raised inside, a
+        `ShipEngineError` or e.g. the `TypeError` of a malformed input, is recorded on `result`
+        instead of stopping the other purchases.
+        """
+        self.index = index
+        self.request = request
+        self.idempotency_key: Optional[str] = None
+        self.result: Optional[BulkLabelResult] = None
+
+    def __enter__(self) -> "BulkPurchase":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        if isinstance(exc, Exception):
+            self.result = BulkLabelResult(self.index, self.request, self.idempotency_key, error=exc)
+            return True
+        return False
+
+    def bought(self, label: Dict[str, Any]) -> None:
+        self.result = BulkLabelResult(self.index, self.request, self.idempotency_key, label=label)
@@ -0,0 +1,5 @@
+"""Client-side caches used by the ShipEngine SDK."""
+
+from .address_cache import AddressValidationCache
+from .fingerprint import address_fingerprint, shipment_fingerprint
+from .ttl_cache import TTLCache
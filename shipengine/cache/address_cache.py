@@ -0,0 +1,147 @@
+"""A persistent, multi-process address validation cache backed by SQLite."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS address_validation (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+_INDEX = """
+CREATE INDEX IF NOT EXISTS address_validation_accessed_at
+ON address_validation (accessed_at)
+"""
+_EXPIRY_INDEX = """
+CREATE INDEX IF NOT EXISTS address_validation_expires_at
+ON address_validation (expires_at)
+"""
+
+
+class AddressValidationCache:
+    DEFAULT_MAX_ENTRIES: int = 100000
+    """Default number of validated addresses kept before the least recently used are evicted."""
+
+    DEFAULT_TTL: float = 30 * 24 * 60 * 60
+    """Default number of seconds a validation result is reused, 30 days."""
+
+    def __init__(
+        self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL
+    ) -> None:
+        """
+        Stores `validate_addresses` results in a SQLite file keyed by address fingerprint.
+        The file can be shared by several processes: it is opened in WAL mode so readers do
+        not block the writer. Every write deletes the expired results, and once more than
+        `max_entries` are stored the least recently used ones are evicted. Each thread opens
+        its own connection, `close()` closes them all.
+
+        :param str path: The path of the SQLite file, created if it does not exist.
+        :param int max_entries: The maximum number of results kept in the file.
+        :param float ttl: The number of seconds a stored result is reused.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        self._connections: List[Tuple[int, sqlite3.Connection]] = list()
+        self._connections_lock = threading.Lock()
+        self._generation: int = 0
+        with self._connection() as conn:
+            conn.execute(_SCHEMA)
+            conn.execute(_INDEX)
+            conn.execute(_EXPIRY_INDEX)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the stored, unexpired results for the given keys, missing keys are omitted."""
+        keys = list(set(keys))
+        if not keys:
+            return dict()
+
+        now = time.time()
+        results: Dict[str, Dict[str, Any]] = dict()
+        with self._connection() as conn:
+            for chunk in _chunks(keys, 500):
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    "SELECT key, result FROM address_validation "
+                    f"WHERE key IN ({placeholders}) AND expires_at > ?",
+                    (*chunk, now),
+                ).fetchall()
+                results.update((key, json.loads(result)) for key, result in rows)
+
+            if results:
+                conn.executemany(
+                    "UPDATE address_validation SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in results],
+                )
+        return results
+
+    def set_many(self, results: Dict[str, Dict[str, Any]]) -> None:
+        """Store validation results by key, and evict the least recently used if full."""
+        if not results:
+            return
+
+        now = time.time()
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO address_validation (key, result, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(result), now + self.ttl, now) for key, result in results.items()],
+            )
+            conn.execute("DELETE FROM address_validation WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM address_validation WHERE key IN ("
+                "SELECT key FROM address_validation ORDER BY accessed_at DESC LIMIT -1 OFFSET ?"
+                ")",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        """Drop every stored result."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM address_validation")
+
+    def close(self) -> None:
+        """
+        Close the connection of every thread. The cache stays usable, a later call opens new
+        connections. Connections inherited across a `fork()` are left to the parent.
+        """
+        pid = os.getpid()
+        with self._connections_lock:
+            connections, self._connections = self._connections, list()
+            self._generation += 1
+        for owner, conn in connections:
+            if owner == pid:
+                conn.close()
+
+    def __len__(self) -> int:
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM address_validation").fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread and per process, SQLite connections must not be shared."""
+        conn = getattr(self._local, "conn", None)
+        pid = os.getpid()
+        if conn is None or self._local.pid != pid or self._local.generation != self._generation:
+            # Only ever used by this thread, but `close()` may close it from another one.
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._connections_lock:
+                self._connections.append((pid, conn))
+                self._local.generation = self._generation
+            self._local.conn = conn
+            self._local.pid = pid
+        return conn
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
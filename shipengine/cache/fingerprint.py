@@ -0,0 +1,141 @@
+"""Canonical, stable fingerprints of shipments and rate requests."""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict
+
+ADDRESS_KEYS = frozenset(("ship_to", "ship_from", "return_to"))
+"""Keys whose values are addresses, and are normalized before being fingerprinted."""
+
+ADDRESS_FIELDS = frozenset(
+    (
+        "from_city_locality",
+        "from_country_code",
+        "from_postal_code",
+        "from_state_province",
+        "to_city_locality",
+        "to_country_code",
+        "to_postal_code",
+        "to_state_province",
+    )
+)
+"""Flat address fields of a rate estimate request, normalized like full addresses."""
+
+UNORDERED_LISTS = frozenset(("carrier_ids", "service_codes", "package_types"))
+"""Lists whose order does not change the rates that are returned."""
+
+OUNCES_PER_UNIT: Dict[str, float] = {
+    "ounce": 1.0,
+    "pound": 16.0,
+    "gram": 0.03527396195,
+    "kilogram": 35.27396195,
+}
+"""Conversion factors used to express every weight in ounces."""
+
+STREET_FIELDS = frozenset(("address_line1", "address_line2", "address_line3"))
+"""Address fields holding street lines, which also get their suffixes abbreviated."""
+
+STREET_ABBREVIATIONS: Dict[str, str] = {
+    "alley": "aly",
+    "apartment": "apt",
+    "avenue": "ave",
+    "boulevard": "blvd",
+    "building": "bldg",
+    "circle": "cir",
+    "court": "ct",
+    "drive": "dr",
+    "east": "e",
+    "expressway": "expy",
+    "floor": "fl",
+    "freeway": "fwy",
+    "highway": "hwy",
+    "lane": "ln",
+    "north": "n",
+    "northeast": "ne",
+    "northwest": "nw",
+    "parkway": "pkwy",
+    "place": "pl",
+    "road": "rd",
+    "room": "rm",
+    "south": "s",
+    "southeast": "se",
+    "southwest": "sw",
+    "square": "sq",
+    "street": "st",
+    "suite": "ste",
+    "terrace": "ter",
+    "trail": "trl",
+    "west": "w",
+}
+"""USPS Publication 28 abbreviations for common street suffixes, units and directionals."""
+
+_WHITESPACE = re.compile(r"\s+")
+_STREET_PUNCTUATION = re.compile(r"[.,#]")
+
+
+def normalize_text(value: str) -> str:
+    """Collapse whitespace and case so that trivially different spellings compare equal."""
+    return _WHITESPACE.sub(" ", value).strip().casefold()
+
+
+def normalize_street(value: str) -> str:
+    """Normalize a street line and abbreviate its suffixes, `Main Street.` becomes `main st`."""
+    words = normalize_text(_STREET_PUNCTUATION.sub(" ", value)).split(" ")
+    return " ".join(STREET_ABBREVIATIONS.get(word, word) for word in words)
+
+
+def normalize_address(address: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of `address` with every string value normalized."""
+    normalized = dict()
+    for key, value in address.items():
+        if isinstance(value, str):
+            value = normalize_street(value) if key in STREET_FIELDS else normalize_text(value)
+        normalized[key] = value
+    return normalized
+
+
+def address_fingerprint(address: Dict[str, Any]) -> str:
+    """
+    Hash an address into a stable fingerprint, addresses that only differ in case, whitespace,
+    punctuation or the spelling of street suffixes get the same fingerprint.
+
+    :param address: A single address as passed to `validate_addresses`.
+    :returns: A hex-encoded SHA-256 digest of the normalized address.
+    :rtype: str
+    """
+    canonical = json.dumps(normalize_address(address), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _canonicalize(value: Any, key: str = "") -> Any:
+    if isinstance(value, dict):
+        if key in ADDRESS_KEYS:
+            value = normalize_address(value)
+        if set(value) == {"value", "unit"} and value["unit"] in OUNCES_PER_UNIT:
+            return {"ounces": round(value["value"] * OUNCES_PER_UNIT[value["unit"]], 4)}
+        return {k: _canonicalize(v, k) for k, v in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        items = [_canonicalize(item) for item in value]
+        if key in UNORDERED_LISTS:
+            items.sort(key=lambda item: json.dumps(item, sort_keys=True))
+        return items
+
+    if key in ADDRESS_FIELDS and isinstance(value, str):
+        return normalize_text(value)
+    return value
+
+
+def shipment_fingerprint(payload: Any) -> str:
+    """
+    Hash a shipment, or a rate estimate request, into a stable fingerprint. Two payloads that
+    only differ in key order, the spelling of their addresses, the order of their carrier ids
+    or the unit their weights are expressed in get the same fingerprint.
+
+    :param payload: The body passed to `get_rates_from_shipment` or `get_rate_estimate`.
+    :returns: A hex-encoded SHA-256 digest of the canonical form of `payload`.
+    :rtype: str
+    """
+    canonical = json.dumps(_canonicalize(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
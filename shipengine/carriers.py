@@ -0,0 +1,68 @@
+"""An indexed, expiring catalog of the carrier accounts connected to a ShipEngine account."""
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class CarrierCatalog:
+    def __init__(self, response: Dict[str, Any], ttl: float) -> None:
+        """
+        Indexes a `list_carriers` response so carriers, services and package types can be
+        looked up in constant time instead of scanning the raw response.
+
+        :param Dict[str, Any] response: The response body of `ShipEngine.list_carriers()`.
+        :param float ttl: The number of seconds the catalog is considered fresh.
+        """
+        self.raw: Dict[str, Any] = response
+        self.expires_at: float = time.monotonic() + ttl
+        self.carriers: List[Dict[str, Any]] = response.get("carriers") or list()
+
+        self._carriers_by_id: Dict[str, Dict[str, Any]] = dict()
+        self._carriers_by_code: Dict[str, List[Dict[str, Any]]] = dict()
+        self._services_by_code: Dict[str, List[Dict[str, Any]]] = dict()
+        self._services_by_carrier: Dict[Tuple[str, str], Dict[str, Any]] = dict()
+        self._packages_by_code: Dict[str, List[Dict[str, Any]]] = dict()
+
+        for carrier in self.carriers:
+            carrier_id = carrier.get("carrier_id")
+            self._carriers_by_id[carrier_id] = carrier
+            self._carriers_by_code.setdefault(carrier.get("carrier_code"), list()).append(carrier)
+
+            for service in carrier.get("services") or list():
+                self._services_by_code.setdefault(service.get("service_code"), list()).append(
+                    service
+                )
+                self._services_by_carrier[(carrier_id, service.get("service_code"))] = service
+
+            for package in carrier.get("packages") or list():
+                self._packages_by_code.setdefault(package.get("package_code"), list()).append(
+                    package
+                )
+
+    def is_expired(self) -> bool:
+        """Whether the catalog is older than its TTL and should be refreshed."""
+        return time.monotonic() >= self.expires_at
+
+    def carrier(self, carrier_id: str) -> Optional[Dict[str, Any]]:
+        """Return the carrier account with the given `carrier_id`, e.g. `se-656171`."""
+        return self._carriers_by_id.get(carrier_id)
+
+    def carriers_by_code(self, carrier_code: str) -> List[Dict[str, Any]]:
+        """Return every carrier account for a `carrier_code`, e.g. `stamps_com`."""
+        return self._carriers_by_code.get(carrier_code, list())
+
+    def service(self, carrier_id: str, service_code: str) -> Optional[Dict[str, Any]]:
+        """Return a service offered by a given carrier account."""
+        return self._services_by_carrier.get((carrier_id, service_code))
+
+    def services(self, service_code: str) -> List[Dict[str, Any]]:
+        """Return the service across every carrier account offering it, e.g. `ups_ground`."""
+        return self._services_by_code.get(service_code, list())
+
+    def carrier_ids_for_service(self, service_code: str) -> List[str]:
+        """Return the `carrier_id` of every carrier account offering the service."""
+        return [service.get("carrier_id") for service in self.services(service_code)]
+
+    def package_types(self, package_code: str) -> List[Dict[str, Any]]:
+        """Return the package type across every carrier account offering it."""
+        return self._packages_by_code.get(package_code, list())
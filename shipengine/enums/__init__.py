@@ -34,9 +34,27 @@ class Endpoints(Enum):
     """A collection of RPC Methods used throughout the ShipEngine SDK."""
 
     ADDRESSES_VALIDATE = "v1/addresses/validate"
+    BATCHES = "v1/batches"
     GET_RATE_ESTIMATE = "v1/rates/estimate"
     GET_RATE_FROM_SHIPMENT = "v1/rates"
     LIST_CARRIERS = "v1/carriers"
+    LIST_LABELS = "v1/labels"
+    LIST_SHIPMENTS = "v1/shipments"
+
+
+class RateShoppingStrategy(Enum):
+    """The ways `shop_rates` can rank the rates it collects."""
+
+    CHEAPEST = "cheapest"
+    FASTEST = "fastest"
+    BEST_VALUE = "best_value"
+
+
+class WebhookResourceType(Enum):
+    """The `resource_type` of the webhook payloads the SDK webhook receiver accepts."""
+
+    API_TRACK = "API_TRACK"
+    BATCH = "BATCH"
 
 
 def does_member_value_exist(m: str, enum_to_search) -> bool:
@@ -1,3 +1,12 @@
-"""Synchronous HTTP Client for ShipEngine SDK."""
+"""HTTP Clients for ShipEngine SDK."""
 
+from .async_client import AsyncShipEngineClient
 from .client import ShipEngineClient
+from .transport import (
+    AiohttpTransport,
+    AsyncTransport,
+    RequestsTransport,
+    Transport,
+    TransportRequest,
+    TransportResponse,
+)
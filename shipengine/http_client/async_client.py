@@ -0,0 +1,157 @@
+"""An asynchronous HTTP Client for the ShipEngine SDK."""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional
+
+import aiohttp
+
+from ..enums import HTTPVerbs
+from ..errors import ShipEngineError
+from ..shipengine_config import ShipEngineConfig
+from .attempts import RequestAttempts
+from .client import (
+    DOWNLOAD_CHUNK_SIZE,
+    check_download_response,
+    coalescing_key,
+    download_chunks,
+    download_request,
+)
+from .rate_limiter import rate_limiter_for
+from .request_template import base_url, request_template
+from .single_flight import AsyncSingleFlight
+from .transport import AiohttpTransport, AsyncTransport, system_error
+
+
+class AsyncShipEngineClient:
+    def __init__(self) -> None:
+        """An `asyncio` HTTP client, backed by `aiohttp`, used to send requests from the SDK."""
+        self.transport = AiohttpTransport()
+        self.in_flight = AsyncSingleFlight()
+
+    async def get(self, endpoint: str, config: ShipEngineConfig) -> Dict[str, Any]:
+        """
+        Send an HTTP GET request. Unless `config.coalesce_requests` is off, coroutines sending
+        the same GET with the same API key while one is in flight share that request's result.
+        """
+
+        def send() -> Awaitable[Dict[str, Any]]:
+            return self._request_loop(
+                http_method=HTTPVerbs.GET.value, endpoint=endpoint, params=None, config=config
+            )
+
+        if not config.coalesce_requests:
+            return await send()
+        return await self.in_flight.do(
+            key=coalescing_key(HTTPVerbs.GET.value, endpoint, config), fn=send
+        )
+
+    async def post(
+        self,
+        endpoint: str,
+        config: ShipEngineConfig,
+        params: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+        idempotent: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Send an HTTP POST request. A POST carrying an `idempotency_key` is sent with an
+        `Idempotency-Key` header. It is retried after a 5xx or a connection failure like an
+        idempotent request only when `idempotent`, e.g. when the caller chose the key.
+        """
+        return await self._request_loop(
+            http_method=HTTPVerbs.POST.value,
+            endpoint=endpoint,
+            params=params,
+            config=config,
+            idempotency_key=idempotency_key,
+            idempotent=idempotent,
+        )
+
+    async def delete(self, endpoint: str, config: ShipEngineConfig):
+        """Send an HTTP DELETE request."""
+        return await self._request_loop(
+            http_method=HTTPVerbs.DELETE.value, endpoint=endpoint, params=None, config=config
+        )
+
+    async def put(
+        self, endpoint: str, config: ShipEngineConfig, params: Optional[Dict[str, Any]] = None
+    ):
+        """Send an HTTP PUT request."""
+        return await self._request_loop(
+            http_method=HTTPVerbs.PUT.value, endpoint=endpoint, params=params, config=config
+        )
+
+    async def download(
+        self, endpoint: str, config: ShipEngineConfig, chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a binary download, e.g. the label PDF of a batch, in chunks of at most
+        `chunk_size` bytes. See `ShipEngineClient.download()`.
+        """
+        delay = rate_limiter_for(config=config).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if config.transport is not None:
+            request = download_request(endpoint=endpoint, config=config)
+            resp = await config.transport.send_async(request)
+            for chunk in download_chunks(resp, config=config, chunk_size=chunk_size):
+                yield chunk
+            return
+
+        session = await self._get_session(config=config)
+        template = request_template(base_uri=base_url(config=config), api_key=config.api_key)
+        headers = dict(template.request_headers(body=None), Accept="*/*")
+        try:
+            async with session.get(
+                template.url(endpoint),
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(sock_read=config.timeout),
+            ) as resp:
+                if resp.status >= 400:
+                    check_download_response(resp.status, await resp.read(), resp.headers, config)
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    yield chunk
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise system_error(HTTPVerbs.GET.value, err)
+
+    async def close(self) -> None:
+        """
+        Close the underlying `aiohttp.ClientSession` and release its connections. A transport
+        passed in the `transport` config option is owned, and closed, by the caller.
+        """
+        await self.transport.close_async()
+
+    async def _request_loop(
+        self,
+        http_method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        config: ShipEngineConfig,
+        idempotency_key: Optional[str] = None,
+        idempotent: bool = False,
+    ) -> Dict[str, Any]:
+        transport: AsyncTransport = config.transport or self.transport
+        with RequestAttempts(
+            http_method=http_method,
+            endpoint=endpoint,
+            params=params,
+            config=config,
+            rate_limiter=rate_limiter_for(config=config),
+            idempotency_key=idempotency_key,
+            idempotent=idempotent,
+        ) as attempts:
+            while True:
+                delay, timeout = attempts.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    with attempts.attempt(wait=delay, timeout=timeout) as attempt:
+                        return attempt.result(await transport.send_async(attempt.request))
+                except ShipEngineError as err:
+                    backoff = attempts.backoff(err)
+                    if backoff > 0:
+                        await asyncio.sleep(backoff)
+
+    async def _get_session(self, config: ShipEngineConfig) -> aiohttp.ClientSession:
+        """The `aiohttp.ClientSession` of the default transport, used for downloads."""
+        return await self.transport.session(config=config)
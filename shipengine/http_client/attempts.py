@@ -0,0 +1,221 @@
+"""
+The decisions of a request's attempts that do no I/O, shared by the synchronous and the
+`asyncio` clients: each of them only sleeps and sends where these objects tell them to.
+"""
+
+import time
+from typing import Any, ContextManager, Dict, Optional, Tuple
+
+from ..errors import RateLimitExceededError, ShipEngineError
+from ..instrumentation import RequestEvent, emit, endpoint_template
+from ..shipengine_config import ShipEngineConfig
+from ..tracing import (
+    RequestWaits,
+    attempt_span,
+    call_span,
+    set_attributes,
+    trace_response,
+)
+from ..util import check_response_for_errors
+from .request_template import base_url, request_template
+from .transport import TransportRequest, TransportResponse
+
+
+def decode_body(status_code: int, content: bytes, config: ShipEngineConfig) -> Dict[str, Any]:
+    """
+    Decode a response body. An empty body, e.g. `204 No Content`, decodes to an empty dictionary,
+    so does an undecodable error body, its status code is enough to raise the right error.
+    """
+    if not content:
+        return dict()
+    try:
+        return config.json_codec.decode(content)
+    except ValueError:
+        if status_code < 400:
+            raise
+        return dict()
+
+
+def start_event(
+    http_method: str, endpoint: str, attempt: int, wait_time: float, config: ShipEngineConfig
+) -> Optional[RequestEvent]:
+    """The `RequestEvent` of an attempt, reported to `on_request_start()`, if instrumented."""
+    if not config.instrumentation:
+        return None
+    event = RequestEvent(http_method, endpoint_template(endpoint), attempt)
+    event.wait_time = max(0.0, wait_time)
+    emit(config.instrumentation, "on_request_start", event)
+    return event
+
+
+def end_event(
+    event: RequestEvent,
+    started: float,
+    sent: Optional[float],
+    received: Optional[float],
+    config: ShipEngineConfig,
+) -> None:
+    event.record_timings(started, sent, received, time.perf_counter())
+    emit(config.instrumentation, "on_request_end", event)
+
+
+def retry_event(event: Optional[RequestEvent], delay: float, config: ShipEngineConfig) -> None:
+    if event is not None:
+        event.retry_delay = delay
+        emit(config.instrumentation, "on_request_retry", event)
+
+
+class Attempt:
+    def __init__(self, attempts: "RequestAttempts", wait: float, timeout: float) -> None:
+        """
+        One HTTP attempt of a request, used as a context manager around sending `request`:
+        an instrumented attempt fills its `RequestEvent` in and reports it to
+        `on_request_end()`, a traced one runs in its own span.
+        """
+        self.attempts = attempts
+        self.started: float = time.perf_counter()
+        self.sent: Optional[float] = None
+        self.received: Optional[float] = None
+        self.event = start_event(
+            attempts.http_method, attempts.endpoint, attempts.retry, wait, attempts.config
+        )
+        self.request = TransportRequest(
+            http_method=attempts.http_method,
+            endpoint=attempts.endpoint,
+            body=attempts.body,
+            template=attempts.template,
+            config=attempts.config,
+            timeout=timeout,
+            idempotency_key=attempts.idempotency_key,
+        )
+        self._span_context: ContextManager[Any] = attempt_span(
+            attempts.config.tracer,
+            attempts.http_method,
+            attempts.template,
+            attempts.endpoint,
+            attempts.retry,
+            wait,
+        )
+        self.span: Any = None
+
+    def __enter__(self) -> "Attempt":
+        self.span = self._span_context.__enter__()
+        self.sent = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> Optional[bool]:
+        if isinstance(exc, ShipEngineError):
+            if self.event is not None:
+                self.event.error = exc
+            set_attributes(self.span, {"error.type": type(exc).__name__})
+        if self.event is not None:
+            end_event(self.event, self.started, self.sent, self.received, self.attempts.config)
+        return self._span_context.__exit__(exc_type, exc, traceback)
+
+    def result(self, resp: TransportResponse) -> Dict[str, Any]:
+        """The decoded body of the response to `request`, or the error it stands for."""
+        self.received = time.perf_counter()
+        config = self.attempts.config
+        if self.event is not None:
+            self.event.bytes_sent = len(self.request.body or b"")
+            self.event.record_response(resp.status_code, len(resp.content), resp.headers)
+        resp_body = decode_body(status_code=resp.status_code, content=resp.content, config=config)
+        trace_response(
+            self.span,
+            resp.status_code,
+            self.request.body,
+            resp.content,
+            self.started,
+            self.sent,
+            self.received,
+        )
+        check_response_for_errors(
+            status_code=resp.status_code,
+            response_body=resp_body,
+            response_headers=resp.headers,
+            config=config,
+        )
+        return resp_body
+
+
+class RequestAttempts:
+    def __init__(
+        self,
+        http_method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        config: ShipEngineConfig,
+        rate_limiter: Any,
+        idempotency_key: Optional[str] = None,
+        idempotent: bool = False,
+    ) -> None:
+        """
+        The attempts of one SDK request: how long each waits on the rate limiter, the timeout
+        it gets within the retry deadline, and whether a failed one is retried and after how
+        long. The body is encoded once, for every attempt. Use it as the context manager of
+        the request's span.
+        """
+        self.http_method = http_method
+        self.endpoint = endpoint
+        self.config = config
+        self.rate_limiter = rate_limiter
+        self.idempotency_key = idempotency_key
+        self.idempotent = idempotent
+        self.body: Optional[bytes] = None if params is None else config.json_codec.encode(params)
+        self.template = request_template(base_uri=base_url(config=config), api_key=config.api_key)
+        self.retry_policy = config.retry_policy
+        self.deadline: Optional[float] = self.retry_policy.start_deadline()
+        self.retry: int = 0
+        self.waits = RequestWaits()
+        self.event: Optional[RequestEvent] = None
+        self._span_context = call_span(config.tracer, http_method, endpoint)
+        self.span: Any = None
+
+    def __enter__(self) -> "RequestAttempts":
+        self.span = self._span_context.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> Optional[bool]:
+        return self._span_context.__exit__(exc_type, exc, traceback)
+
+    def reserve(self) -> Tuple[float, float]:
+        """
+        Reserve the next attempt on the rate limiter: the seconds to wait before sending it,
+        and the timeout it gets.
+        """
+        delay = self.rate_limiter.reserve()
+        timeout = self.retry_policy.attempt_timeout(
+            deadline=self.deadline, delay=delay, timeout=self.config.timeout
+        )
+        if delay > 0:
+            self.waits.rate_limited(self.span, delay)
+        return delay, timeout
+
+    def attempt(self, wait: float, timeout: float) -> Attempt:
+        attempt = Attempt(self, wait=wait, timeout=timeout)
+        self.event = attempt.event
+        return attempt
+
+    def backoff(self, err: ShipEngineError) -> float:
+        """
+        The seconds to sleep before retrying after `err`, re-raised when it is not retried.
+        After a 429 every caller sharing the API key waits out the `Retry-After` window on the
+        rate limiter instead, so no sleep is left to the caller.
+        """
+        delay = self.retry_policy.retry_delay(
+            error=err, attempt=self.retry, http_method=self.http_method, idempotent=self.idempotent
+        )
+        if (
+            delay is None
+            or self.retry >= self.config.retries
+            or not self.retry_policy.within_deadline(deadline=self.deadline, delay=delay)
+        ):
+            raise err
+
+        retry_event(self.event, delay, self.config)
+        self.waits.retried(self.span, err, self.retry, delay)
+        self.retry += 1
+        if isinstance(err, RateLimitExceededError):
+            self.rate_limiter.pause(delay)
+            return 0.0
+        return delay
@@ -1,66 +1,117 @@
 """A synchronous HTTP Client for the ShipEngine SDK."""
 
-import json
-import os
-import platform
 import time
-from typing import Any, Dict, Optional
-from urllib.parse import urljoin
+from typing import Any, Dict, Iterator, Optional, Tuple
 
-import requests
-from requests import PreparedRequest, Request, RequestException, Response, Session
-from requests.adapters import HTTPAdapter
-from requests.auth import AuthBase
-from requests.packages.urllib3.util.retry import Retry
+from requests import RequestException, Response, Session
 
-from shipengine import __version__
-
-from ..enums import ErrorCode, ErrorSource, ErrorType, HTTPVerbs
-from ..errors import RateLimitExceededError, ShipEngineError
+from ..enums import HTTPVerbs
+from ..errors import ShipEngineError
 from ..shipengine_config import ShipEngineConfig
 from ..util import check_response_for_errors
-
-
-def base_url(config) -> str:
-    return config.base_uri if os.getenv("CLIENT_BASE_URI") is None else os.getenv("CLIENT_BASE_URI")
-
-
-def request_headers(user_agent: str, api_key: str) -> Dict[str, Any]:
-    return {
-        "User-Agent": user_agent,
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "Api-Key": api_key,
-    }
-
-
-class ShipEngineAuth(AuthBase):
-    def __init__(self, api_key: str) -> None:
-        """Auth Base appends `Api-Key` header to all requests."""
-        self.api_key: str = api_key
-
-    def __call__(self, request: Request, *args, **kwargs) -> Request:
-        request.headers["Api-Key"] = self.api_key
-        return request
+from .attempts import RequestAttempts, decode_body
+from .rate_limiter import rate_limiter_for
+from .request_template import base_url, request_template, user_agent
+from .session import SessionManager
+from .single_flight import SingleFlight
+from .transport import (
+    RequestsTransport,
+    Transport,
+    TransportRequest,
+    TransportResponse,
+    system_error,
+)
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+"""Default number of bytes per chunk yielded by `download()`."""
+
+
+def coalescing_key(http_method: str, endpoint: str, config) -> Tuple[str, str, str]:
+    template = request_template(base_uri=base_url(config=config), api_key=config.api_key)
+    return config.api_key, http_method, template.url(endpoint)
+
+
+def check_download_response(
+    status_code: int, content: bytes, response_headers, config: ShipEngineConfig
+) -> None:
+    """Raise for a failed download, including the statuses `check_response_for_errors` skips."""
+    check_response_for_errors(
+        status_code=status_code,
+        response_body=decode_body(status_code=status_code, content=content, config=config),
+        response_headers=response_headers,
+        config=config,
+    )
+    if status_code >= 400:
+        raise system_error(HTTPVerbs.GET.value, f"HTTP {status_code}")
+
+
+def download_request(endpoint: str, config: ShipEngineConfig) -> TransportRequest:
+    template = request_template(base_uri=base_url(config=config), api_key=config.api_key)
+    return TransportRequest(
+        http_method=HTTPVerbs.GET.value,
+        endpoint=endpoint,
+        body=None,
+        template=template,
+        config=config,
+        timeout=config.timeout,
+    )
+
+
+def download_chunks(
+    resp: TransportResponse, config: ShipEngineConfig, chunk_size: int
+) -> Iterator[bytes]:
+    """The body of a download answered by a transport, in chunks of `chunk_size` bytes."""
+    if resp.status_code >= 400:
+        check_download_response(resp.status_code, resp.content, resp.headers, config)
+    for start in range(0, len(resp.content), chunk_size):
+        yield resp.content[start : start + chunk_size]
 
 
 class ShipEngineClient:
     def __init__(self) -> None:
-        """A `JSON-RPC 2.0` HTTP client used to send all HTTP requests from the SDK."""
-        self.session = requests.session()
+        """
+        A `JSON-RPC 2.0` HTTP client used to send all HTTP requests from the SDK. A single
+        instance can be shared across threads, and survives being inherited by forked workers.
+        """
+        self.transport = RequestsTransport()
+        self.sessions: SessionManager = self.transport.sessions
+        self.in_flight = SingleFlight()
 
     def get(self, endpoint: str, config: ShipEngineConfig) -> Dict[str, Any]:
-        """Send an HTTP GET request."""
-        return self._request_loop(
-            http_method=HTTPVerbs.GET.value, endpoint=endpoint, params=None, config=config
-        )
+        """
+        Send an HTTP GET request. Unless `config.coalesce_requests` is off, threads sending the
+        same GET with the same API key while one is in flight share that request's result.
+        """
+
+        def send() -> Dict[str, Any]:
+            return self._request_loop(
+                http_method=HTTPVerbs.GET.value, endpoint=endpoint, params=None, config=config
+            )
+
+        if not config.coalesce_requests:
+            return send()
+        return self.in_flight.do(key=coalescing_key(HTTPVerbs.GET.value, endpoint, config), fn=send)
 
     def post(
-        self, endpoint: str, config: ShipEngineConfig, params: Optional[Dict[str, Any]] = None
+        self,
+        endpoint: str,
+        config: ShipEngineConfig,
+        params: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+        idempotent: bool = False,
     ) -> Dict[str, Any]:
-        """Send an HTTP POST request."""
+        """
+        Send an HTTP POST request. A POST carrying an `idempotency_key` is sent with an
+        `Idempotency-Key` header. It is retried after a 5xx or a connection failure like an
+        idempotent request only when `idempotent`, e.g. when the caller chose the key.
+        """
         return self._request_loop(
-            http_method=HTTPVerbs.POST.value, endpoint=endpoint, params=params, config=config
+            http_method=HTTPVerbs.POST.value,
+            endpoint=endpoint,
+            params=params,
+            config=config,
+            idempotency_key=idempotency_key,
+            idempotent=idempotent,
         )
 
     def delete(self, endpoint: str, config: ShipEngineConfig):
@@ -75,105 +126,85 @@ class ShipEngineClient:
             http_method=HTTPVerbs.PUT.value, endpoint=endpoint, params=params, config=config
         )
 
+    def download(
+        self, endpoint: str, config: ShipEngineConfig, chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """
+        Stream a binary download, e.g. the label PDF of a batch, in chunks of `chunk_size` bytes
+        without holding the whole file in memory. `endpoint` may also be an absolute URL, such
+        as a `label_download.href` returned by ShipEngine API. Downloads are not retried.
+        A transport passed in the `transport` config option answers the download in one piece.
+        """
+        delay = rate_limiter_for(config=config).reserve()
+        if delay > 0:
+            time.sleep(delay)
+        if config.transport is not None:
+            resp = config.transport.send(download_request(endpoint=endpoint, config=config))
+            yield from download_chunks(resp, config=config, chunk_size=chunk_size)
+            return
+
+        template = request_template(base_uri=base_url(config=config), api_key=config.api_key)
+        session: Session = self._request_retry_session(url_base=template.base_uri, config=config)
+        prepared_req = template.prepare(
+            http_method=HTTPVerbs.GET.value, endpoint=endpoint, body=None
+        )
+        prepared_req.headers["Accept"] = "*/*"
+        try:
+            resp: Response = session.send(
+                request=prepared_req, timeout=config.timeout, proxies=template.proxies, stream=True
+            )
+            with resp:
+                if resp.status_code >= 400:
+                    check_download_response(resp.status_code, resp.content, resp.headers, config)
+                yield from resp.iter_content(chunk_size=chunk_size)
+        except RequestException as err:
+            raise system_error(HTTPVerbs.GET.value, err)
+
+    def close(self) -> None:
+        """
+        Close the underlying sessions and release their keep-alive connections. A transport
+        passed in the `transport` config option is owned, and closed, by the caller.
+        """
+        self.transport.close()
+
     def _request_loop(
         self,
         http_method: str,
         endpoint: str,
         params: Optional[Dict[str, Any]],
         config: ShipEngineConfig,
+        idempotency_key: Optional[str] = None,
+        idempotent: bool = False,
     ) -> Dict[str, Any]:
-        retry: int = 0
-        while retry <= config.retries:
-            try:
-                api_response = self._send_request(
-                    http_method=http_method,
-                    endpoint=endpoint,
-                    body=params,
-                    retry=retry,
-                    config=config,
-                )
-            except Exception as err:
-                if (
-                    retry < config.retries
-                    and type(err) is RateLimitExceededError
-                    and err.retry_after < config.timeout
-                ):
-                    time.sleep(err.retry_after)
-                    retry += 1
-                    continue
-                else:
-                    raise err
-            return api_response
-
-    def _send_request(
-        self,
-        http_method: str,
-        endpoint: str,
-        body: Optional[Dict[str, Any]],
-        retry: int,
-        config: ShipEngineConfig,
-    ) -> Dict[str, Any]:
+        transport: Transport = config.transport or self.transport
+        with RequestAttempts(
+            http_method=http_method,
+            endpoint=endpoint,
+            params=params,
+            config=config,
+            rate_limiter=rate_limiter_for(config=config),
+            idempotency_key=idempotency_key,
+            idempotent=idempotent,
+        ) as attempts:
+            while True:
+                delay, timeout = attempts.reserve()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    with attempts.attempt(wait=delay, timeout=timeout) as attempt:
+                        return attempt.result(transport.send(attempt.request))
+                except ShipEngineError as err:
+                    backoff = attempts.backoff(err)
+                    if backoff > 0:
+                        time.sleep(backoff)
+
+    def _request_retry_session(self, url_base: str, config: ShipEngineConfig) -> Session:
         """
-        Send a `JSON-RPC 2.0` request via HTTP Messages to ShipEngine API. If the response
-         * is successful, the result is returned. Otherwise, an error is thrown.
+        A requests `Session()` for the given base URI. Sessions are shared per
+        (base_uri, pool settings) so their connection pools, and the keep-alive
+        connections in them, are reused across requests and threads.
         """
-        base_uri = base_url(config=config)
-        client: Session = self._request_retry_session(retries=config.retries, url_base=base_uri)
-
-        req_headers = request_headers(user_agent=self._derive_user_agent(), api_key=config.api_key)
-        req: Request = Request(
-            method=http_method,
-            url=urljoin(base_uri, endpoint),
-            data=json.dumps(body),
-            headers=req_headers,
-            auth=ShipEngineAuth(config.api_key),
-        )
-        prepared_req: PreparedRequest = req.prepare()
-
-        try:
-            resp: Response = client.send(request=prepared_req, timeout=config.timeout)
-        except RequestException as err:
-            raise ShipEngineError(
-                message=(
-                    f"An unknown error occurred while calling the ShipEngine {http_method} "
-                    f"API:\n {err.response}"
-                ),
-                error_source=ErrorSource.SHIPENGINE.value,
-                error_type=ErrorType.SYSTEM.value,
-                error_code=ErrorCode.UNSPECIFIED.value,
-            )
-
-        resp_body: Dict[str, Any] = resp.json()
-        status_code: int = resp.status_code
-
-        check_response_for_errors(
-            status_code=status_code,
-            response_body=resp_body,
-            response_headers=resp.headers,
-            config=config,
-        )
-        return resp_body
-
-    def _request_retry_session(
-        self,
-        url_base: str,
-        retries: int = 1,
-        backoff_factor=1,
-        status_force_list=(429, 500, 502, 503, 504),
-    ) -> Session:
-        """A requests `Session()` that has retries enforced."""
-        retry: Retry = Retry(
-            total=retries,
-            read=retries,
-            connect=retries,
-            backoff_factor=backoff_factor,
-            status_forcelist=status_force_list,
-        )
-        adapter: HTTPAdapter = HTTPAdapter(max_retries=retry)
-        self.session.mount("http://", adapter=adapter)
-        self.session.mount("https://", adapter=adapter)
-        self.session.url_base = url_base
-        return self.session
+        return self.sessions.get_session(url_base=url_base, config=config)
 
     @staticmethod
     def _derive_user_agent() -> str:
@@ -184,13 +215,4 @@ class ShipEngineClient:
         :returns: A user-agent string that will be set in the `ShipEngineClient` request headers.
         :rtype: str
         """
-        sdk_version: str = f"shipengine-python/{__version__}"
-        platform_os = platform.system()
-        os_version = platform.release()
-        python_version: str = platform.python_version()
-        python_implementation: str = platform.python_implementation()
-
-        return (
-            f"shipengine-python/{sdk_version} {platform_os}/{os_version} "
-            f"{python_implementation}/{python_version}"
-        )
+        return user_agent()
@@ -0,0 +1,125 @@
+"""Client-side, per API key rate limiting for the ShipEngine SDK."""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from ..shipengine_config import ShipEngineConfig
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        A thread-safe token bucket that refills at `rate` tokens per second up to `capacity`.
+        Callers reserve a token with `reserve()` and sleep for the delay it returns, so waiting
+        callers are released one at a time at the configured rate. A `rate` of `None` disables
+        proactive limiting, but the bucket still honors pauses requested by `pause()`.
+        """
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._updated: float = clock()
+        self._paused_until: float = 0.0
+        self.rate: Optional[float] = None
+        self.capacity: float = 1.0
+        self._tokens: float = float("inf")
+        self.configure(rate=rate, capacity=capacity)
+
+    def configure(self, rate: Optional[float], capacity: Optional[float] = None) -> None:
+        """Change the refill rate and burst capacity of the bucket."""
+        with self._lock:
+            self.rate = rate
+            self.capacity = float(capacity if capacity is not None else max(1.0, rate or 1.0))
+            self._tokens = min(self._tokens, self.capacity) if rate else self.capacity
+
+    def reserve(self) -> float:
+        """
+        Take a token from the bucket, borrowing against future refills if it is empty.
+
+        :returns float: The number of seconds the caller must wait before sending its request.
+        """
+        with self._lock:
+            now = self._clock()
+            wait = max(0.0, self._paused_until - now)
+            if self.rate:
+                elapsed = now - self._updated
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self.rate)
+            self._updated = now
+            return wait
+
+    def try_take(self) -> bool:
+        """Take a token only if one is available right now, without borrowing or waiting."""
+        with self._lock:
+            now = self._clock()
+            if now < self._paused_until:
+                return False
+            if self.rate:
+                elapsed = now - self._updated
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                self._updated = now
+                if self._tokens < 1:
+                    return False
+                self._tokens -= 1
+            return True
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every caller sharing this bucket for `seconds`, e.g. for the duration of a
+        `Retry-After` header on a 429 response, and drain the bucket so that traffic resumes at
+        the configured rate instead of in a burst.
+        """
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + seconds)
+            if self.rate:
+                self._tokens = min(self._tokens, 0.0)
+                self._updated = max(self._updated, now)
+
+
+BucketKey = Tuple[str, Optional[float], Optional[int]]
+
+_buckets: Dict[BucketKey, TokenBucket] = dict()
+_buckets_lock = threading.Lock()
+
+
+def rate_limiter_for(config: ShipEngineConfig) -> TokenBucket:
+    """
+    Return the process-wide token bucket for `config.api_key` and its rate limit settings.
+    Every client, thread and coroutine using the same API key with the same
+    `requests_per_second` and `rate_limit_burst` shares one bucket, and so one request budget.
+    A config with other settings gets a bucket of its own rather than reconfiguring the one
+    the others share.
+    """
+    key: BucketKey = (config.api_key, config.requests_per_second, config.rate_limit_burst)
+    bucket: Optional[TokenBucket] = _buckets.get(key)
+    if bucket is not None:
+        return bucket
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate=config.requests_per_second, capacity=config.rate_limit_burst)
+            _buckets[key] = bucket
+        return bucket
+
+
+def _reset_locks_after_fork() -> None:
+    """
+    Replace the locks a forked child inherits: another parent thread may have held them at
+    fork time, and no thread of the child would ever release them.
+    """
+    global _buckets_lock
+    _buckets_lock = threading.Lock()
+    for bucket in _buckets.values():
+        bucket._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_locks_after_fork)
@@ -0,0 +1,103 @@
+"""The precomputed, per-configuration parts of every request sent by the SDK HTTP clients."""
+
+import os
+import platform
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from urllib.parse import urljoin
+
+from requests import PreparedRequest
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_environ_proxies
+
+from shipengine import __version__
+
+from ..enums import HTTPVerbs
+
+
+@lru_cache(maxsize=None)
+def user_agent() -> str:
+    """
+    Derive a User-Agent header from the environment, once per process. This is the user-agent
+    that is set on every request sent by the SDK HTTP clients.
+    """
+    sdk_version: str = f"shipengine-python/{__version__}"
+    platform_os = platform.system()
+    os_version = platform.release()
+    python_version: str = platform.python_version()
+    python_implementation: str = platform.python_implementation()
+
+    return (
+        f"shipengine-python/{sdk_version} {platform_os}/{os_version} "
+        f"{python_implementation}/{python_version}"
+    )
+
+
+def base_url(config) -> str:
+    base_uri = os.getenv("CLIENT_BASE_URI")
+    return config.base_uri if base_uri is None else base_uri
+
+
+@lru_cache(maxsize=256)
+def request_template(base_uri: str, api_key: str) -> "RequestTemplate":
+    """The shared `RequestTemplate` for a base URI and API key."""
+    return RequestTemplate(base_uri=base_uri, api_key=api_key)
+
+
+class RequestTemplate:
+    def __init__(self, base_uri: str, api_key: str) -> None:
+        """
+        Everything about a request that only depends on the base URI and the API key: the
+        headers, the user agent and the proxies picked from the environment. It is built once
+        per configuration and reused by every request, only the method, URL and body vary.
+        """
+        self.base_uri = base_uri
+        self.headers: Dict[str, str] = {
+            "User-Agent": user_agent(),
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Api-Key": api_key,
+        }
+        self.bodyless_headers: Dict[str, str] = {
+            name: value for name, value in self.headers.items() if name != "Content-Type"
+        }
+        # Resolved once instead of on every `Session.send()`, which scans the whole environment.
+        self.proxies: Dict[str, str] = get_environ_proxies(base_uri)
+
+    def url(self, endpoint: str) -> str:
+        """The absolute URL of `endpoint`, relative endpoints are appended to the base URI."""
+        if self.base_uri.endswith("/") and not endpoint.startswith("/") and "://" not in endpoint:
+            return self.base_uri + endpoint
+        return urljoin(self.base_uri, endpoint)
+
+    def request_headers(
+        self, body: Optional[bytes], idempotency_key: Optional[str] = None
+    ) -> Dict[str, str]:
+        """A fresh copy of the headers for a request with, or without, a body."""
+        headers = dict(self.headers if body is not None else self.bodyless_headers)
+        if idempotency_key is not None:
+            headers["Idempotency-Key"] = idempotency_key
+        return headers
+
+    def prepare(
+        self,
+        http_method: str,
+        endpoint: str,
+        body: Optional[bytes],
+        idempotency_key: Optional[str] = None,
+    ) -> PreparedRequest:
+        """
+        Build the `requests.PreparedRequest`, skipping the header validation, auth and hook
+        handling `requests.Request.prepare()` would redo for headers already known to be valid.
+        """
+        request = PreparedRequest()
+        request.prepare_method(http_method)
+        request.prepare_url(self.url(endpoint), None)
+        headers: Any = CaseInsensitiveDict(self.request_headers(body, idempotency_key))
+        if body is not None:
+            headers["Content-Length"] = str(len(body))
+        elif http_method not in (HTTPVerbs.GET.value, "HEAD"):
+            headers["Content-Length"] = "0"
+        request.headers = headers
+        request.body = body
+        return request
@@ -0,0 +1,82 @@
+"""Thread- and fork-safe management of the `requests` sessions used by the ShipEngineClient."""
+
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+from ..shipengine_config import ShipEngineConfig
+
+SessionKey = Tuple[str, int, int, bool]
+
+
+class SessionManager:
+    def __init__(self) -> None:
+        """
+        Owns one `requests.Session` per distinct (base_uri, pool settings) and hands them out
+        to any number of threads. A session's adapters are mounted once, when it is created,
+        and never mutated afterwards, so concurrent `send()` calls are safe and share the same
+        urllib3 connection pools. urllib3 never retries on its own, every retry goes through
+        the `RetryPolicy` applied by the ShipEngineClient.
+
+        Sessions are tied to the process that created them. After a `fork()` (e.g. gunicorn
+        `--preload`) the child notices the PID change and builds fresh pools instead of
+        reusing the sockets it inherited from the parent.
+        """
+        self._lock = threading.Lock()
+        self._pid: int = os.getpid()
+        self._sessions: Dict[SessionKey, Session] = dict()
+
+    def get_session(self, url_base: str, config: ShipEngineConfig) -> Session:
+        """Return the shared session for the given base URI and configuration."""
+        self._check_pid()
+        key: SessionKey = (
+            url_base,
+            config.pool_connections,
+            config.pool_maxsize,
+            config.pool_block,
+        )
+        session: Optional[Session] = self._sessions.get(key)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._build_session(config=config)
+                self._sessions[key] = session
+            return session
+
+    def close(self) -> None:
+        """Close every session and the keep-alive connections they hold."""
+        self._check_pid()
+        with self._lock:
+            sessions, self._sessions = self._sessions, dict()
+        for session in sessions.values():
+            session.close()
+
+    def _check_pid(self) -> None:
+        """Drop sessions inherited across a `fork()`, a child never shares its parent's sockets."""
+        pid = os.getpid()
+        if pid != self._pid:
+            # The child starts with a single thread, so no lock is taken here: the inherited lock
+            # may have been held by another parent thread at fork time. The inherited sockets are
+            # discarded rather than closed, closing them could tear down the parent's connections.
+            self._lock = threading.Lock()
+            self._sessions = dict()
+            self._pid = pid
+
+    def _build_session(self, config: ShipEngineConfig) -> Session:
+        adapter: HTTPAdapter = HTTPAdapter(
+            max_retries=0,
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+        )
+        session: Session = requests.session()
+        session.mount("http://", adapter=adapter)
+        session.mount("https://", adapter=adapter)
+        return session
@@ -0,0 +1,91 @@
+"""Coalescing of identical, concurrent in-flight GET requests."""
+
+import asyncio
+import copy
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        """
+        Lets concurrent threads asking for the same key share a single call. The first thread
+        to ask runs the call, every thread arriving while it is in flight waits for it and
+        receives a copy of its result, or the error it raised. Nothing is cached: once the call
+        returns, the next caller starts a fresh one.
+        """
+        self._lock = threading.Lock()
+        self._pid: int = os.getpid()
+        self._calls: Dict[Hashable, _Call] = dict()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run `fn()`, or wait for the call already in flight for `key`."""
+        self._check_pid()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def _check_pid(self) -> None:
+        """Forget calls inherited across a `fork()`, their threads do not exist in the child."""
+        pid = os.getpid()
+        if pid != self._pid:
+            self._lock = threading.Lock()
+            self._calls = dict()
+            self._pid = pid
+
+
+class AsyncSingleFlight:
+    def __init__(self) -> None:
+        """
+        The `asyncio` counterpart of `SingleFlight`. The shared call runs in its own task, so
+        a caller being cancelled does not cancel the request the other callers wait on.
+        """
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = dict()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `fn()`, or the call already in flight for `key`."""
+        task = self._calls.get(key)
+        if task is not None:
+            return copy.deepcopy(await asyncio.shield(task))
+
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the error as retrieved, every caller may have been cancelled already.
+            task.exception()
@@ -0,0 +1,193 @@
+"""The transports the SDK HTTP clients send their requests with."""
+
+import abc
+import asyncio
+from typing import Any, Dict, Mapping, Optional
+
+import aiohttp
+from requests import RequestException, Response, Session
+
+from ..enums import ErrorCode, ErrorSource, ErrorType
+from ..errors import ClientSystemError
+from .request_template import RequestTemplate
+from .session import SessionManager
+
+
+def system_error(http_method: str, detail: Any) -> ClientSystemError:
+    return ClientSystemError(
+        message=(
+            f"An unknown error occurred while calling the ShipEngine {http_method} "
+            f"API:\n {detail}"
+        ),
+        error_source=ErrorSource.SHIPENGINE.value,
+        error_type=ErrorType.SYSTEM.value,
+        error_code=ErrorCode.UNSPECIFIED.value,
+    )
+
+
+class TransportRequest:
+    def __init__(
+        self,
+        http_method: str,
+        endpoint: str,
+        body: Optional[bytes],
+        template: RequestTemplate,
+        config: Any,
+        timeout: Optional[float],
+        idempotency_key: Optional[str] = None,
+    ) -> None:
+        """
+        One HTTP attempt handed to a transport: the method, the endpoint relative to the base
+        URI and the encoded body. The URL and headers are derived from `template` on demand, a
+        transport that never touches the network does not pay for them.
+
+        :param ShipEngineConfig config: The configuration of the request, e.g. its pool sizes.
+        :param float timeout: Seconds the attempt may take.
+        """
+        self.http_method = http_method
+        self.endpoint = endpoint
+        self.body = body
+        self.template = template
+        self.config = config
+        self.timeout = timeout
+        self.idempotency_key = idempotency_key
+
+    @property
+    def url(self) -> str:
+        return self.template.url(self.endpoint)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return self.template.request_headers(self.body, self.idempotency_key)
+
+    def __repr__(self) -> str:
+        return f"TransportRequest({self.http_method} {self.endpoint})"
+
+
+class TransportResponse:
+    def __init__(self, status_code: int, headers: Mapping[str, str], content: bytes) -> None:
+        """
+        The response to a `TransportRequest`, its body not decoded yet. `headers` must be
+        looked up case-insensitively, e.g. a `requests.structures.CaseInsensitiveDict`.
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def __repr__(self) -> str:
+        return f"TransportResponse(status_code={self.status_code})"
+
+
+class Transport(abc.ABC):
+    """
+    Sends the requests of the synchronous `ShipEngineClient`, pass an instance in the
+    `transport` config option. Implementations must be safe to call from many threads, and
+    raise `ClientSystemError` when no response could be obtained.
+    """
+
+    @abc.abstractmethod
+    def send(self, request: TransportRequest) -> TransportResponse:
+        """Send `request` and return its response, whatever its status."""
+
+    def close(self) -> None:
+        """Release the connections held by the transport."""
+
+
+class AsyncTransport(abc.ABC):
+    """The `asyncio` counterpart of `Transport`, used by the `AsyncShipEngineClient`."""
+
+    @abc.abstractmethod
+    async def send_async(self, request: TransportRequest) -> TransportResponse:
+        """Send `request` without blocking the event loop and return its response."""
+
+    async def close_async(self) -> None:
+        """Release the connections held by the transport."""
+
+
+class RequestsTransport(Transport):
+    def __init__(self) -> None:
+        """The default transport of the `ShipEngineClient`, backed by shared `requests` sessions."""
+        self.sessions = SessionManager()
+
+    def send(self, request: TransportRequest) -> TransportResponse:
+        template = request.template
+        session: Session = self.sessions.get_session(
+            url_base=template.base_uri, config=request.config
+        )
+        prepared_req = template.prepare(
+            http_method=request.http_method,
+            endpoint=request.endpoint,
+            body=request.body,
+            idempotency_key=request.idempotency_key,
+        )
+        try:
+            resp: Response = session.send(
+                request=prepared_req, timeout=request.timeout, proxies=template.proxies
+            )
+        except RequestException as err:
+            raise system_error(request.http_method, err)
+        return TransportResponse(resp.status_code, resp.headers, resp.content)
+
+    def close(self) -> None:
+        self.sessions.close()
+
+
+class AiohttpTransport(AsyncTransport):
+    def __init__(self) -> None:
+        """
+        The default transport of the `AsyncShipEngineClient`, backed by `aiohttp`. Its session
+        belongs to the event loop it was created on, so a client reused across `asyncio.run()`
+        calls opens a new one in each loop.
+        """
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def send_async(self, request: TransportRequest) -> TransportResponse:
+        session = await self.session(config=request.config)
+        try:
+            async with session.request(
+                method=request.http_method,
+                url=request.url,
+                data=request.body,
+                headers=request.headers,
+                timeout=aiohttp.ClientTimeout(total=request.timeout),
+            ) as resp:
+                return TransportResponse(resp.status, resp.headers, await resp.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise system_error(request.http_method, err)
+
+    async def session(self, config: Any) -> aiohttp.ClientSession:
+        """
+        The `aiohttp.ClientSession` of the running loop, created on first use. The connector
+        is sized from the connection pool settings of the first request's config. A session
+        left over from another loop is closed first.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._loop is not loop:
+            await self._release()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=config.pool_connections * config.pool_maxsize,
+                limit_per_host=config.pool_maxsize,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._loop = loop
+        return self._session
+
+    async def close_async(self) -> None:
+        await self._release()
+
+    async def _release(self) -> None:
+        """
+        Close the session, from the loop it belongs to when that loop is still alive, e.g.
+        running in another thread. The connections of a closed loop are gone already, closing
+        its session from the running loop only releases what is left of it.
+        """
+        session, loop = self._session, self._loop
+        self._session, self._loop = None, None
+        if session is None or session.closed:
+            return
+        if loop is None or loop is asyncio.get_running_loop() or loop.is_closed():
+            await session.close()
+        else:
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
@@ -0,0 +1,72 @@
+"""Idempotency keys and the ledger of completed label purchases."""
+
+import copy
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def new_idempotency_key() -> str:
+    """Generate a new, random idempotency key for one logical label purchase."""
+    return uuid.uuid4().hex
+
+
+def purchase_key(idempotency_key: Optional[str]) -> Tuple[str, bool]:
+    """
+    The idempotency key a label purchase is sent with, and whether it may be retried after a
+    5xx or a lost connection.
+    """
+    # Only a key chosen by the caller makes a retry after a 5xx or a lost connection safe,
+    # a generated one relies on ShipEngine alone to spot the duplicate purchase.
+    if idempotency_key is None:
+        return new_idempotency_key(), False
+    return idempotency_key, True
+
+
+class IdempotencyLedger:
+    DEFAULT_MAX_ENTRIES: int = 10000
+    """Default number of completed purchases remembered before the oldest are forgotten."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """
+        A thread-safe record of completed label purchases, keyed by idempotency key. Once a
+        purchase succeeds its label is stored here, and any later call with the same key is
+        answered from the ledger instead of buying the label again.
+
+        The ledger is kept in memory and bounded to `max_entries`, least recently used keys
+        are evicted first. Subclass it and override `get()` and `record()` to back it with
+        shared storage.
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def get(self, idempotency_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a copy of the label recorded for `idempotency_key`, or `None` if there is none,
+        so a caller changing it leaves the recorded label intact for later replays.
+        """
+        with self._lock:
+            label = self._entries.get(idempotency_key)
+            if label is None:
+                return None
+            self._entries.move_to_end(idempotency_key)
+        return copy.deepcopy(label)
+
+    def record(self, idempotency_key: str, label: Dict[str, Any]) -> None:
+        """Record a copy of the label returned by a successful purchase."""
+        label = copy.deepcopy(label)
+        with self._lock:
+            self._entries[idempotency_key] = label
+            self._entries.move_to_end(idempotency_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, idempotency_key: str) -> bool:
+        with self._lock:
+            return idempotency_key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,133 @@
+"""Hooks observing every HTTP request the ShipEngine SDK clients send."""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .errors import ShipEngineError
+
+logger = logging.getLogger(__name__)
+
+_ID_SEGMENT = re.compile(r"\d")
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    The endpoint with its IDs replaced by `{id}` and its query dropped, e.g.
+    `v1/labels/{id}/track` for `v1/labels/se-28529731/track`, so metrics are grouped by
+    endpoint rather than by resource. Any path segment after the version holding a digit is
+    taken for an ID, absolute URLs are reduced to their path.
+    """
+    path = urlsplit(endpoint).path.strip("/")
+    version, _, rest = path.partition("/")
+    if not rest:
+        return version
+    segments = ["{id}" if _ID_SEGMENT.search(segment) else segment for segment in rest.split("/")]
+    return "/".join([version, *segments])
+
+
+def rate_limit_headers(headers: Optional[Mapping[str, str]]) -> Dict[str, str]:
+    """The `X-Rate-Limit-*` and `Retry-After` headers of a response."""
+    if not headers:
+        return dict()
+    return {
+        name: value
+        for name, value in headers.items()
+        if name.lower().startswith("x-rate-limit") or name.lower() == "retry-after"
+    }
+
+
+class RequestEvent:
+    def __init__(self, http_method: str, endpoint: str, attempt: int) -> None:
+        """
+        One attempt of an HTTP request, passed to every `Instrumentation` hook. The fields not
+        known yet when a hook fires are `None`, e.g. `status_code` in `on_request_start()`, or
+        after a connection failure.
+
+        :param str endpoint: The endpoint template, see `endpoint_template()`.
+        :param int attempt: 0 for the first attempt, then 1 for the first retry and so on.
+        """
+        self.http_method = http_method
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.status_code: Optional[int] = None
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+        self.wait_time: float = 0.0
+        """Seconds spent waiting on the client-side rate limiter before the attempt."""
+        self.network_time: Optional[float] = None
+        """Seconds between sending the request and receiving the whole response body."""
+        self.sdk_time: Optional[float] = None
+        """Seconds the SDK spent on the attempt around the network: encoding, decoding, checks."""
+        self.rate_limit: Dict[str, str] = dict()
+        """The rate-limit headers of the response, see `rate_limit_headers()`."""
+        self.error: Optional[ShipEngineError] = None
+        self.retry_delay: Optional[float] = None
+        """Seconds until the next attempt, only set in `on_request_retry()`."""
+
+    def record_response(
+        self, status_code: int, bytes_received: int, headers: Optional[Mapping[str, str]]
+    ) -> None:
+        self.status_code = status_code
+        self.bytes_received = bytes_received
+        self.rate_limit = rate_limit_headers(headers)
+
+    def record_timings(
+        self, started: float, sent: Optional[float], received: Optional[float], ended: float
+    ) -> None:
+        """
+        Split the attempt, from `started` to `ended`, between the network, from `sent` until
+        `received` or until the failure, and the SDK.
+        """
+        self.network_time = 0.0 if sent is None else (received or ended) - sent
+        self.sdk_time = max(0.0, ended - started - self.network_time)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds the attempt took, rate limiter wait excluded."""
+        if self.network_time is None or self.sdk_time is None:
+            return None
+        return self.network_time + self.sdk_time
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestEvent({self.http_method} {self.endpoint}, attempt={self.attempt}, "
+            f"status_code={self.status_code})"
+        )
+
+
+class Instrumentation:
+    """
+    Base class of the hooks observing HTTP requests, pass instances in the `instrumentation`
+    config option. Every method is a no-op, override the ones you need. Hooks run on the thread,
+    or in the event loop, sending the request and must be quick. An exception raised by a hook
+    is logged and does not fail the request.
+    """
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        """Called before every attempt is sent."""
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        """Called after every attempt, successful or not, with its status, sizes and timings."""
+
+    def on_request_retry(self, event: RequestEvent) -> None:
+        """Called after a failed attempt that is about to be retried after `retry_delay`."""
+
+
+def resolve_instrumentation(value: Any) -> Tuple[Instrumentation, ...]:
+    """Turn the `instrumentation` config value, one hook or an iterable of hooks, into a tuple."""
+    if value is None:
+        return tuple()
+    if isinstance(value, Instrumentation):
+        return (value,)
+    return tuple(value)
+
+
+def emit(hooks: Iterable[Instrumentation], name: str, event: RequestEvent) -> None:
+    """Call the hook method `name` of every hook with `event`."""
+    for hook in hooks:
+        try:
+            getattr(hook, name)(event)
+        except Exception:
+            logger.exception("Instrumentation hook %r failed in %s.", hook, name)
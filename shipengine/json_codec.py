@@ -0,0 +1,68 @@
+"""The JSON codec used by the ShipEngine SDK HTTP clients for request and response bodies."""
+
+import json
+from typing import Any, Callable, Union
+
+
+class JSONCodec:
+    def __init__(
+        self,
+        dumps: Callable[[Any], Union[bytes, str]],
+        loads: Callable[[bytes], Any],
+        name: str = "custom",
+    ) -> None:
+        """
+        Encodes request bodies and decodes response bodies. `dumps` should return `bytes`,
+        they are sent as-is without an intermediate `str` copy, a `str` is encoded as UTF-8.
+        `loads` receives the raw response body and must raise `ValueError` for invalid JSON.
+
+        :param dumps: Serialize a request body, e.g. `orjson.dumps`.
+        :param loads: Deserialize a response body, e.g. `orjson.loads`.
+        :param str name: A label for the codec, shown by `ShipEngineConfig.to_json()`.
+        """
+        self.name = name
+        self._dumps = dumps
+        self._loads = loads
+
+    def encode(self, obj: Any) -> bytes:
+        """Serialize `obj` to the bytes of a request body."""
+        data = self._dumps(obj)
+        return data.encode("utf-8") if isinstance(data, str) else data
+
+    def decode(self, data: bytes) -> Any:
+        """Deserialize the bytes of a response body."""
+        return self._loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+STDLIB_CODEC = JSONCodec(dumps=_stdlib_dumps, loads=json.loads, name="json")
+"""The default codec, backed by the standard library `json` module."""
+
+
+def orjson_codec() -> JSONCodec:
+    """
+    A codec backed by `orjson`, which encodes straight to `bytes`.
+
+    :raises ImportError: If `orjson` is not installed, `pip install shipengine[orjson]`.
+    """
+    import orjson
+
+    return JSONCodec(dumps=orjson.dumps, loads=orjson.loads, name="orjson")
+
+
+def resolve_json_codec(codec: Any) -> JSONCodec:
+    """
+    Turn the `json_codec` config value into a `JSONCodec`: `None` or `"json"` for the standard
+    library, `"orjson"`, a `(dumps, loads)` pair of callables, or a `JSONCodec` instance.
+    """
+    if codec is None or codec == "json":
+        return STDLIB_CODEC
+    if codec == "orjson":
+        return orjson_codec()
+    if isinstance(codec, JSONCodec):
+        return codec
+    dumps, loads = codec
+    return JSONCodec(dumps=dumps, loads=loads)
@@ -0,0 +1,254 @@
+"""An in-memory aggregator of the request metrics reported by the SDK instrumentation hooks."""
+
+import bisect
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .instrumentation import Instrumentation, RequestEvent
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+"""Default upper bounds in seconds of the latency histogram buckets."""
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """A fixed-bucket histogram, the last bucket counts the values above every bound."""
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the `q` quantile, `0 <= q <= 1`, interpolating linearly within its bucket like
+        Prometheus `histogram_quantile()`. `None` when nothing was observed.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+class EndpointMetrics:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        """The metrics of one HTTP method and endpoint template."""
+        self.latency = Histogram(buckets)
+        self.statuses: Dict[str, int] = dict()
+        self.retries: int = 0
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+        self.network_time: float = 0.0
+        self.sdk_time: float = 0.0
+        self.wait_time: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(
+            count for status, count in self.statuses.items() if not status.startswith(("2", "3"))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "statuses": dict(self.statuses),
+            "p50": self.latency.quantile(0.5),
+            "p95": self.latency.quantile(0.95),
+            "p99": self.latency.quantile(0.99),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "network_time": self.network_time,
+            "sdk_time": self.sdk_time,
+            "wait_time": self.wait_time,
+        }
+
+
+class MetricsAggregator(Instrumentation):
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Aggregates every request attempt by HTTP method and endpoint template: a latency
+        histogram, the count of each status, retries, bytes and the time spent in the SDK
+        versus on the network. Pass it in the `instrumentation` config option, then read
+        `snapshot()`, `slowest()` or `to_prometheus()`.
+
+        >>> metrics = MetricsAggregator()
+        >>> shipengine = ShipEngine({"api_key": api_key, "instrumentation": metrics})
+        >>> metrics.slowest(0.99)
+        [('POST v1/labels', 1.84), ('GET v1/labels/{id}/track', 0.31)]
+
+        Connection failures and timeouts are counted under the `error` status.
+        """
+        self.buckets = tuple(buckets)
+        self.rate_limit: Dict[str, str] = dict()
+        """The rate-limit headers of the latest response that carried some."""
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointMetrics] = dict()
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        status = "error" if event.status_code is None else str(event.status_code)
+        with self._lock:
+            metrics = self._metrics(event)
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            metrics.bytes_sent += event.bytes_sent
+            metrics.bytes_received += event.bytes_received
+            metrics.wait_time += event.wait_time
+            if event.duration is not None:
+                metrics.latency.observe(event.duration)
+                metrics.network_time += event.network_time
+                metrics.sdk_time += event.sdk_time
+            if event.rate_limit:
+                self.rate_limit = event.rate_limit
+
+    def on_request_retry(self, event: RequestEvent) -> None:
+        with self._lock:
+            self._metrics(event).retries += 1
+
+    def quantile(self, http_method: str, endpoint: str, q: float) -> Optional[float]:
+        """The estimated `q` quantile of the latency of an endpoint template, in seconds."""
+        with self._lock:
+            metrics = self._endpoints.get((http_method, endpoint))
+            return None if metrics is None else metrics.latency.quantile(q)
+
+    def slowest(self, q: float = 0.99) -> List[Tuple[str, float]]:
+        """Every `"METHOD endpoint"` with its estimated `q` latency quantile, slowest first."""
+        with self._lock:
+            quantiles = [
+                (f"{method} {endpoint}", metrics.latency.quantile(q))
+                for (method, endpoint), metrics in self._endpoints.items()
+            ]
+        ranked = [(name, value) for name, value in quantiles if value is not None]
+        return sorted(ranked, key=lambda item: item[1], reverse=True)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """The metrics of every endpoint template, keyed by `"METHOD endpoint"`."""
+        with self._lock:
+            return {
+                f"{method} {endpoint}": metrics.to_dict()
+                for (method, endpoint), metrics in sorted(self._endpoints.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+            self.rate_limit = dict()
+
+    def to_prometheus(self, prefix: str = "shipengine") -> str:
+        """The metrics in the Prometheus text exposition format, to serve on a `/metrics` page."""
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            rate_limit = dict(self.rate_limit)
+
+        lines: List[str] = list()
+        header(lines, f"{prefix}_request_duration_seconds", "histogram", "Request attempt latency.")
+        for (method, endpoint), metrics in endpoints:
+            histogram, cumulative = metrics.latency, 0
+            for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                cumulative += count
+                le = bound if isinstance(bound, str) else format_value(bound)
+                sample(
+                    lines,
+                    f"{prefix}_request_duration_seconds_bucket",
+                    cumulative,
+                    method,
+                    endpoint,
+                    le=le,
+                )
+            sample(lines, f"{prefix}_request_duration_seconds_sum", histogram.sum, method, endpoint)
+            sample(
+                lines, f"{prefix}_request_duration_seconds_count", histogram.count, method, endpoint
+            )
+
+        header(lines, f"{prefix}_requests_total", "counter", "Request attempts by status.")
+        for (method, endpoint), metrics in endpoints:
+            for status, count in sorted(metrics.statuses.items()):
+                sample(lines, f"{prefix}_requests_total", count, method, endpoint, status=status)
+
+        counters = (
+            ("retries_total", "Retried request attempts.", "retries"),
+            ("request_bytes_sent_total", "Request body bytes sent.", "bytes_sent"),
+            ("request_bytes_received_total", "Response body bytes received.", "bytes_received"),
+            ("request_network_seconds_total", "Time spent on the network.", "network_time"),
+            ("request_sdk_seconds_total", "Time spent in the SDK around requests.", "sdk_time"),
+            ("request_wait_seconds_total", "Time spent waiting on the rate limiter.", "wait_time"),
+        )
+        for name, help_text, attribute in counters:
+            header(lines, f"{prefix}_{name}", "counter", help_text)
+            for (method, endpoint), metrics in endpoints:
+                sample(lines, f"{prefix}_{name}", getattr(metrics, attribute), method, endpoint)
+
+        remaining = rate_limit_remaining(rate_limit)
+        if remaining is not None:
+            header(lines, f"{prefix}_rate_limit_remaining", "gauge", "Requests left in the window.")
+            lines.append(f"{prefix}_rate_limit_remaining {format_value(remaining)}")
+        return "\n".join(lines) + "\n"
+
+    def _metrics(self, event: RequestEvent) -> EndpointMetrics:
+        key = (event.http_method, event.endpoint)
+        metrics = self._endpoints.get(key)
+        if metrics is None:
+            metrics = self._endpoints[key] = EndpointMetrics(self.buckets)
+        return metrics
+
+
+def header(lines: List[str], name: str, metric_type: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {metric_type}")
+
+
+def sample(
+    lines: List[str], name: str, value: float, method: str, endpoint: str, **labels: str
+) -> None:
+    pairs = dict(method=method, endpoint=endpoint, **labels)
+    rendered = ",".join(f'{label}="{escape(text)}"' for label, text in pairs.items())
+    lines.append(f"{name}{{{rendered}}} {format_value(value)}")
+
+
+def escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def rate_limit_remaining(rate_limit: Dict[str, str]) -> Optional[float]:
+    for name, value in rate_limit.items():
+        if name.lower() == "x-rate-limit-remaining":
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
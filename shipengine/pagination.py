@@ -0,0 +1,88 @@
+"""Lazy iteration over the paginated list endpoints of ShipEngine API."""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+Page = Dict[str, Any]
+
+
+def first_page_endpoint(
+    resource: str, page_size: int, params: Dict[str, Any], page_size_name: str = "page_size"
+) -> str:
+    """The endpoint of the first page of `resource`, filtered by the query `params`."""
+    query = {name: value for name, value in params.items() if value is not None}
+    query.update({"page": 1, page_size_name: page_size})
+    return f"{resource}?{urlencode(query, doseq=True)}"
+
+
+def next_page_endpoint(page: Page, endpoint: str) -> Optional[str]:
+    """
+    The endpoint of the page following `page`, fetched from `endpoint`, or `None` on the last
+    page. The path and query of `links.next` are kept, its host is dropped so the configured
+    base URI is used. When `page` is not the last one but has no `links.next`, the next page
+    is asked for by number, with the query of `endpoint`.
+    """
+    number, pages = page.get("page"), page.get("pages")
+    if number is not None and pages is not None and number >= pages:
+        return None
+
+    href = ((page.get("links") or dict()).get("next") or dict()).get("href")
+    if href:
+        return relative_endpoint(href)
+    if number is None or pages is None:
+        return None
+    url = urlsplit(endpoint)
+    query = [
+        (name, value)
+        for name, value in parse_qsl(url.query, keep_blank_values=True)
+        if name != "page"
+    ]
+    query.append(("page", str(number + 1)))
+    return f"{url.path}?{urlencode(query)}"
+
+
+def relative_endpoint(href: str) -> str:
+    """The path and query of a link returned by ShipEngine API, relative to the base URI."""
+    url = urlsplit(href)
+    return url.path.lstrip("/") + (f"?{url.query}" if url.query else "")
+
+
+def iter_pages(fetch: Callable[[str], Page], endpoint: str) -> Iterator[Page]:
+    """
+    Yield every page starting at `endpoint`. While the caller processes a page the next one
+    is fetched on a background thread, so at most two pages are held in memory.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shipengine-prefetch")
+    try:
+        page = fetch(endpoint)
+        while True:
+            endpoint = next_page_endpoint(page, endpoint)
+            prefetch: Optional[Future] = executor.submit(fetch, endpoint) if endpoint else None
+            yield page
+            if prefetch is None:
+                return
+            page = prefetch.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_pages(
+    fetch: Callable[[str], Awaitable[Page]], endpoint: str
+) -> AsyncIterator[Page]:
+    """The `asyncio` counterpart of `iter_pages()`, the next page is fetched in a task."""
+    prefetch: Optional["asyncio.Future[Page]"] = None
+    try:
+        page = await fetch(endpoint)
+        while True:
+            endpoint = next_page_endpoint(page, endpoint)
+            prefetch = asyncio.ensure_future(fetch(endpoint)) if endpoint else None
+            yield page
+            if prefetch is None:
+                return
+            page = await prefetch
+            prefetch = None
+    finally:
+        if prefetch is not None:
+            prefetch.cancel()
@@ -0,0 +1,145 @@
+"""Splitting a rate request per carrier and ranking the rates collected."""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .enums import ErrorSource, RateShoppingStrategy
+from .errors import InvalidFieldValueError, ShipEngineError
+
+RATE_AMOUNTS = ("shipping_amount", "insurance_amount", "confirmation_amount", "other_amount")
+
+
+def rate_shopping_strategy(
+    strategy: Union[str, RateShoppingStrategy], max_delivery_days: Optional[int]
+) -> RateShoppingStrategy:
+    """Validate `strategy`, `best_value` needs a `max_delivery_days` constraint."""
+    try:
+        strategy = RateShoppingStrategy(strategy)
+    except ValueError:
+        raise InvalidFieldValueError(
+            field_name="strategy",
+            reason="Must be one of: "
+            + ", ".join(member.value for member in RateShoppingStrategy)
+            + ".",
+            field_value=strategy,
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+
+    if strategy is RateShoppingStrategy.BEST_VALUE and max_delivery_days is None:
+        raise InvalidFieldValueError(
+            field_name="max_delivery_days",
+            reason="The best_value strategy requires max_delivery_days.",
+            field_value=max_delivery_days,
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+    return strategy
+
+
+def split_by_carrier(
+    shipment: Dict[str, Any], carrier_ids: Optional[Iterable[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    One `get_rates_from_shipment` request per carrier, each a copy of `shipment` whose
+    `rate_options.carrier_ids` holds that single carrier. Without `carrier_ids`, the carriers
+    already listed in the shipment's rate options are used.
+    """
+    rate_options = shipment.get("rate_options") or dict()
+    if carrier_ids is None:
+        carrier_ids = rate_options.get("carrier_ids") or list()
+
+    return {
+        carrier_id: dict(shipment, rate_options=dict(rate_options, carrier_ids=[carrier_id]))
+        for carrier_id in dict.fromkeys(carrier_ids)
+    }
+
+
+def collect_outcomes(
+    futures: Dict[str, Any], done: Set[Any]
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, ShipEngineError], List[str]]:
+    """
+    Sort per-carrier futures, `concurrent.futures.Future` or `asyncio.Task`, into responses,
+    errors and the carriers that did not answer in time. Futures not in `done` are cancelled.
+
+    :raises Exception: Any error that is not a `ShipEngineError`, it points at a bug.
+    """
+    responses: Dict[str, Dict[str, Any]] = dict()
+    errors: Dict[str, ShipEngineError] = dict()
+    timed_out: List[str] = list()
+    for carrier_id, future in futures.items():
+        if future not in done:
+            future.cancel()
+            # A straggler may still fail after being dropped, its error is consumed, not logged.
+            future.add_done_callback(lambda dropped: dropped.cancelled() or dropped.exception())
+            timed_out.append(carrier_id)
+        elif future.exception() is None:
+            responses[carrier_id] = future.result()
+        elif isinstance(future.exception(), ShipEngineError):
+            errors[carrier_id] = future.exception()
+        else:
+            raise future.exception()
+    return responses, errors, timed_out
+
+
+def rate_cost(rate: Dict[str, Any]) -> float:
+    """The total cost of a rate: shipping, insurance, confirmation and other amounts."""
+    return sum((rate.get(field) or dict()).get("amount") or 0.0 for field in RATE_AMOUNTS)
+
+
+def rate_days(rate: Dict[str, Any]) -> float:
+    """The delivery days of a rate, rates without an estimate sort last."""
+    days = rate.get("delivery_days")
+    return float("inf") if days is None else days
+
+
+def is_valid_rate(rate: Dict[str, Any]) -> bool:
+    return rate.get("validation_status") != "invalid" and not rate.get("error_messages")
+
+
+class RateShoppingResult:
+    def __init__(
+        self,
+        responses: Dict[str, Dict[str, Any]],
+        errors: Dict[str, ShipEngineError],
+        timed_out: List[str],
+        strategy: RateShoppingStrategy,
+        max_delivery_days: Optional[int] = None,
+    ) -> None:
+        """
+        The rates collected from every carrier that answered, ranked by `strategy`:
+
+        - `cheapest`: lowest total cost first, faster rates break ties.
+        - `fastest`: fewest delivery days first, cheaper rates break ties.
+        - `best_value`: the cheapest rates arriving within `max_delivery_days` first, followed
+          by those that do not, cheapest first.
+
+        :param Dict[str, Dict[str, Any]] responses: The `get_rates_from_shipment` response of
+        each carrier, by `carrier_id`.
+        :param Dict[str, ShipEngineError] errors: The error raised for each failed carrier.
+        :param List[str] timed_out: The carriers dropped for not answering in time.
+        """
+        self.strategy = strategy
+        self.max_delivery_days = max_delivery_days
+        self.responses = responses
+        self.errors = errors
+        self.timed_out = timed_out
+        self.invalid_rates: List[Dict[str, Any]] = list()
+
+        rates: List[Dict[str, Any]] = list()
+        for response in responses.values():
+            rate_response = response.get("rate_response") or dict()
+            self.invalid_rates.extend(rate_response.get("invalid_rates") or list())
+            for rate in rate_response.get("rates") or list():
+                (rates if is_valid_rate(rate) else self.invalid_rates).append(rate)
+        self.rates: List[Dict[str, Any]] = sorted(rates, key=self._rank)
+
+    @property
+    def best(self) -> Optional[Dict[str, Any]]:
+        """The top ranked rate, `None` if no carrier returned a usable rate."""
+        return self.rates[0] if self.rates else None
+
+    def _rank(self, rate: Dict[str, Any]) -> Tuple[float, ...]:
+        if self.strategy is RateShoppingStrategy.FASTEST:
+            return rate_days(rate), rate_cost(rate)
+        if self.strategy is RateShoppingStrategy.BEST_VALUE:
+            too_slow = rate_days(rate) > self.max_delivery_days
+            return float(too_slow), rate_cost(rate), rate_days(rate)
+        return rate_cost(rate), rate_days(rate)
@@ -0,0 +1,105 @@
+"""The retry policy applied by the ShipEngine SDK HTTP clients."""
+
+import random
+import time
+from typing import Optional, Tuple, Type
+
+from .enums import ErrorSource, HTTPVerbs
+from .errors import (
+    ClientSystemError,
+    ClientTimeoutError,
+    RateLimitExceededError,
+    ShipEngineError,
+)
+
+
+class RetryPolicy:
+    DEFAULT_BACKOFF_BASE: float = 0.5
+    """Default delay in seconds before the first retry, doubled on every further attempt."""
+
+    DEFAULT_BACKOFF_CAP: float = 30.0
+    """Default upper bound in seconds for a single backoff delay."""
+
+    def __init__(
+        self,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_cap: float = DEFAULT_BACKOFF_CAP,
+        deadline: Optional[float] = None,
+        retry_on: Tuple[Type[ShipEngineError], ...] = (RateLimitExceededError, ClientSystemError),
+        retry_non_idempotent: bool = False,
+    ) -> None:
+        """
+        The single source of truth for how the SDK retries failed requests. The number of
+        retries is still `ShipEngineConfig.retries`, this object decides how long to wait
+        between them and which errors are worth retrying at all.
+
+        :param float backoff_base: Delay before the first retry, doubled on every attempt.
+        :param float backoff_cap: Upper bound for a single backoff delay.
+        :param float deadline: End-to-end budget in seconds across every attempt and every wait,
+        `None` to only bound each attempt by `ShipEngineConfig.timeout`.
+        :param retry_on: The error types that are retried, 429 responses raise
+        `RateLimitExceededError`, 5xx responses and connection failures `ClientSystemError`.
+        :param bool retry_non_idempotent: Also retry POST requests after a 5xx or a connection
+        failure. Those may have been processed by ShipEngine already, a 429 is always safe.
+        """
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.deadline = deadline
+        self.retry_on = tuple(retry_on)
+        self.retry_non_idempotent = retry_non_idempotent
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter backoff: a random delay between zero and the capped exponential delay."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    def retry_delay(
+        self, error: Exception, attempt: int, http_method: str, idempotent: bool = False
+    ) -> Optional[float]:
+        """
+        Decide whether a failed attempt should be retried.
+
+        :param Exception error: The error raised by the attempt.
+        :param int attempt: The zero-based number of the attempt that failed.
+        :param str http_method: The HTTP verb of the request.
+        :param bool idempotent: Whether this particular request is safe to replay, e.g. a POST
+        carrying an idempotency key.
+        :returns Optional[float]: Seconds to wait before the next attempt, or `None` if the
+        error must be raised.
+        """
+        if not isinstance(error, self.retry_on):
+            return None
+
+        if isinstance(error, RateLimitExceededError):
+            return max(0.0, error.retry_after or 0.0)
+
+        if http_method == HTTPVerbs.POST.value and not (self.retry_non_idempotent or idempotent):
+            return None
+        return self.backoff(attempt)
+
+    def start_deadline(self) -> Optional[float]:
+        """The `time.monotonic()` instant by which a request must be done, if bounded."""
+        return None if self.deadline is None else time.monotonic() + self.deadline
+
+    def within_deadline(self, deadline: Optional[float], delay: float) -> bool:
+        """Whether waiting `delay` seconds still leaves time for another attempt."""
+        return deadline is None or time.monotonic() + delay < deadline
+
+    def attempt_timeout(self, deadline: Optional[float], delay: float, timeout: float) -> float:
+        """
+        The timeout for the next attempt, the configured per-request timeout shortened to
+        whatever is left of the deadline after waiting `delay` seconds.
+
+        :raises ClientTimeoutError: If the deadline passes before the attempt could start.
+        """
+        if deadline is None:
+            return timeout
+
+        time_left = deadline - time.monotonic() - delay
+        if time_left <= 0:
+            raise ClientTimeoutError(
+                retry_after=self.deadline, error_source=ErrorSource.SHIPENGINE.value
+            )
+        return min(timeout, time_left)
+
+    def to_dict(self):
+        return (lambda o: o.__dict__)(self)
@@ -1,20 +1,72 @@
 """The entrypoint to the ShipEngine API SDK."""
 
-from typing import Any, Dict, List, Union
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Union,
+)
 
-from shipengine.enums import Endpoints
+from shipengine.enums import Endpoints, ErrorSource, RateShoppingStrategy
 
+from .base import BaseShipEngine
+from .batches import (
+    BATCH_CHUNK_SIZE,
+    BATCH_MAX_POLL_INTERVAL,
+    BATCH_POLL_INTERVAL,
+    BatchPolling,
+    batch_finished,
+    chunked,
+)
+from .bulk import (
+    BulkLabelResult,
+    BulkPurchase,
+    LabelRequest,
+    bulk_concurrency,
+    label_request,
+)
+from .cache import address_fingerprint
+from .carriers import CarrierCatalog
+from .errors import InvalidFieldValueError
 from .http_client import ShipEngineClient
+from .http_client.single_flight import SingleFlight
+from .idempotency import purchase_key
+from .pagination import first_page_endpoint, iter_pages
+from .rate_shopping import (
+    RateShoppingResult,
+    collect_outcomes,
+    rate_shopping_strategy,
+    split_by_carrier,
+)
 from .shipengine_config import ShipEngineConfig
 
 
-class ShipEngine:
-    config: ShipEngineConfig
-    """
-    Global configuration for the ShipEngine API client, such as timeouts,
-    retries, page size, etc. This configuration applies to all method calls,
-    unless specifically overridden when calling a method.
-    """
+class ShipEngine(BaseShipEngine):
+    _NON_API_METHODS = frozenset(
+        (
+            "close",
+            "create_labels_bulk",
+            "download_batch_labels",
+            "iter_batch_errors",
+            "iter_batch_labels",
+            "iter_labels",
+            "iter_shipments",
+            "map",
+            "shop_rates",
+            "submit",
+        )
+    )
 
     def __init__(self, config: Union[str, Dict[str, Any], ShipEngineConfig]) -> None:
         """
@@ -23,15 +75,214 @@ class ShipEngine:
         The `api_key` you pass in can be either a ShipEngine sandbox
         or production API Key. (sandbox keys start with "TEST_")
         """
+        super().__init__(config)
         self.client = ShipEngineClient()
+        self._purchases = SingleFlight()
+        self._carrier_catalog_lock = threading.Lock()
+        self._executors: Dict[str, ThreadPoolExecutor] = dict()
+        self._executor_lock = threading.Lock()
+        self._executor_pid: int = os.getpid()
+
+    def __enter__(self) -> "ShipEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the HTTP sessions and address caches, release their connections, stop workers."""
+        self._check_pid()
+        with self._executor_lock:
+            executors, self._executors = self._executors, dict()
+        for executor in executors.values():
+            executor.shutdown(wait=True)
+        self._close_address_caches()
+        self.client.close()
+
+    def submit(self, method_name: str, *args, **kwargs) -> Future:
+        """
+        Run a ShipEngine method on the internal worker pool, which is bounded by
+        `config.max_concurrency` threads, and return a `concurrent.futures.Future` for its result.
+
+        >>> future = shipengine.submit("track_package_by_label_id", "se-1234")
+        >>> tracking = future.result()
+
+        :param str method_name: The name of the ShipEngine method to run,
+        e.g. `track_package_by_carrier_code_and_tracking_number`.
+        :returns Future: A future that resolves to the method's return value, or raises its error.
+        """
+        method = self._resolve_method(method_name=method_name)
+        return self._get_executor().submit(method, *args, **kwargs)
+
+    def map(
+        self, method_name: str, *iterables: Iterable, return_exceptions: bool = False, **kwargs
+    ) -> Iterator[Any]:
+        """
+        Run a ShipEngine method once per set of arguments on the internal worker pool and yield
+        the results in input order, like `concurrent.futures.Executor.map()`. Inputs are consumed
+        lazily and only `2 * config.max_concurrency` calls are in flight at once, so very large
+        inputs do not queue up in memory.
+
+        >>> results = shipengine.map(
+        ...     "track_package_by_carrier_code_and_tracking_number", carrier_codes, tracking_numbers
+        ... )
+
+        :param str method_name: The name of the ShipEngine method to run.
+        :param Iterable iterables: One iterable per positional argument of the method.
+        :param bool return_exceptions: Yield the errors raised by failed calls instead of
+        raising the first one and abandoning the rest.
+        :returns Iterator[Any]: The method's results, in the order of the inputs.
+        """
+        # Resolved before the generator starts, so an unknown method raises here like `submit()`.
+        method = self._resolve_method(method_name=method_name)
+        executor = self._get_executor()
+        window_size = 2 * self.config.max_concurrency
+
+        def result(future: Future) -> Any:
+            if return_exceptions and future.exception() is not None:
+                return future.exception()
+            return future.result()
+
+        def results() -> Iterator[Any]:
+            window: Deque[Future] = deque()
+            try:
+                for args in zip(*iterables):
+                    window.append(executor.submit(method, *args, **kwargs))
+                    if len(window) >= window_size:
+                        yield result(window.popleft())
+                while window:
+                    yield result(window.popleft())
+            finally:
+                for future in window:
+                    future.cancel()
+
+        return results()
 
-        if type(config) is str:
-            self.config = ShipEngineConfig({"api_key": config})
-        elif type(config) is dict:
-            self.config = ShipEngineConfig(config)
+    def _get_executor(self, name: str = "shipengine") -> ThreadPoolExecutor:
+        """
+        The worker pool called `name`, of `config.max_concurrency` threads, created on first
+        use. Work is split between pools so that one kind cannot queue behind another, e.g.
+        the carriers of `shop_rates()` behind calls passed to `submit()`.
+        """
+        self._check_pid()
+        with self._executor_lock:
+            executor = self._executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=self.config.max_concurrency, thread_name_prefix=name
+                )
+                self._executors[name] = executor
+            return executor
+
+    def _check_pid(self) -> None:
+        """Drop the worker pools inherited across a `fork()`, none of their threads run here."""
+        pid = os.getpid()
+        if pid != self._executor_pid:
+            # As in `SessionManager`, the inherited lock may have been held by another parent
+            # thread at fork time, so it is replaced rather than taken.
+            self._executor_lock = threading.Lock()
+            self._executors = dict()
+            self._executor_pid = pid
+
+    def _resolve_method(self, method_name: str) -> Callable[..., Any]:
+        if method_name.startswith("_") or method_name in self._NON_API_METHODS:
+            method = None
+        else:
+            method = getattr(self, method_name, None)
+
+        if not callable(method):
+            raise InvalidFieldValueError(
+                field_name="method_name",
+                reason="Must be the name of a ShipEngine API method.",
+                field_value=method_name,
+                error_source=ErrorSource.SHIPENGINE.value,
+            )
+        return method
+
+    def _cached_rates(
+        self, endpoint: str, params: Dict[str, Any], config: ShipEngineConfig
+    ) -> Dict[str, Any]:
+        key = self._rate_cache_key(endpoint, params, config)
+        rates = self._rates_from_cache(key)
+        if rates is None:
+            rates = self._cache_rates(
+                key, self.client.post(endpoint=endpoint, params=params, config=config), config
+            )
+        return rates
+
+    def _cached_address_validation(
+        self, addresses: List[Dict[str, Any]], config: ShipEngineConfig
+    ) -> List[Dict[str, Any]]:
+        cache = self._address_cache(config=config)
+        keys = [address_fingerprint(address) for address in addresses]
+        results = cache.get_many(keys)
+        misses = self._address_misses(keys, addresses, results)
+        if misses:
+            validated = self.client.post(
+                endpoint=Endpoints.ADDRESSES_VALIDATE.value,
+                params=list(misses.values()),
+                config=config,
+            )
+            fetched = dict(zip(misses, validated))
+            cache.set_many(fetched)
+            results.update(fetched)
+        return [results[key] for key in keys]
+
+    def _purchase_label(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        config: ShipEngineConfig,
+        idempotency_key: Optional[str],
+    ) -> Dict[str, Any]:
+        idempotency_key, idempotent = purchase_key(idempotency_key)
+        return self._buy_label(endpoint, params, config, idempotency_key, idempotent)
+
+    def _buy_label(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        config: ShipEngineConfig,
+        idempotency_key: str,
+        idempotent: bool,
+    ) -> Dict[str, Any]:
+        if not idempotent:
+            return self._post_label(endpoint, params, config, idempotency_key, idempotent)
+        # Concurrent purchases under the same key share one POST, the later callers receive
+        # a copy of its label instead of all missing the ledger and buying one each.
+        return self._purchases.do(
+            idempotency_key,
+            lambda: self._post_label(endpoint, params, config, idempotency_key, idempotent),
+        )
+
+    def _post_label(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        config: ShipEngineConfig,
+        idempotency_key: str,
+        idempotent: bool,
+    ) -> Dict[str, Any]:
+        label = self.idempotency_ledger.get(idempotency_key) if idempotent else None
+        if label is not None:
+            return label
+
+        label = self.client.post(
+            endpoint=endpoint,
+            params=params,
+            config=config,
+            idempotency_key=idempotency_key,
+            idempotent=idempotent,
+        )
+        self.idempotency_ledger.record(idempotency_key, label)
+        return label
 
     def create_label_from_rate_id(
-        self, rate_id: str, params: Dict[str, Any], config: Union[str, Dict[str, Any]] = None
+        self,
+        rate_id: str,
+        params: Dict[str, Any],
+        config: Union[str, Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         When retrieving rates for shipments using the /rates endpoint, the returned information
@@ -44,14 +295,26 @@ class ShipEngine:
         display and level of verification.
         :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
         to set new values for properties of the global ShipEngineConfig object.
+        :param str idempotency_key: Identifies this logical purchase, one is generated if
+        omitted. Retries reuse it, and calling again with a key that already bought a label
+        returns that label from the idempotency ledger instead of buying another one. Without
+        it, a 5xx or a connection failure is not retried unless `retry_non_idempotent` is set.
         :returns Dict[str, Any]: A label that corresponds the to shipment details for the
         rate_id provided.
         """
         config = self.config.merge(new_config=config)
-        return self.client.post(endpoint=f"v1/labels/rates/{rate_id}", params=params, config=config)
+        return self._purchase_label(
+            endpoint=f"v1/labels/rates/{rate_id}",
+            params=params,
+            config=config,
+            idempotency_key=idempotency_key,
+        )
 
     def create_label_from_shipment(
-        self, shipment: Dict[str, Any], config: Union[str, Dict[str, Any]] = None
+        self,
+        shipment: Dict[str, Any],
+        config: Union[str, Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Purchase and print a shipping label for a given shipment.
@@ -60,10 +323,76 @@ class ShipEngine:
         :param Dict[str, Any] shipment: A dictionary of shipment details for the label creation.
         :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
         to set new values for properties of the global ShipEngineConfig object.
+        :param str idempotency_key: Identifies this logical purchase, one is generated if
+        omitted. Retries reuse it, and calling again with a key that already bought a label
+        returns that label from the idempotency ledger instead of buying another one. Without
+        it, a 5xx or a connection failure is not retried unless `retry_non_idempotent` is set.
         :returns Dict[str, Any]: A label that corresponds the to shipment details provided.
         """
         config = self.config.merge(new_config=config)
-        return self.client.post(endpoint="v1/labels", params=shipment, config=config)
+        return self._purchase_label(
+            endpoint="v1/labels", params=shipment, config=config, idempotency_key=idempotency_key
+        )
+
+    def create_labels_bulk(
+        self,
+        requests: Iterable[LabelRequest],
+        concurrency: Optional[int] = None,
+        config: Union[str, Dict[str, Any]] = None,
+    ) -> Iterator[BulkLabelResult]:
+        """
+        Buy many labels concurrently, yielding a `BulkLabelResult` for each input as soon as
+        its purchase completes, so results arrive out of order and carry the input's `index`.
+        A failed purchase, or a malformed input, yields a result holding its error and the batch
+        goes on.
+        Inputs are consumed lazily and at most `concurrency` purchases are in flight.
+
+        >>> for result in shipengine.create_labels_bulk(shipments, concurrency=16):
+        ...     print(result.index, result.label if result.ok else result.error)
+
+        :param Iterable[LabelRequest] requests: Each input is a `rate_id`, a dictionary with a
+        `rate_id` and the label params of `create_label_from_rate_id`, or the shipment details
+        of `create_label_from_shipment`. A dictionary may hold the `idempotency_key` of its
+        purchase, which is then retried after a 5xx or a lost connection; without one a key is
+        generated and the purchase is not retried, as for a single label.
+        :param int concurrency: The number of purchases in flight, `config.max_concurrency` by
+        default.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :returns Iterator[BulkLabelResult]: One result per input, in completion order.
+        """
+        config = self.config.merge(new_config=config)
+        concurrency = bulk_concurrency(concurrency, default=config.max_concurrency)
+        return self._create_labels_bulk(requests=requests, concurrency=concurrency, config=config)
+
+    def _create_labels_bulk(
+        self, requests: Iterable[LabelRequest], concurrency: int, config: ShipEngineConfig
+    ) -> Iterator[BulkLabelResult]:
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="shipengine-bulk")
+        in_flight: Set[Future] = set()
+        try:
+            for index, request in enumerate(requests):
+                in_flight.add(executor.submit(self._bulk_label, index, request, config))
+                if len(in_flight) >= concurrency:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    yield from sorted((f.result() for f in done), key=lambda r: r.index)
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                yield from sorted((f.result() for f in done), key=lambda r: r.index)
+        finally:
+            # Purchases already sent are let finish so their labels reach the idempotency ledger.
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _bulk_label(
+        self, index: int, request: LabelRequest, config: ShipEngineConfig
+    ) -> BulkLabelResult:
+        with BulkPurchase(index, request) as purchase:
+            endpoint, params, idempotency_key = label_request(request)
+            purchase.idempotency_key, idempotent = purchase_key(idempotency_key)
+            purchase.bought(
+                self._buy_label(endpoint, params, config, purchase.idempotency_key, idempotent)
+            )
+        return purchase.result
 
     def get_rate_estimate(
         self, params: Dict[str, Any], config: Union[str, Dict[str, Any]] = None
@@ -81,7 +410,7 @@ class ShipEngine:
         :returns list[Dict[str, Any]]: A list of rate estimates from the specified carriers.
         """
         config = self.config.merge(new_config=config)
-        return self.client.post(
+        return self._cached_rates(
             endpoint=Endpoints.GET_RATE_ESTIMATE.value, params=params, config=config
         )
 
@@ -98,10 +427,58 @@ class ShipEngine:
         :returns Dict[str, Any]: A label that corresponds the to shipment details provided.
         """
         config = self.config.merge(new_config=config)
-        return self.client.post(
+        return self._cached_rates(
             endpoint=Endpoints.GET_RATE_FROM_SHIPMENT.value, params=shipment, config=config
         )
 
+    def shop_rates(
+        self,
+        shipment: Dict[str, Any],
+        carrier_ids: Optional[Iterable[str]] = None,
+        strategy: Union[str, RateShoppingStrategy] = RateShoppingStrategy.CHEAPEST.value,
+        carrier_timeout: Optional[float] = None,
+        max_delivery_days: Optional[int] = None,
+        config: Union[str, Dict[str, Any]] = None,
+    ) -> RateShoppingResult:
+        """
+        Shop rates across carriers: one `get_rates_from_shipment` request per carrier is sent at
+        once, each on a thread of its own, so a slow carrier cannot hold up the others, nor can
+        work queued with `submit()` or `map()`, and the rates collected are ranked by `strategy`.
+
+        >>> result = shipengine.shop_rates(shipment, ["se-656171", "se-656172"], "fastest", 2)
+        >>> result.best["rate_id"]
+
+        :param Dict[str, Any] shipment: The shipment details and rate options, as accepted by
+        `get_rates_from_shipment`.
+        :param Iterable[str] carrier_ids: The carriers to shop, by default the `carrier_ids` of
+        the shipment's rate options.
+        :param strategy: `cheapest`, `fastest` or `best_value`, see `RateShoppingResult`.
+        :param float carrier_timeout: Seconds to wait for the carriers, those that have not
+        answered by then are dropped and listed in `RateShoppingResult.timed_out`.
+        :param int max_delivery_days: The delivery days constraint of the `best_value` strategy.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :returns RateShoppingResult: The ranked rates, and the carriers that failed or timed out.
+        """
+        strategy = rate_shopping_strategy(strategy, max_delivery_days=max_delivery_days)
+        config = self._shopping_config(self.config.merge(new_config=config), carrier_timeout)
+
+        # The carriers have a pool of their own, bounded like the one of `submit()`. Those
+        # dropped by `carrier_timeout` finish in it on their own, within `timeout`.
+        executor = self._get_executor("shipengine-rates")
+        futures = {
+            carrier_id: executor.submit(
+                self._cached_rates, Endpoints.GET_RATE_FROM_SHIPMENT.value, params, config
+            )
+            for carrier_id, params in split_by_carrier(shipment, carrier_ids).items()
+        }
+        done, _ = wait(futures.values(), timeout=carrier_timeout)
+        return RateShoppingResult(
+            *collect_outcomes(futures, done),
+            strategy=strategy,
+            max_delivery_days=max_delivery_days,
+        )
+
     def list_carriers(self, config: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Fetch the carrier accounts connected to your ShipEngine Account.
@@ -113,6 +490,32 @@ class ShipEngine:
         config = self.config.merge(new_config=config)
         return self.client.get(endpoint=Endpoints.LIST_CARRIERS.value, config=config)
 
+    def get_carrier_catalog(
+        self, refresh: bool = False, config: Dict[str, Any] = None
+    ) -> CarrierCatalog:
+        """
+        Return an indexed catalog of the carrier accounts connected to your ShipEngine Account,
+        with constant time lookups of carriers, services and package types. The catalog is
+        cached per API key for `config.carrier_catalog_ttl` seconds, so repeated lookups do not
+        call `v1/carriers` again.
+
+        :param bool refresh: Fetch a new catalog even if the cached one has not expired.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :returns CarrierCatalog: The carrier accounts associated with a given ShipEngine Account.
+        """
+        config = self.config.merge(new_config=config)
+        catalog = self._cached_catalog(config.api_key, refresh=refresh)
+        if catalog is not None:
+            return catalog
+
+        with self._carrier_catalog_lock:
+            catalog = self._cached_catalog(config.api_key, refresh=refresh)
+            if catalog is None:
+                response = self.client.get(endpoint=Endpoints.LIST_CARRIERS.value, config=config)
+                catalog = self._cache_catalog(response, config)
+            return catalog
+
     def track_package_by_label_id(
         self, label_id: str, config: Dict[str, Any] = None
     ) -> Dict[str, Any]:
@@ -164,9 +567,11 @@ class ShipEngine:
         and normalized address.
         """
         config = self.config.merge(new_config=config)
-        return self.client.post(
-            endpoint=Endpoints.ADDRESSES_VALIDATE.value, params=address, config=config
-        )
+        if config.address_cache_path is None:
+            return self.client.post(
+                endpoint=Endpoints.ADDRESSES_VALIDATE.value, params=address, config=config
+            )
+        return self._cached_address_validation(addresses=address, config=config)
 
     def void_label_by_label_id(
         self, label_id: str, config: Union[str, Dict[str, Any]]
@@ -198,3 +603,235 @@ class ShipEngine:
         return self.client.get(
             endpoint=f"v1/labels?tracking_number={tracking_number}", config=config
         )
+
+    def iter_labels(
+        self, config: Union[str, Dict[str, Any]] = None, **params: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over every label of the account, one page of `config.page_size` labels
+        at a time. The next page is fetched in the background while the current one is being
+        consumed. See: https://shipengine.github.io/shipengine-openapi/#operation/list_labels
+
+        >>> for label in shipengine.iter_labels(label_status="completed"):
+        ...     reconcile(label)
+
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :param params: Query parameters filtering the labels, e.g. `carrier_id`,
+        `created_at_start` or `sort_by`.
+        :returns Iterator[Dict[str, Any]]: The labels, in the order ShipEngine API returns them.
+        """
+        return self._iter_resource(Endpoints.LIST_LABELS.value, "labels", config, params)
+
+    def iter_shipments(
+        self, config: Union[str, Dict[str, Any]] = None, **params: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over every shipment of the account, one page of `config.page_size`
+        shipments at a time, prefetching the next page in the background.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/list_shipments
+
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :param params: Query parameters filtering the shipments, e.g. `shipment_status`.
+        :returns Iterator[Dict[str, Any]]: The shipments, in the order ShipEngine API returns them.
+        """
+        return self._iter_resource(Endpoints.LIST_SHIPMENTS.value, "shipments", config, params)
+
+    def _iter_resource(
+        self,
+        resource: str,
+        key: str,
+        config: Union[str, Dict[str, Any], None],
+        params: Dict[str, Any],
+        page_size_name: str = "page_size",
+    ) -> Iterator[Dict[str, Any]]:
+        config = self.config.merge(new_config=config)
+        endpoint = first_page_endpoint(
+            resource, page_size=config.page_size, params=params, page_size_name=page_size_name
+        )
+        for page in iter_pages(lambda e: self.client.get(endpoint=e, config=config), endpoint):
+            yield from page.get(key) or list()
+
+    def create_batch(
+        self,
+        shipment_ids: Optional[List[str]] = None,
+        rate_ids: Optional[List[str]] = None,
+        config: Union[str, Dict[str, Any]] = None,
+        **params: Any,
+    ) -> Dict[str, Any]:
+        """
+        Create a batch of shipments or rates to buy labels for in a single server-side job.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/create_batch
+
+        :param List[str] shipment_ids: The shipments to add to the batch.
+        :param List[str] rate_ids: The rates to add to the batch.
+        :param Union[str, Dict[str, Any], ShipEngineConfig] config: Method level configuration
+        to set new values for properties of the global ShipEngineConfig object.
+        :param params: Other batch properties, e.g. `external_batch_id` or `batch_notes`.
+        :returns Dict[str, Any]: The batch created, including its `batch_id`.
+        """
+        config = self.config.merge(new_config=config)
+        params = self._batch_params(shipment_ids, rate_ids, params)
+        return self.client.post(endpoint=Endpoints.BATCHES.value, params=params, config=config)
+
+    def add_to_batch(
+        self,
+        batch_id: str,
+        shipment_ids: Optional[Iterable[str]] = None,
+        rate_ids: Optional[Iterable[str]] = None,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        config: Union[str, Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Add shipments or rates to an open batch, `chunk_size` IDs per request.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/add_to_batch
+        """
+        config = self.config.merge(new_config=config)
+        endpoint = f"{Endpoints.BATCHES.value}/{batch_id}/add"
+        for chunk in chunked(shipment_ids, chunk_size):
+            self.client.post(endpoint=endpoint, params={"shipment_ids": chunk}, config=config)
+        for chunk in chunked(rate_ids, chunk_size):
+            self.client.post(endpoint=endpoint, params={"rate_ids": chunk}, config=config)
+
+    def process_batch(
+        self,
+        batch_id: str,
+        params: Optional[Dict[str, Any]] = None,
+        config: Union[str, Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Start buying the labels of a batch, processing happens asynchronously on ShipEngine's side,
+        follow it with `wait_for_batch()`.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/process_batch
+
+        :param Dict[str, Any] params: The label options, e.g. `label_format`, `label_layout` or
+        `ship_date`.
+        """
+        config = self.config.merge(new_config=config)
+        self.client.post(
+            endpoint=f"{Endpoints.BATCHES.value}/{batch_id}/process/labels",
+            params=params or dict(),
+            config=config,
+        )
+
+    def get_batch(self, batch_id: str, config: Union[str, Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Retrieve a batch, including its `status` and processing counts.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/get_batch_by_id
+        """
+        config = self.config.merge(new_config=config)
+        return self.client.get(endpoint=f"{Endpoints.BATCHES.value}/{batch_id}", config=config)
+
+    def wait_for_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        max_poll_interval: float = BATCH_MAX_POLL_INTERVAL,
+        timeout: Optional[float] = None,
+        config: Union[str, Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Poll a batch until it has finished processing. Polling starts every `poll_interval`
+        seconds and backs off towards `max_poll_interval` while the batch makes no progress.
+
+        :param float timeout: Seconds to wait at most, `None` to wait as long as it takes.
+        :raises ClientTimeoutError: If the batch is still processing after `timeout` seconds.
+        :returns Dict[str, Any]: The finished batch, see `batch_finished()`.
+        """
+        polling = BatchPolling(poll_interval, max_poll_interval, timeout)
+        batch = self.get_batch(batch_id=batch_id, config=config)
+        while not batch_finished(batch):
+            time.sleep(polling.next_wait())
+            previous, batch = batch, self.get_batch(batch_id=batch_id, config=config)
+            polling.checked(batch, previous)
+        return batch
+
+    def run_batch(
+        self,
+        shipment_ids: Optional[Iterable[str]] = None,
+        rate_ids: Optional[Iterable[str]] = None,
+        process_params: Optional[Dict[str, Any]] = None,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        max_poll_interval: float = BATCH_MAX_POLL_INTERVAL,
+        timeout: Optional[float] = None,
+        config: Union[str, Dict[str, Any]] = None,
+        **params: Any,
+    ) -> Dict[str, Any]:
+        """
+        Run the whole batch workflow: create a batch from the first chunk of IDs, add the rest
+        chunk by chunk, process it and wait for it to finish. Stream the results afterwards
+        with `iter_batch_labels()`, `iter_batch_errors()` and `download_batch_labels()`.
+        `poll_interval`, `max_poll_interval` and `timeout` are those of `wait_for_batch()`.
+
+        >>> batch = shipengine.run_batch(
+        ...     shipment_ids, process_params={"label_format": "pdf"}, timeout=900
+        ... )
+        >>> with open("labels.pdf", "wb") as f:
+        ...     f.writelines(shipengine.download_batch_labels(batch))
+
+        :returns Dict[str, Any]: The finished batch.
+        """
+        shipment_chunks, rate_chunks = chunked(shipment_ids, chunk_size), chunked(
+            rate_ids, chunk_size
+        )
+        batch = self.create_batch(
+            shipment_ids=next(shipment_chunks, None),
+            rate_ids=next(rate_chunks, None),
+            config=config,
+            **params,
+        )
+        batch_id = batch["batch_id"]
+        for chunk in shipment_chunks:
+            self.add_to_batch(batch_id, shipment_ids=chunk, chunk_size=chunk_size, config=config)
+        for chunk in rate_chunks:
+            self.add_to_batch(batch_id, rate_ids=chunk, chunk_size=chunk_size, config=config)
+        self.process_batch(batch_id, params=process_params, config=config)
+        return self.wait_for_batch(
+            batch_id,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval,
+            timeout=timeout,
+            config=config,
+        )
+
+    def iter_batch_labels(
+        self, batch_id: str, config: Union[str, Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily iterate over the labels bought by a batch, see `iter_labels()`."""
+        return self._iter_resource(
+            Endpoints.LIST_LABELS.value, "labels", config, {"batch_id": batch_id}
+        )
+
+    def iter_batch_errors(
+        self, batch_id: str, config: Union[str, Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over the errors of a processed batch, one per shipment that failed.
+        See: https://shipengine.github.io/shipengine-openapi/#operation/list_batch_errors
+        """
+        return self._iter_resource(
+            f"{Endpoints.BATCHES.value}/{batch_id}/errors",
+            "errors",
+            config,
+            dict(),
+            page_size_name="pagesize",
+        )
+
+    def download_batch_labels(
+        self,
+        batch: Dict[str, Any],
+        label_format: str = "pdf",
+        config: Union[str, Dict[str, Any]] = None,
+    ) -> Iterator[bytes]:
+        """
+        Stream the combined label file of a finished batch in chunks of bytes, without holding
+        the whole file in memory.
+
+        :param Dict[str, Any] batch: The finished batch, as returned by `wait_for_batch()`.
+        :param str label_format: `pdf`, `png` or `zpl`, the format the batch was processed in.
+        """
+        endpoint = self._batch_download_endpoint(batch, label_format=label_format)
+        config = self.config.merge(new_config=config)
+        return self.client.download(endpoint=endpoint, config=config)
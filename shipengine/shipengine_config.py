@@ -1,10 +1,27 @@
 """The global configuration object for the ShipEngine SDK."""
 
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+from .cache import AddressValidationCache
 from .enums import BaseURL
-from .util import is_api_key_valid, is_retries_valid, is_timeout_valid
+from .instrumentation import Instrumentation, resolve_instrumentation
+from .json_codec import JSONCodec, resolve_json_codec
+from .retry_policy import RetryPolicy
+from .util import (
+    is_api_key_valid,
+    is_cache_ttl_valid,
+    is_instrumentation_valid,
+    is_json_codec_valid,
+    is_max_concurrency_valid,
+    is_pool_size_valid,
+    is_rate_limit_valid,
+    is_retries_valid,
+    is_retry_policy_valid,
+    is_timeout_valid,
+    is_tracer_valid,
+    is_transport_valid,
+)
 
 
 class ShipEngineConfig:
@@ -20,6 +37,39 @@ class ShipEngineConfig:
     DEFAULT_TIMEOUT: int = 60
     """Default timeout for the ShipEngineClient in seconds."""
 
+    DEFAULT_POOL_CONNECTIONS: int = 10
+    """Default number of per-host connection pools the ShipEngineClient keeps."""
+
+    DEFAULT_POOL_MAXSIZE: int = 10
+    """Default number of keep-alive connections kept open in each connection pool."""
+
+    DEFAULT_POOL_BLOCK: bool = False
+    """Whether a request should wait for a free connection once a pool is at `pool_maxsize`."""
+
+    DEFAULT_MAX_CONCURRENCY: int = 10
+    """
+    Default number of worker threads used by `ShipEngine.submit()` and `ShipEngine.map()`, and
+    by the separate pool requesting the carriers of `ShipEngine.shop_rates()`.
+    """
+
+    DEFAULT_CARRIER_CATALOG_TTL: float = 300
+    """Default number of seconds a carrier catalog is reused before it is fetched again."""
+
+    DEFAULT_RATE_CACHE_TTL: Optional[float] = None
+    """Default number of seconds rate quotes are cached for, `None` disables the rate cache."""
+
+    DEFAULT_RATE_CACHE_MAX_ENTRIES: int = 1024
+    """Default number of rate quotes cached before the least recently used are evicted."""
+
+    DEFAULT_ADDRESS_CACHE_PATH: Optional[str] = None
+    """Default SQLite file of the address validation cache, `None` disables the cache."""
+
+    DEFAULT_COALESCE_REQUESTS: bool = True
+    """Whether concurrent, identical GET requests share a single in-flight request."""
+
+    DEFAULT_REQUESTS_PER_SECOND: Optional[float] = None
+    """Default client-side request budget per API key, `None` only reacts to 429 responses."""
+
     def __init__(self, config: Dict[str, Any]) -> None:
         """
         This is the configuration object for the ShipEngine object and it"s properties are
@@ -50,6 +100,71 @@ class ShipEngineConfig:
         else:
             self.retries: int = self.DEFAULT_RETRIES
 
+        is_pool_size_valid(config, "pool_connections")
+        self.pool_connections: int = config.get("pool_connections", self.DEFAULT_POOL_CONNECTIONS)
+
+        is_pool_size_valid(config, "pool_maxsize")
+        self.pool_maxsize: int = config.get("pool_maxsize", self.DEFAULT_POOL_MAXSIZE)
+
+        self.pool_block: bool = config.get("pool_block", self.DEFAULT_POOL_BLOCK)
+
+        self.coalesce_requests: bool = config.get(
+            "coalesce_requests", self.DEFAULT_COALESCE_REQUESTS
+        )
+
+        is_max_concurrency_valid(config)
+        self.max_concurrency: int = config.get("max_concurrency", self.DEFAULT_MAX_CONCURRENCY)
+
+        is_rate_limit_valid(config)
+        self.requests_per_second: Optional[float] = config.get(
+            "requests_per_second", self.DEFAULT_REQUESTS_PER_SECOND
+        )
+        self.rate_limit_burst: Optional[int] = config.get("rate_limit_burst")
+
+        is_cache_ttl_valid(config, "carrier_catalog_ttl")
+        self.carrier_catalog_ttl: float = config.get(
+            "carrier_catalog_ttl", self.DEFAULT_CARRIER_CATALOG_TTL
+        )
+
+        is_cache_ttl_valid(config, "rate_cache_ttl")
+        self.rate_cache_ttl: Optional[float] = config.get(
+            "rate_cache_ttl", self.DEFAULT_RATE_CACHE_TTL
+        )
+        self.rate_cache_max_entries: int = config.get(
+            "rate_cache_max_entries", self.DEFAULT_RATE_CACHE_MAX_ENTRIES
+        )
+
+        self.address_cache_path: Optional[str] = config.get(
+            "address_cache_path", self.DEFAULT_ADDRESS_CACHE_PATH
+        )
+        self.address_cache_max_entries: int = config.get(
+            "address_cache_max_entries", AddressValidationCache.DEFAULT_MAX_ENTRIES
+        )
+        is_cache_ttl_valid(config, "address_cache_ttl")
+        self.address_cache_ttl: float = config.get(
+            "address_cache_ttl", AddressValidationCache.DEFAULT_TTL
+        )
+
+        is_json_codec_valid(config)
+        self.json_codec: JSONCodec = resolve_json_codec(config.get("json_codec"))
+
+        is_instrumentation_valid(config)
+        self.instrumentation: Tuple[Instrumentation, ...] = resolve_instrumentation(
+            config.get("instrumentation")
+        )
+
+        is_tracer_valid(config)
+        self.tracer: Optional[Any] = config.get("tracer")
+
+        is_transport_valid(config)
+        self.transport: Optional[Any] = config.get("transport")
+
+        is_retry_policy_valid(config)
+        retry_policy = config.get("retry_policy", dict())
+        self.retry_policy: RetryPolicy = (
+            RetryPolicy(**retry_policy) if type(retry_policy) is dict else retry_policy
+        )
+
     def merge(self, new_config: Optional[Dict[str, Any]] = None):
         """
         The method allows the merging of a method-level configuration
@@ -59,36 +174,8 @@ class ShipEngineConfig:
             return self
         else:
             config = dict()
-
-            (
-                config.update({"api_key": new_config["api_key"]})
-                if "api_key" in new_config
-                else config.update({"api_key": self.api_key})
-            )
-
-            (
-                config.update({"base_uri": new_config["base_uri"]})
-                if "base_uri" in new_config
-                else config.update({"base_uri": self.base_uri})
-            )
-
-            (
-                config.update({"page_size": new_config["page_size"]})
-                if "page_size" in new_config
-                else config.update({"page_size": self.page_size})
-            )
-
-            (
-                config.update({"retries": new_config["retries"]})
-                if "retries" in new_config
-                else config.update({"retries": self.retries})
-            )
-
-            (
-                config.update({"timeout": new_config["timeout"]})
-                if "timeout" in new_config
-                else config.update({"timeout": self.timeout})
-            )
+            for field, value in self.to_dict().items():
+                config[field] = new_config[field] if field in new_config else value
 
             return ShipEngineConfig(config)
 
@@ -96,4 +183,18 @@ class ShipEngineConfig:
         return (lambda o: o.__dict__)(self)
 
     def to_json(self):
-        return json.dumps(self, default=lambda o: o.__dict__, indent=2)
+        return json.dumps(self, default=json_default, indent=2)
+
+
+def json_default(o: Any) -> Any:
+    """
+    Serialize classes, instrumentation hooks, tracers and transports by name, other objects by
+    their attributes.
+    """
+    if isinstance(o, type):
+        return o.__name__
+    if isinstance(o, Instrumentation) or any(
+        hasattr(o, method) for method in ("start_as_current_span", "send", "send_async")
+    ):
+        return type(o).__name__
+    return o.__dict__
@@ -0,0 +1,6 @@
+"""Stand-ins for ShipEngine API, to test and benchmark code using the SDK without the network."""
+
+from . import fixtures
+from .cassette import CassetteMissError, RecordingTransport, ReplayTransport
+from .server import StubServer, latency_distribution
+from .stub_transport import StubResponse, StubTransport
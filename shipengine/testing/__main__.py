@@ -0,0 +1,5 @@
+"""Run the local ShipEngine stand-in server, see `shipengine.testing.server`."""
+
+from .server import main
+
+main()
@@ -0,0 +1,270 @@
+"""Record the SDK's HTTP traffic to a cassette file, and replay it offline."""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import IO, Any, Deque, Dict, List, Optional, Tuple
+
+from requests.structures import CaseInsensitiveDict
+
+from ..enums import ErrorCode, ErrorSource, ErrorType
+from ..errors import ShipEngineError
+from ..http_client.transport import (
+    AiohttpTransport,
+    AsyncTransport,
+    RequestsTransport,
+    Transport,
+    TransportRequest,
+    TransportResponse,
+)
+from ..instrumentation import endpoint_template
+
+UNRECORDED_HEADERS = frozenset(["set-cookie", "date", "content-length", "transfer-encoding"])
+
+
+class CassetteMissError(ShipEngineError):
+    def __init__(self, request: TransportRequest, path: str) -> None:
+        """
+        Raised by `ReplayTransport` for a request the cassette has no response for. It is no
+        `ClientSystemError`, so the retry policy fails the call at once instead of retrying it.
+        """
+        super().__init__(
+            message=f"No response recorded in {path} for {request}",
+            error_source=ErrorSource.SHIPENGINE.value,
+            error_type=ErrorType.SYSTEM.value,
+            error_code=ErrorCode.UNSPECIFIED.value,
+        )
+        self.request = request
+        self.path = path
+
+
+def body_hash(body: Optional[bytes]) -> Optional[str]:
+    """
+    The SHA-256 of a request body, JSON bodies canonicalized first, so that the same request
+    matches its recording whatever the order of its keys.
+    """
+    if not body:
+        return None
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except ValueError:
+        pass
+    return hashlib.sha256(body).hexdigest()
+
+
+def open_cassette(path: str, mode: str) -> IO[str]:
+    """Open a cassette file, gzip compressed when its name ends with `.gz`."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class Interaction:
+    def __init__(
+        self,
+        http_method: str,
+        endpoint: str,
+        body_hash: Optional[str],
+        status_code: int,
+        headers: Dict[str, str],
+        content: bytes,
+        latency: float,
+    ) -> None:
+        """One recorded request and its response, `latency` the seconds the response took."""
+        self.http_method = http_method
+        self.endpoint = endpoint
+        self.body_hash = body_hash
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.latency = latency
+
+    @classmethod
+    def record(
+        cls, request: TransportRequest, response: TransportResponse, latency: float
+    ) -> "Interaction":
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in UNRECORDED_HEADERS
+        }
+        return cls(
+            http_method=request.http_method,
+            endpoint=request.endpoint,
+            body_hash=body_hash(request.body),
+            status_code=response.status_code,
+            headers=headers,
+            content=response.content,
+            latency=latency,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "method": self.http_method,
+            "endpoint": self.endpoint,
+            "body_hash": self.body_hash,
+            "status": self.status_code,
+            "headers": self.headers,
+            "latency": round(self.latency, 6),
+        }
+        try:
+            data["body"] = self.content.decode("utf-8")
+        except UnicodeDecodeError:
+            data["body_base64"] = base64.b64encode(self.content).decode("ascii")
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Interaction":
+        if "body_base64" in data:
+            content = base64.b64decode(data["body_base64"])
+        else:
+            content = data.get("body", "").encode("utf-8")
+        return cls(
+            http_method=data["method"],
+            endpoint=data["endpoint"],
+            body_hash=data.get("body_hash"),
+            status_code=data["status"],
+            headers=data.get("headers") or dict(),
+            content=content,
+            latency=data.get("latency", 0.0),
+        )
+
+    def response(self) -> TransportResponse:
+        return TransportResponse(self.status_code, CaseInsensitiveDict(self.headers), self.content)
+
+    def __repr__(self) -> str:
+        return f"Interaction({self.http_method} {self.endpoint}, status={self.status_code})"
+
+
+def load_cassette(path: str) -> List[Interaction]:
+    """The interactions of a cassette, in the order they were recorded."""
+    with open_cassette(path, "r") as f:
+        return [Interaction.from_dict(json.loads(line)) for line in f if line.strip()]
+
+
+class RecordingTransport(Transport, AsyncTransport):
+    def __init__(
+        self,
+        path: str,
+        transport: Optional[Transport] = None,
+        async_transport: Optional[AsyncTransport] = None,
+    ) -> None:
+        """
+        Sends the requests with `transport`, or `async_transport` for `AsyncShipEngine`, and
+        records each request and its response to the cassette at `path`, one JSON line per
+        interaction: the method, the endpoint, the hash of the canonical request body, the
+        response status, headers and body, and its latency. Request headers, and so the API key,
+        are never recorded. Interactions are written as they complete, the cassette is
+        complete once the transport is closed.
+
+        :param Transport transport: Defaults to a `RequestsTransport`, closed with this one.
+        :param AsyncTransport async_transport: Defaults to an `AiohttpTransport`.
+        """
+        self.path = path
+        self._owned: List[Any] = list()
+        if transport is None:
+            transport = RequestsTransport()
+            self._owned.append(transport)
+        if async_transport is None:
+            async_transport = AiohttpTransport()
+            self._owned.append(async_transport)
+        self.transport = transport
+        self.async_transport = async_transport
+        self._file: Optional[IO[str]] = open_cassette(path, "w")
+        self._lock = threading.Lock()
+
+    def send(self, request: TransportRequest) -> TransportResponse:
+        started = time.perf_counter()
+        response = self.transport.send(request)
+        self.record(Interaction.record(request, response, time.perf_counter() - started))
+        return response
+
+    async def send_async(self, request: TransportRequest) -> TransportResponse:
+        started = time.perf_counter()
+        response = await self.async_transport.send_async(request)
+        self.record(Interaction.record(request, response, time.perf_counter() - started))
+        return response
+
+    def record(self, interaction: Interaction) -> None:
+        line = json.dumps(interaction.to_dict(), separators=(",", ":"))
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def close(self) -> None:
+        """Close the cassette, and the sync transport if it was created here."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self.transport in self._owned:
+            self.transport.close()
+
+    async def close_async(self) -> None:
+        self.close()
+        if self.async_transport in self._owned:
+            await self.async_transport.close_async()
+
+
+class ReplayTransport(Transport, AsyncTransport):
+    def __init__(self, path: str, latency_scale: float = 1.0, strict: bool = False) -> None:
+        """
+        Serves the responses recorded in the cassette at `path`, to replay captured traffic
+        offline, deterministically, against new SDK and application builds. A request is
+        matched by its method, endpoint and canonical body, its recorded responses served in
+        order and the last one repeated. Unless `strict`, a request without an exact match is
+        served the responses recorded for its endpoint template, e.g. `v1/labels/{id}/track`,
+        in turn. A request without any match fails with a `CassetteMissError`, never retried.
+
+        :param float latency_scale: Multiplies the recorded latencies, 0 replays as fast as
+        possible and 0.5 simulates an API twice as fast.
+        """
+        self.path = path
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self.interactions = load_cassette(path)
+        self._exact: Dict[Tuple[str, str, Optional[str]], Deque[Interaction]] = defaultdict(deque)
+        self._templates: Dict[Tuple[str, str], Deque[Interaction]] = defaultdict(deque)
+        for interaction in self.interactions:
+            self._exact[self.exact_key(interaction)].append(interaction)
+            self._templates[self.template_key(interaction)].append(interaction)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def exact_key(interaction: Interaction) -> Tuple[str, str, Optional[str]]:
+        return interaction.http_method, interaction.endpoint, interaction.body_hash
+
+    @staticmethod
+    def template_key(interaction: Interaction) -> Tuple[str, str]:
+        return interaction.http_method, endpoint_template(interaction.endpoint)
+
+    def match(self, request: TransportRequest) -> Interaction:
+        """The recorded interaction answering `request`."""
+        wanted = Interaction(
+            request.http_method, request.endpoint, body_hash(request.body), 0, dict(), b"", 0.0
+        )
+        with self._lock:
+            recorded = self._exact.get(self.exact_key(wanted))
+            if not recorded and not self.strict:
+                recorded = self._templates.get(self.template_key(wanted))
+            if not recorded:
+                raise CassetteMissError(request, self.path)
+            return recorded.popleft() if len(recorded) > 1 else recorded[0]
+
+    def send(self, request: TransportRequest) -> TransportResponse:
+        interaction = self.match(request)
+        if self.latency_scale > 0:
+            time.sleep(interaction.latency * self.latency_scale)
+        return interaction.response()
+
+    async def send_async(self, request: TransportRequest) -> TransportResponse:
+        interaction = self.match(request)
+        if self.latency_scale > 0:
+            await asyncio.sleep(interaction.latency * self.latency_scale)
+        return interaction.response()
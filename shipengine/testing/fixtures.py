@@ -0,0 +1,472 @@
+"""
+Realistic ShipEngine API responses, generated from the request, to stand in for the API in tests,
+benchmarks and load tests. Each responder takes the endpoint and the decoded request body and
+returns the decoded response body.
+"""
+
+import hashlib
+import itertools
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..enums import ErrorCode, ErrorType
+
+Responder = Callable[[str, Any], Any]
+
+CARRIERS: List[Dict[str, Any]] = [
+    {
+        "carrier_id": "se-656171",
+        "carrier_code": "stamps_com",
+        "friendly_name": "Stamps.com",
+        "services": [
+            ("usps_first_class_mail", "USPS First Class Mail", 4.13, 5),
+            ("usps_priority_mail", "USPS Priority Mail", 9.37, 3),
+            ("usps_priority_mail_express", "USPS Priority Mail Express", 32.86, 1),
+        ],
+    },
+    {
+        "carrier_id": "se-656172",
+        "carrier_code": "ups",
+        "friendly_name": "UPS",
+        "services": [
+            ("ups_ground", "UPS® Ground", 11.25, 4),
+            ("ups_2nd_day_air", "UPS 2nd Day Air®", 24.81, 2),
+            ("ups_next_day_air", "UPS Next Day Air®", 51.76, 1),
+        ],
+    },
+    {
+        "carrier_id": "se-656173",
+        "carrier_code": "fedex",
+        "friendly_name": "FedEx",
+        "services": [
+            ("fedex_ground", "FedEx Ground®", 10.97, 4),
+            ("fedex_2day", "FedEx 2Day®", 23.45, 2),
+            ("fedex_standard_overnight", "FedEx Standard Overnight®", 48.12, 1),
+        ],
+    },
+]
+"""The carrier accounts of the stand-in account, with their services: code, name, cost, days."""
+
+_ids = itertools.count(10000000)
+
+
+def new_id() -> str:
+    """A fresh ShipEngine-style resource ID."""
+    return f"se-{next(_ids)}"
+
+
+def request_id() -> str:
+    return str(uuid.uuid4())
+
+
+def path_id(endpoint: str, position: int = 2) -> str:
+    """The ID at `position` in the path of `endpoint`, e.g. the label ID of a track endpoint."""
+    segments = endpoint.split("?")[0].strip("/").split("/")
+    return segments[position] if len(segments) > position else ""
+
+
+def query_param(endpoint: str, name: str, default: str = "") -> str:
+    return (parse_qs(urlsplit(endpoint).query).get(name) or [default])[0]
+
+
+def now(days: int = 0) -> str:
+    moment = datetime.now(timezone.utc) + timedelta(days=days)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def money(amount: float) -> Dict[str, Any]:
+    return {"currency": "usd", "amount": round(amount, 2)}
+
+
+def tracking_number(seed: str) -> str:
+    """A stable, carrier-looking tracking number derived from `seed`."""
+    return "9400" + str(int(hashlib.sha1(seed.encode("utf-8")).hexdigest(), 16))[:18]
+
+
+def carrier(carrier_id: str) -> Dict[str, Any]:
+    for account in CARRIERS:
+        if account["carrier_id"] == carrier_id:
+            return account
+    return CARRIERS[0]
+
+
+def error_body(
+    message: str,
+    error_type: str = ErrorType.SYSTEM.value,
+    error_code: str = ErrorCode.UNSPECIFIED.value,
+) -> Dict[str, Any]:
+    """The body ShipEngine API answers a failed request with."""
+    return {
+        "request_id": request_id(),
+        "errors": [
+            {
+                "error_source": "shipengine",
+                "error_type": error_type,
+                "error_code": error_code,
+                "message": message,
+            }
+        ],
+    }
+
+
+def rate_limited_body() -> Dict[str, Any]:
+    return error_body(
+        "You have exceeded the rate limit.",
+        error_type=ErrorType.SYSTEM.value,
+        error_code=ErrorCode.RATE_LIMIT_EXCEEDED.value,
+    )
+
+
+def not_found_body(endpoint: str) -> Dict[str, Any]:
+    return error_body(
+        f"The resource at {endpoint} was not found.",
+        error_type=ErrorType.VALIDATION.value,
+        error_code=ErrorCode.NOT_FOUND.value,
+    )
+
+
+def list_carriers(endpoint: str, body: Any) -> Dict[str, Any]:
+    return {
+        "carriers": [
+            {
+                "carrier_id": account["carrier_id"],
+                "carrier_code": account["carrier_code"],
+                "account_number": f"test_account_{account['carrier_id'][3:]}",
+                "requires_funded_amount": account["carrier_code"] == "stamps_com",
+                "balance": 8640.8 if account["carrier_code"] == "stamps_com" else 0.0,
+                "nickname": f"ShipEngine Account - {account['friendly_name']}",
+                "friendly_name": account["friendly_name"],
+                "primary": True,
+                "has_multi_package_supporting_services": account["carrier_code"] != "stamps_com",
+                "supports_label_messages": True,
+                "services": [
+                    {
+                        "carrier_id": account["carrier_id"],
+                        "carrier_code": account["carrier_code"],
+                        "service_code": code,
+                        "name": name,
+                        "domestic": True,
+                        "international": False,
+                        "is_multi_package_supported": False,
+                    }
+                    for code, name, _, _ in account["services"]
+                ],
+                "packages": [{"package_id": None, "package_code": "package", "name": "Package"}],
+                "options": [],
+            }
+            for account in CARRIERS
+        ],
+        "request_id": request_id(),
+        "errors": [],
+    }
+
+
+def rate(account: Dict[str, Any], service: Tuple, rate_type: str) -> Dict[str, Any]:
+    code, name, cost, days = service
+    return {
+        "rate_id": new_id() if rate_type == "shipment" else None,
+        "rate_type": rate_type,
+        "carrier_id": account["carrier_id"],
+        "shipping_amount": money(cost),
+        "insurance_amount": money(0),
+        "confirmation_amount": money(0),
+        "other_amount": money(0),
+        "zone": 5,
+        "package_type": "package",
+        "delivery_days": days,
+        "guaranteed_service": False,
+        "estimated_delivery_date": now(days),
+        "carrier_delivery_days": str(days),
+        "ship_date": now(),
+        "negotiated_rate": False,
+        "service_type": name,
+        "service_code": code,
+        "trackable": True,
+        "carrier_code": account["carrier_code"],
+        "carrier_nickname": f"ShipEngine Account - {account['friendly_name']}",
+        "carrier_friendly_name": account["friendly_name"],
+        "validation_status": "valid",
+        "warning_messages": [],
+        "error_messages": [],
+    }
+
+
+def requested_carriers(options: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    carrier_ids = (options or dict()).get("carrier_ids") or [CARRIERS[0]["carrier_id"]]
+    return [carrier(carrier_id) for carrier_id in carrier_ids]
+
+
+def get_rates_from_shipment(endpoint: str, body: Any) -> Dict[str, Any]:
+    shipment = dict((body or dict()).get("shipment") or dict())
+    shipment_id = shipment.get("shipment_id") or new_id()
+    accounts = requested_carriers((body or dict()).get("rate_options"))
+    return dict(
+        shipment,
+        shipment_id=shipment_id,
+        carrier_id=accounts[0]["carrier_id"],
+        created_at=now(),
+        shipment_status="pending",
+        rate_response={
+            "rates": [
+                rate(account, service, "shipment")
+                for account in accounts
+                for service in account["services"]
+            ],
+            "invalid_rates": [],
+            "rate_request_id": new_id(),
+            "shipment_id": shipment_id,
+            "created_at": now(),
+            "status": "completed",
+            "errors": [],
+        },
+    )
+
+
+def get_rate_estimate(endpoint: str, body: Any) -> List[Dict[str, Any]]:
+    accounts = [carrier(carrier_id) for carrier_id in (body or dict()).get("carrier_ids") or []]
+    return [
+        rate(account, service, "check")
+        for account in accounts or CARRIERS[:1]
+        for service in account["services"]
+    ]
+
+
+def label(shipment: Dict[str, Any], carrier_id: str, service_code: str) -> Dict[str, Any]:
+    label_id = new_id()
+    account = carrier(carrier_id)
+    service = next((s for s in account["services"] if s[0] == service_code), account["services"][1])
+    download = f"https://api.shipengine.com/v1/downloads/10/{label_id}/label-{label_id[3:]}"
+    return {
+        "label_id": label_id,
+        "status": "completed",
+        "shipment_id": shipment.get("shipment_id") or new_id(),
+        "ship_date": now(),
+        "created_at": now(),
+        "shipment_cost": money(service[2]),
+        "insurance_cost": money(0),
+        "tracking_number": tracking_number(label_id),
+        "is_return_label": False,
+        "rma_number": None,
+        "is_international": False,
+        "batch_id": "",
+        "carrier_id": account["carrier_id"],
+        "service_code": service[0],
+        "package_code": "package",
+        "voided": False,
+        "voided_at": None,
+        "label_format": "pdf",
+        "display_scheme": "label",
+        "label_layout": "4x6",
+        "trackable": True,
+        "label_image_id": None,
+        "carrier_code": account["carrier_code"],
+        "tracking_status": "in_transit",
+        "label_download": {
+            "pdf": f"{download}.pdf",
+            "png": f"{download}.png",
+            "zpl": f"{download}.zpl",
+            "href": f"{download}.pdf",
+        },
+        "form_download": None,
+        "insurance_claim": None,
+        "packages": [
+            {
+                "package_code": "package",
+                "weight": (shipment.get("packages") or [{}])[0].get("weight")
+                or {"value": 1.0, "unit": "ounce"},
+                "tracking_number": tracking_number(label_id),
+            }
+        ],
+    }
+
+
+def create_label_from_shipment(endpoint: str, body: Any) -> Dict[str, Any]:
+    shipment = (body or dict()).get("shipment") or dict()
+    return label(
+        shipment,
+        carrier_id=shipment.get("carrier_id") or CARRIERS[0]["carrier_id"],
+        service_code=shipment.get("service_code") or "",
+    )
+
+
+def create_label_from_rate_id(endpoint: str, body: Any) -> Dict[str, Any]:
+    return label(dict(), carrier_id=CARRIERS[0]["carrier_id"], service_code="")
+
+
+def tracking(number: str, carrier_code: str) -> Dict[str, Any]:
+    return {
+        "tracking_number": number,
+        "carrier_code": carrier_code,
+        "status_code": "IT",
+        "status_description": "In Transit",
+        "carrier_status_code": "IT",
+        "carrier_status_description": "Arrived at USPS Regional Facility",
+        "ship_date": now(-2),
+        "estimated_delivery_date": now(1),
+        "actual_delivery_date": None,
+        "exception_description": None,
+        "events": [
+            {
+                "occurred_at": now(-1),
+                "carrier_occurred_at": now(-1),
+                "description": "Arrived at USPS Regional Facility",
+                "city_locality": "AUSTIN",
+                "state_province": "TX",
+                "postal_code": "78701",
+                "country_code": "US",
+                "company_name": "",
+                "signer": "",
+                "event_code": "U1",
+                "status_code": "IT",
+                "carrier_status_code": "10",
+            },
+            {
+                "occurred_at": now(-2),
+                "carrier_occurred_at": now(-2),
+                "description": "Shipment information sent to USPS",
+                "city_locality": "",
+                "state_province": "",
+                "postal_code": "",
+                "country_code": "",
+                "company_name": "",
+                "signer": "",
+                "event_code": "GX",
+                "status_code": "AC",
+                "carrier_status_code": "GX",
+            },
+        ],
+    }
+
+
+def track_package_by_carrier_code_and_tracking_number(endpoint: str, body: Any) -> Dict[str, Any]:
+    return tracking(
+        query_param(endpoint, "tracking_number", "9400111899560204358371"),
+        query_param(endpoint, "carrier_code", "stamps_com"),
+    )
+
+
+def track_package_by_label_id(endpoint: str, body: Any) -> Dict[str, Any]:
+    return tracking(tracking_number(path_id(endpoint)), "stamps_com")
+
+
+def validate_addresses(endpoint: str, body: Any) -> List[Dict[str, Any]]:
+    return [
+        {
+            "status": "verified",
+            "original_address": address,
+            "matched_address": {
+                name: value.upper() if isinstance(value, str) else value
+                for name, value in address.items()
+            },
+            "messages": [],
+        }
+        for address in body or list()
+    ]
+
+
+def void_label_by_label_id(endpoint: str, body: Any) -> Dict[str, Any]:
+    return {
+        "approved": True,
+        "message": "Request for refund submitted.  This label has been voided.",
+    }
+
+
+def page(key: str, endpoint: str) -> Dict[str, Any]:
+    """A single, empty page of the `key` resources listed at `endpoint`."""
+    return {
+        key: [],
+        "total": 0,
+        "page": 1,
+        "pages": 1,
+        "links": {"first": {"href": endpoint}, "last": {"href": endpoint}},
+    }
+
+
+def list_labels(endpoint: str, body: Any) -> Dict[str, Any]:
+    return page("labels", endpoint)
+
+
+def list_shipments(endpoint: str, body: Any) -> Dict[str, Any]:
+    return page("shipments", endpoint)
+
+
+def batch(batch_id: str, status: str, count: int) -> Dict[str, Any]:
+    download = f"https://api.shipengine.com/v1/downloads/1/{batch_id}/batch-{batch_id[3:]}"
+    return {
+        "batch_id": batch_id,
+        "batch_number": batch_id[3:],
+        "external_batch_id": None,
+        "batch_notes": "",
+        "created_at": now(),
+        "processed_at": now() if status == "completed" else None,
+        "errors": 0,
+        "warnings": 0,
+        "completed": count if status == "completed" else 0,
+        "forms": 0,
+        "count": count,
+        "status": status,
+        "batch_shipments_url": {
+            "href": f"https://api.shipengine.com/v1/shipments?batch_id={batch_id}"
+        },
+        "batch_labels_url": {"href": f"https://api.shipengine.com/v1/labels?batch_id={batch_id}"},
+        "batch_errors_url": {"href": f"https://api.shipengine.com/v1/batches/{batch_id}/errors"},
+        "label_download": {
+            "pdf": f"{download}.pdf",
+            "png": f"{download}.png",
+            "zpl": f"{download}.zpl",
+            "href": f"{download}.pdf",
+        },
+        "form_download": None,
+    }
+
+
+def create_batch(endpoint: str, body: Any) -> Dict[str, Any]:
+    body = body or dict()
+    count = len(body.get("shipment_ids") or []) + len(body.get("rate_ids") or [])
+    return batch(new_id(), status="open", count=count)
+
+
+def add_to_batch(endpoint: str, body: Any) -> None:
+    return None
+
+
+def process_batch(endpoint: str, body: Any) -> None:
+    return None
+
+
+def get_batch(endpoint: str, body: Any) -> Dict[str, Any]:
+    """The batch at `endpoint`, processed already, so waiting for it takes a single check."""
+    return batch(path_id(endpoint), status="completed", count=1)
+
+
+def list_batch_errors(endpoint: str, body: Any) -> Dict[str, Any]:
+    return page("errors", endpoint)
+
+
+def download(endpoint: str, body: Any) -> bytes:
+    """A small stand-in for a label file, as the raw bytes of the download."""
+    return b"%PDF-1.4\n" + endpoint.encode("utf-8") + b"\n%%EOF\n"
+
+
+ROUTES: Dict[str, Responder] = {
+    "GET v1/carriers": list_carriers,
+    "POST v1/rates": get_rates_from_shipment,
+    "POST v1/rates/estimate": get_rate_estimate,
+    "POST v1/labels": create_label_from_shipment,
+    "POST v1/labels/rates/{id}": create_label_from_rate_id,
+    "GET v1/labels": list_labels,
+    "GET v1/labels/{id}/track": track_package_by_label_id,
+    "PUT v1/labels/{id}/void": void_label_by_label_id,
+    "GET v1/tracking": track_package_by_carrier_code_and_tracking_number,
+    "POST v1/addresses/validate": validate_addresses,
+    "GET v1/shipments": list_shipments,
+    "POST v1/batches": create_batch,
+    "POST v1/batches/{id}/add": add_to_batch,
+    "POST v1/batches/{id}/process/labels": process_batch,
+    "GET v1/batches/{id}": get_batch,
+    "GET v1/batches/{id}/errors": list_batch_errors,
+    "GET v1/downloads/{id}/{id}/{id}": download,
+}
+"""The responder of every endpoint the SDK calls, by `"METHOD endpoint template"`."""
@@ -0,0 +1,188 @@
+"""
+A local HTTP stand-in for ShipEngine API, to load and soak test the SDK and the code using it::
+
+    python -m shipengine.testing --port 8089 --latency lognormal:0.08,0.5 \
+        --fail 429=0.02 --fail 503=0.01
+    CLIENT_BASE_URI=http://127.0.0.1:8089/ python my_load_test.py
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import threading
+from typing import Callable, Dict, List, Optional
+
+from aiohttp import web
+
+from ..http_client.request_template import request_template
+from ..http_client.transport import TransportRequest
+from .stub_transport import StubTransport
+
+
+def latency_distribution(spec: str, seed: Optional[int] = None) -> Callable[[], float]:
+    """
+    A latency drawing its seconds from the distribution described by `spec`:
+
+    - `0.05`: a constant.
+    - `uniform:<low>,<high>`.
+    - `normal:<mean>,<stddev>`, clipped at 0.
+    - `lognormal:<median>,<sigma>`, the long tail typical of API latencies.
+    """
+    name, _, args = spec.partition(":")
+    if not args:
+        constant = float(name)
+        return lambda: constant
+    params = [float(arg) for arg in args.split(",")]
+    draw = random.Random(seed)
+    if name == "uniform":
+        return lambda: draw.uniform(*params)
+    if name == "normal":
+        return lambda: max(0.0, draw.gauss(*params))
+    if name == "lognormal":
+        mu, sigma = math.log(params[0]), params[1]
+        return lambda: draw.lognormvariate(mu, sigma)
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class StubServer:
+    def __init__(
+        self, transport: Optional[StubTransport] = None, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        """
+        Serves the responses of a `StubTransport` over HTTP, latencies and injected failures
+        included. Unlike the transport, requests go through the SDK's real connection pools
+        and sockets, so pooling, keep-alive and retry behaviour can be soak tested. Point the
+        SDK at `url`, with the `CLIENT_BASE_URI` environment variable or the `base_uri` option.
+
+        >>> with StubServer(StubTransport(latency=0.05, failures={429: 0.01})) as server:
+        ...     shipengine = ShipEngine({"api_key": api_key, "base_uri": server.url})
+
+        :param int port: The port to listen on, 0 picks a free one.
+        """
+        self.transport = StubTransport() if transport is None else transport
+        self.host = host
+        self.port = port
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    def application(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", "/{endpoint:.*}", self.handle)
+        return app
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        body = await request.read()
+        response = self.transport.respond(
+            TransportRequest(
+                http_method=request.method,
+                endpoint=request.path_qs.lstrip("/"),
+                body=body or None,
+                template=request_template(self.url, request.headers.get("Api-Key", "")),
+                config=None,
+                timeout=None,
+            )
+        )
+        delay = self.transport.delay(response)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return web.Response(
+            status=response.status_code, body=response.content, headers=response.headers
+        )
+
+    async def start_async(self) -> None:
+        """Start listening in the running event loop."""
+        self._runner = web.AppRunner(self.application(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop_async(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start(self) -> "StubServer":
+        """Start listening on a background thread running its own event loop."""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="shipengine-stub-server", daemon=True
+        )
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.start_async(), self._loop).result()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop_async(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def failure(value: str) -> Dict[int, float]:
+    status_code, _, probability = value.partition("=")
+    return {int(status_code): float(probability)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m shipengine.testing", description=__doc__.splitlines()[1]
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument(
+        "--latency",
+        default="0",
+        help="seconds per response, or uniform:LOW,HIGH, normal:MEAN,SD, lognormal:MEDIAN,SIGMA",
+    )
+    parser.add_argument(
+        "--fail",
+        type=failure,
+        action="append",
+        default=[],
+        metavar="STATUS=PROBABILITY",
+        help="inject an error status, e.g. 429=0.02, repeatable",
+    )
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    transport = StubTransport(
+        latency=latency_distribution(args.latency, seed=args.seed),
+        failures={status: p for fail in args.fail for status, p in fail.items()},
+        seed=args.seed,
+        retry_after=args.retry_after,
+    )
+    server = StubServer(transport, host=args.host, port=args.port)
+
+    async def serve() -> None:
+        await server.start_async()
+        print(f"Serving a ShipEngine stand-in on {server.url}, set CLIENT_BASE_URI to it.")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop_async()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
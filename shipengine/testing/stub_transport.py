@@ -0,0 +1,175 @@
+"""An in-process transport answering the SDK requests without any network."""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Union
+
+from requests.structures import CaseInsensitiveDict
+
+from ..http_client.transport import (
+    AsyncTransport,
+    Transport,
+    TransportRequest,
+    TransportResponse,
+)
+from ..instrumentation import endpoint_template
+from . import fixtures
+
+Latency = Union[float, Callable[[], float]]
+"""Seconds a response is delayed by, or a callable drawing them, e.g. from a distribution."""
+
+
+class StubResponse:
+    def __init__(
+        self,
+        body: Any = None,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        latency: Optional[Latency] = None,
+    ) -> None:
+        """
+        A canned response. `body` is encoded to JSON once, here, unless it is `bytes` already,
+        so serving it again and again costs next to nothing.
+
+        :param Latency latency: Overrides the latency of the transport for this response.
+        """
+        self.status_code = status_code
+        self.content: bytes = (
+            body
+            if isinstance(body, bytes)
+            else b"" if body is None else json.dumps(body).encode("utf-8")
+        )
+        self.headers: Mapping[str, str] = CaseInsensitiveDict(
+            dict(
+                {"Content-Type": "application/json"} if self.content else dict(), **(headers or {})
+            )
+        )
+        self.latency = latency
+
+    @classmethod
+    def rate_limited(cls, retry_after: float = 1) -> "StubResponse":
+        """A 429 asking the client to wait `retry_after` seconds."""
+        return cls(
+            fixtures.rate_limited_body(), status_code=429, headers={"Retry-After": str(retry_after)}
+        )
+
+    @classmethod
+    def server_error(cls, status_code: int = 500) -> "StubResponse":
+        return cls(fixtures.error_body("An unexpected error occurred."), status_code=status_code)
+
+    def __repr__(self) -> str:
+        return f"StubResponse(status_code={self.status_code})"
+
+
+Handler = Union[StubResponse, Callable[[TransportRequest], StubResponse], Sequence[StubResponse]]
+
+
+def fixture_handler(responder: fixtures.Responder) -> Callable[[TransportRequest], StubResponse]:
+    """A handler generating its responses with one of the `fixtures` responders."""
+
+    def handle(request: TransportRequest) -> StubResponse:
+        body = json.loads(request.body) if request.body else None
+        return StubResponse(responder(request.endpoint, body))
+
+    return handle
+
+
+class StubTransport(Transport, AsyncTransport):
+    def __init__(
+        self,
+        routes: Optional[Dict[str, Handler]] = None,
+        latency: Latency = 0.0,
+        failures: Optional[Dict[int, float]] = None,
+        fixtures_fallback: bool = True,
+        seed: Optional[int] = None,
+        retry_after: float = 1.0,
+    ) -> None:
+        """
+        Answers every request in-process, for both `ShipEngine` and `AsyncShipEngine`, so tests,
+        benchmarks and load tests measure the SDK and the application, not the network. Routes
+        are keyed by `"METHOD endpoint template"`, e.g. `"GET v1/labels/{id}/track"`, and
+        answered by a handler: a `StubResponse`, a list of them served in turn, the last one
+        repeating, or a callable generating one from the `TransportRequest`. Endpoints without
+        a route get a realistic response from `shipengine.testing.fixtures`, or a 404.
+
+        >>> transport = StubTransport(latency=0.05, failures={429: 0.01})
+        >>> transport.add("POST v1/labels", [StubResponse.server_error(), StubResponse({...})])
+        >>> shipengine = ShipEngine({"api_key": api_key, "transport": transport})
+
+        :param Latency latency: The delay of every response, slept in the calling thread or
+        awaited in the event loop.
+        :param failures: The probability of each injected failure status, e.g. `{503: 0.02}`.
+        :param float retry_after: The `Retry-After` seconds of the injected 429 responses.
+        :param bool fixtures_fallback: Serve the fixtures for endpoints without a route.
+        :param int seed: Seeds the failure injection, for reproducible runs.
+        """
+        self.latency = latency
+        self.failures: Dict[int, float] = dict(failures or dict())
+        self.fixtures_fallback = fixtures_fallback
+        self.retry_after = retry_after
+        self.calls: Dict[str, int] = dict()
+        """The number of requests received by route."""
+        self._routes: Dict[str, Handler] = dict()
+        self._served: Dict[str, int] = dict()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        for route, handler in (routes or dict()).items():
+            self.add(route, handler)
+
+    def add(self, route: str, handler: Handler) -> None:
+        """Answer the requests of `route`, e.g. `"POST v1/labels"`, with `handler`."""
+        with self._lock:
+            self._routes[route] = handler
+            self._served[route] = 0
+
+    def send(self, request: TransportRequest) -> TransportResponse:
+        response = self.respond(request)
+        delay = self.delay(response)
+        if delay > 0:
+            time.sleep(delay)
+        return TransportResponse(response.status_code, response.headers, response.content)
+
+    async def send_async(self, request: TransportRequest) -> TransportResponse:
+        response = self.respond(request)
+        delay = self.delay(response)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return TransportResponse(response.status_code, response.headers, response.content)
+
+    def respond(self, request: TransportRequest) -> StubResponse:
+        """The response to `request`, without its latency, see `delay()`."""
+        route = f"{request.http_method} {endpoint_template(request.endpoint)}"
+        with self._lock:
+            self.calls[route] = self.calls.get(route, 0) + 1
+            failure = self._failure()
+            handler = self._routes.get(route)
+            if isinstance(handler, (list, tuple)):
+                served = self._served[route]
+                self._served[route] = served + 1
+                handler = handler[min(served, len(handler) - 1)]
+
+        if failure is not None:
+            return failure
+        if handler is None and self.fixtures_fallback and route in fixtures.ROUTES:
+            handler = fixture_handler(fixtures.ROUTES[route])
+        if handler is None:
+            return StubResponse(fixtures.not_found_body(request.endpoint), status_code=404)
+        return handler if isinstance(handler, StubResponse) else handler(request)
+
+    def _failure(self) -> Optional[StubResponse]:
+        draw = self._random.random() if self.failures else 1.0
+        for status_code, probability in self.failures.items():
+            if draw < probability:
+                if status_code == 429:
+                    return StubResponse.rate_limited(self.retry_after)
+                return StubResponse.server_error(status_code)
+            draw -= probability
+        return None
+
+    def delay(self, response: StubResponse) -> float:
+        """Seconds to wait before serving `response`."""
+        latency = self.latency if response.latency is None else response.latency
+        return latency() if callable(latency) else latency
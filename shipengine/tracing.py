@@ -0,0 +1,179 @@
+"""Spans around the SDK requests, for any tracer shaped like an OpenTelemetry `Tracer`."""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from .errors import RateLimitExceededError, ShipEngineError
+from .instrumentation import endpoint_template
+
+
+def call_span(tracer: Any, http_method: str, endpoint: str) -> ContextManager[Any]:
+    """
+    The parent span of one SDK request, from the first attempt to the last, retries and their
+    waits included. Yields `None` when no tracer is configured.
+    """
+    if tracer is None:
+        return nullcontext()
+    template = endpoint_template(endpoint)
+    return tracer.start_as_current_span(
+        f"shipengine {http_method} {template}",
+        attributes={"shipengine.http.method": http_method, "shipengine.endpoint": template},
+    )
+
+
+def attempt_span(
+    tracer: Any, http_method: str, template: Any, endpoint: str, attempt: int, wait: float
+) -> ContextManager[Any]:
+    """
+    The child span of one HTTP attempt, named and annotated after the OpenTelemetry HTTP client
+    conventions. `wait` is the time the attempt waited on the rate limiter before being sent.
+    """
+    if tracer is None:
+        return nullcontext()
+    attributes: Dict[str, Any] = {
+        "http.request.method": http_method,
+        "url.full": template.url(endpoint),
+        "shipengine.rate_limit.wait": max(0.0, wait),
+    }
+    if attempt:
+        attributes["http.request.resend_count"] = attempt
+    return tracer.start_as_current_span(http_method, attributes=attributes)
+
+
+def trace_response(
+    span: Any,
+    status_code: int,
+    request_body: Optional[bytes],
+    response_body: bytes,
+    started: float,
+    sent: float,
+    received: float,
+) -> None:
+    """
+    Annotate an attempt span with its response, and the time spent serializing the request,
+    before `sent`, and deserializing the response, since `received`.
+    """
+    if span is not None:
+        set_attributes(
+            span,
+            {
+                "http.response.status_code": status_code,
+                "http.request.body.size": len(request_body or b""),
+                "http.response.body.size": len(response_body),
+                "shipengine.serialize.duration": sent - started,
+                "shipengine.deserialize.duration": time.perf_counter() - received,
+            },
+        )
+
+
+class RequestWaits:
+    def __init__(self) -> None:
+        """
+        The time a request spent waiting outside its attempts, set on its span: on the rate
+        limiter, including `Retry-After` pauses after a 429, and backing off before retries.
+        """
+        self.rate_limit: float = 0.0
+        self.retry: float = 0.0
+
+    def rate_limited(self, span: Any, delay: float) -> None:
+        self.rate_limit += delay
+        set_attributes(span, {"shipengine.rate_limit.wait": self.rate_limit})
+
+    def retried(self, span: Any, error: ShipEngineError, attempt: int, delay: float) -> None:
+        """A failed attempt is retried after `delay`, spent on the rate limiter after a 429."""
+        if span is None:
+            return
+        if not isinstance(error, RateLimitExceededError):
+            self.retry += delay
+        set_attributes(
+            span, {"shipengine.retries": attempt + 1, "shipengine.retry.wait": self.retry}
+        )
+        span.add_event(
+            "shipengine.retry",
+            {
+                "shipengine.retry.attempt": attempt,
+                "shipengine.retry.delay": delay,
+                "error.type": type(error).__name__,
+            },
+        )
+
+
+def set_attributes(span: Any, attributes: Dict[str, Any]) -> None:
+    """Set `attributes` on `span`, if the request is traced."""
+    if span is not None:
+        for name, value in attributes.items():
+            span.set_attribute(name, value)
+
+
+class RecordedSpan:
+    def __init__(
+        self, name: str, parent: Optional["RecordedSpan"], attributes: Optional[Dict[str, Any]]
+    ) -> None:
+        """A span kept in memory by the `RecordingTracer`."""
+        self.name = name
+        self.parent = parent
+        self.attributes: Dict[str, Any] = dict(attributes or dict())
+        self.events: List[Tuple[str, Dict[str, Any]]] = list()
+        self.exception: Optional[BaseException] = None
+        self.start_time: float = time.perf_counter()
+        self.end_time: Optional[float] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end_time is None else self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append((name, dict(attributes or dict())))
+
+    def record_exception(self, exception: BaseException, **kwargs: Any) -> None:
+        self.exception = exception
+
+    def is_recording(self) -> bool:
+        return self.end_time is None
+
+    def __repr__(self) -> str:
+        return f"RecordedSpan({self.name!r}, attributes={self.attributes!r})"
+
+
+class RecordingTracer:
+    def __init__(self) -> None:
+        """
+        A dependency-free tracer keeping the spans of the SDK requests in memory, to inspect
+        them in tests or while debugging. Pass it, or an OpenTelemetry tracer, in the `tracer`
+        config option. Finished spans are appended to `spans`, children before their parent.
+        """
+        self.spans: List[RecordedSpan] = list()
+        self._current: contextvars.ContextVar[Optional[RecordedSpan]] = contextvars.ContextVar(
+            "shipengine_current_span", default=None
+        )
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, attributes: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Iterator[RecordedSpan]:
+        """Open a span, a child of the current one, and make it current until it ends."""
+        span = RecordedSpan(name, parent=self._current.get(), attributes=attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as err:
+            span.record_exception(err)
+            raise
+        finally:
+            span.end_time = time.perf_counter()
+            self._current.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def children(self, span: RecordedSpan) -> List[RecordedSpan]:
+        """The finished spans opened while `span` was current, in the order they started."""
+        with self._lock:
+            found = [child for child in self.spans if child.parent is span]
+        return sorted(found, key=lambda child: child.start_time)
@@ -0,0 +1,296 @@
+"""A status-aware scheduler polling the tracking of many shipments within a request budget."""
+
+import heapq
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .http_client.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+Tracking = Dict[str, Any]
+
+
+class TrackedShipment:
+    def __init__(
+        self,
+        key: Hashable,
+        label_id: Optional[str] = None,
+        carrier_code: Optional[str] = None,
+        tracking_number: Optional[str] = None,
+    ) -> None:
+        """
+        A shipment followed by the `TrackingScheduler`, identified by its `label_id` or by its
+        `carrier_code` and `tracking_number`. Only the latest status is kept, not the tracking
+        events, so tens of thousands of shipments fit comfortably in memory.
+        """
+        self.key = key
+        self.label_id = label_id
+        self.carrier_code = carrier_code
+        self.tracking_number = tracking_number
+        self.status_code: Optional[str] = None
+        self.status_detail_code: Optional[str] = None
+        self.polls: int = 0
+        self.errors: int = 0
+        self.last_error: Optional[Exception] = None
+        self.next_poll_at: float = 0.0
+        self.retired: bool = False
+        self._seq: int = -1
+
+    def __repr__(self) -> str:
+        return f"TrackedShipment(key={self.key!r}, status_code={self.status_code!r})"
+
+
+class TrackingScheduler:
+    DEFAULT_INTERVALS: Dict[Optional[str], Optional[float]] = {
+        "OUT_FOR_DELIVERY": 30 * 60,
+        "AT": 2 * 60 * 60,
+        "AC": 6 * 60 * 60,
+        "IT": 6 * 60 * 60,
+        "NY": 4 * 60 * 60,
+        "UN": 4 * 60 * 60,
+        None: 4 * 60 * 60,
+        "DE": None,
+        "SP": None,
+        "EX": None,
+    }
+    """
+    Default seconds between two polls by `status_detail_code` or `status_code`, a detail code
+    taking precedence. `None` retires the shipment: delivered, picked up or in exception.
+    """
+
+    DEFAULT_ERROR_INTERVAL: float = 60 * 60
+    """
+    Default seconds before polling again a shipment whose last poll failed, doubled after each
+    further consecutive failure.
+    """
+
+    DEFAULT_MAX_ERRORS: int = 5
+    """Default number of consecutive failed polls after which a shipment is retired."""
+
+    def __init__(
+        self,
+        shipengine: Any,
+        requests_per_hour: float,
+        burst: Optional[int] = None,
+        intervals: Optional[Dict[Optional[str], Optional[float]]] = None,
+        error_interval: float = DEFAULT_ERROR_INTERVAL,
+        max_errors: int = DEFAULT_MAX_ERRORS,
+        jitter: float = 0.1,
+        on_update: Optional[Callable[[TrackedShipment, Optional[Tracking]], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Polls the tracking of many shipments, each at a pace set by its latest status: often
+        when out for delivery, rarely while in transit, never again once delivered. Shipments
+        wait in a priority queue ordered by their next poll time, and polls are only sent while
+        the request budget allows it, overdue shipments first.
+
+        >>> scheduler = TrackingScheduler(shipengine, requests_per_hour=2000, on_update=notify)
+        >>> scheduler.track_label("se-28529731")
+        >>> scheduler.run()
+
+        :param ShipEngine shipengine: The client polls are sent with, on its worker pool.
+        :param float requests_per_hour: The tracking request budget.
+        :param int burst: Requests that may be sent at once, a minute of budget by default.
+        :param intervals: Overrides of `DEFAULT_INTERVALS`.
+        :param float jitter: Relative random spread of poll times, so shipments added together
+        do not stay in lockstep.
+        :param on_update: Called with the shipment and its tracking information after every
+        poll, or with `None` after a failed poll, once the shipments polled together are all
+        rescheduled. An error it raises is logged and does not stop the polling.
+        """
+        self.shipengine = shipengine
+        self.intervals: Dict[Optional[str], Optional[float]] = dict(
+            self.DEFAULT_INTERVALS, **(intervals or dict())
+        )
+        self.error_interval = error_interval
+        self.max_errors = max_errors
+        self.jitter = jitter
+        self.on_update = on_update
+        self.budget = TokenBucket(
+            rate=requests_per_hour / 3600.0,
+            capacity=burst if burst is not None else max(1.0, requests_per_hour / 60.0),
+            clock=clock,
+        )
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._queue: List[Tuple[float, int, Hashable]] = list()
+        self._shipments: Dict[Hashable, TrackedShipment] = dict()
+        self._seq: int = 0
+
+    def track_label(self, label_id: str) -> TrackedShipment:
+        """Start following a shipment by the `label_id` of its label, it is polled right away."""
+        return self._track(TrackedShipment(key=("label", label_id), label_id=label_id))
+
+    def track(self, carrier_code: str, tracking_number: str) -> TrackedShipment:
+        """Start following a shipment by carrier and tracking number, polled right away."""
+        return self._track(
+            TrackedShipment(
+                key=(carrier_code, tracking_number),
+                carrier_code=carrier_code,
+                tracking_number=tracking_number,
+            )
+        )
+
+    def untrack(self, shipment: TrackedShipment) -> None:
+        """Stop following a shipment."""
+        with self._lock:
+            self._shipments.pop(shipment.key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._shipments)
+
+    def __contains__(self, shipment: TrackedShipment) -> bool:
+        with self._lock:
+            return shipment.key in self._shipments
+
+    def poll_interval(self, shipment: TrackedShipment) -> Optional[float]:
+        """Seconds until the next poll of a shipment, `None` if it should be retired."""
+        if (
+            shipment.status_detail_code is not None
+            and shipment.status_detail_code in self.intervals
+        ):
+            return self.intervals[shipment.status_detail_code]
+        return self.intervals.get(shipment.status_code, self.intervals[None])
+
+    def next_poll_at(self) -> Optional[float]:
+        """The clock time of the earliest scheduled poll, `None` when nothing is tracked."""
+        with self._lock:
+            self._drop_stale()
+            return self._queue[0][0] if self._queue else None
+
+    def run_pending(self, max_polls: Optional[int] = None) -> List[TrackedShipment]:
+        """
+        Poll the shipments that are due, as many as the request budget allows, concurrently
+        on the ShipEngine worker pool, and schedule their next poll.
+
+        :param int max_polls: An upper bound on the number of polls sent by this call.
+        :returns List[TrackedShipment]: The shipments polled.
+        """
+        due = self._take_due(max_polls=max_polls)
+        futures = [(shipment, self._poll(shipment)) for shipment in due]
+        updates: List[Tuple[TrackedShipment, Optional[Tracking]]] = list()
+        for shipment, future in futures:
+            try:
+                tracking = future.result()
+            except Exception as err:
+                # The shipment is off the queue already, whatever failed it must be put back.
+                self._reschedule(shipment, tracking=None, error=err)
+                updates.append((shipment, None))
+            else:
+                self._reschedule(shipment, tracking=tracking, error=None)
+                updates.append((shipment, tracking))
+        # Every polled shipment is back on the queue before any callback runs.
+        for shipment, tracking in updates:
+            self._notify(shipment, tracking)
+        return due
+
+    def run(self, stop: Optional[threading.Event] = None, max_idle: float = 60.0) -> None:
+        """
+        Keep polling until every shipment is retired or `stop` is set, sleeping between rounds
+        until the next poll is due, or the budget allows one, for at most `max_idle` seconds.
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set() and len(self):
+            polled = self.run_pending()
+            next_poll_at = self.next_poll_at()
+            if next_poll_at is None:
+                return
+            idle = max(0.0, next_poll_at - self._clock())
+            if idle == 0.0 and not polled:
+                idle = 1.0 / self.budget.rate  # Due, but out of budget until the next token.
+            stop.wait(min(idle, max_idle))
+
+    def _track(self, shipment: TrackedShipment) -> TrackedShipment:
+        with self._lock:
+            existing = self._shipments.get(shipment.key)
+            if existing is not None:
+                return existing
+            self._shipments[shipment.key] = shipment
+            self._schedule(shipment, at=self._clock())
+            return shipment
+
+    def _schedule(self, shipment: TrackedShipment, at: float) -> None:
+        self._seq += 1
+        shipment._seq = self._seq
+        shipment.next_poll_at = at
+        heapq.heappush(self._queue, (at, self._seq, shipment.key))
+
+    def _drop_stale(self) -> None:
+        """Pop queue entries of untracked shipments, or superseded by a newer schedule."""
+        while self._queue:
+            _, seq, key = self._queue[0]
+            shipment = self._shipments.get(key)
+            if shipment is not None and shipment._seq == seq:
+                return
+            heapq.heappop(self._queue)
+
+    def _take_due(self, max_polls: Optional[int]) -> List[TrackedShipment]:
+        now = self._clock()
+        due: List[TrackedShipment] = list()
+        with self._lock:
+            while max_polls is None or len(due) < max_polls:
+                self._drop_stale()
+                if not self._queue or self._queue[0][0] > now or not self.budget.try_take():
+                    break
+                _, _, key = heapq.heappop(self._queue)
+                due.append(self._shipments[key])
+        return due
+
+    def _poll(self, shipment: TrackedShipment) -> Future:
+        try:
+            if shipment.label_id is not None:
+                return self.shipengine.submit("track_package_by_label_id", shipment.label_id)
+            return self.shipengine.submit(
+                "track_package_by_carrier_code_and_tracking_number",
+                shipment.carrier_code,
+                shipment.tracking_number,
+            )
+        except Exception as err:
+            failed: Future = Future()
+            failed.set_exception(err)
+            return failed
+
+    def _reschedule(
+        self,
+        shipment: TrackedShipment,
+        tracking: Optional[Tracking],
+        error: Optional[Exception],
+    ) -> None:
+        shipment.polls += 1
+        if error is not None:
+            shipment.errors += 1
+            shipment.last_error = error
+            interval = (
+                self.error_interval * 2 ** (shipment.errors - 1)
+                if shipment.errors < self.max_errors
+                else None
+            )
+        else:
+            shipment.errors = 0
+            shipment.status_code = tracking.get("status_code")
+            shipment.status_detail_code = tracking.get("status_detail_code")
+            interval = self.poll_interval(shipment)
+
+        with self._lock:
+            if shipment.key in self._shipments:
+                if interval is None:
+                    shipment.retired = True
+                    del self._shipments[shipment.key]
+                else:
+                    spread = 1 + random.uniform(-self.jitter, self.jitter)
+                    self._schedule(shipment, at=self._clock() + interval * spread)
+
+    def _notify(self, shipment: TrackedShipment, tracking: Optional[Tracking]) -> None:
+        if self.on_update is None:
+            return
+        try:
+            self.on_update(shipment, tracking)
+        except Exception:
+            logger.exception("Tracking callback %r failed on %r.", self.on_update, shipment)
@@ -1,7 +1,9 @@
 """Assertion helper functions."""
 
 import re
-from typing import Any, Dict, List
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
 
 from shipengine.enums import Country, ErrorCode, ErrorSource, ErrorType
 
@@ -13,6 +15,9 @@ from ..errors import (
     ShipEngineError,
     ValidationError,
 )
+from ..instrumentation import Instrumentation
+from ..json_codec import JSONCodec
+from ..retry_policy import RetryPolicy
 
 validation_message = "Invalid address. Either the postal code or the city/locality and state/province must be specified."  # noqa
 
@@ -154,6 +159,216 @@ def is_timeout_valid(config: Dict[str, Any]) -> None:
         )
 
 
+def is_pool_size_valid(config: Dict[str, Any], field_name: str) -> None:
+    """
+    Checks that a connection pool setting such as config.pool_maxsize is a valid value.
+
+    :param dict config: The config dictionary passed into `ShipEngineConfig`.
+    :param str field_name: The connection pool setting to check.
+    :returns: None, only raises exceptions.
+    :rtype: None
+    """
+    if field_name in config and config[field_name] < 1:
+        raise InvalidFieldValueError(
+            field_name=field_name,
+            reason="Connection pool sizes must be one or greater.",
+            field_value=config[field_name],
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+
+
+def is_max_concurrency_valid(config: Dict[str, Any]) -> None:
+    """
+    Checks that config.max_concurrency is a valid value.
+
+    :param dict config: The config dictionary passed into `ShipEngineConfig`.
+    :returns: None, only raises exceptions.
+    :rtype: None
+    """
+    if "max_concurrency" in config and config["max_concurrency"] < 1:
+        raise InvalidFieldValueError(
+            field_name="max_concurrency",
+            reason="Max concurrency must be one or greater.",
+            field_value=config["max_concurrency"],
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+
+
+def is_rate_limit_valid(config: Dict[str, Any]) -> None:
+    """
+    Checks that config.requests_per_second and config.rate_limit_burst are valid values.
+
+    :param dict config: The config dictionary passed into `ShipEngineConfig`.
+    :returns: None, only raises exceptions.
+    :rtype: None
+    """
+    requests_per_second = config.get("requests_per_second")
+    if requests_per_second is not None and requests_per_second <= 0:
+        raise InvalidFieldValueError(
+            field_name="requests_per_second",
+            reason="Requests per second must be greater than zero.",
+            field_value=requests_per_second,
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+
+    rate_limit_burst = config.get("rate_limit_burst")
+    if rate_limit_burst is not None and rate_limit_burst < 1:
+        raise InvalidFieldValueError(
+            field_name="rate_limit_burst",
+            reason="Rate limit burst must be one or greater.",
+            field_value=rate_limit_burst,
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+
+
+def is_retry_policy_valid(config: Dict[str, Any]) -> None:
+    """
+    Checks that config.retry_policy is a `RetryPolicy` or a dictionary of its arguments.
+
+    :param dict config: The config dictionary passed into `ShipEngineConfig`.
+    :returns: None, only raises exceptions.
+    :rtype: None
+    """
+    if "retry_policy" not in config:
+        return
+
+    retry_policy = config["retry_policy"]
+    if type(retry_policy) is dict:
+        retry_policy = RetryPolicy(**retry_policy)
+    elif not isinstance(retry_policy, RetryPolicy):
+        raise InvalidFieldValueError(
+            field_name="retry_policy",
+            reason="Retry policy must be a RetryPolicy or a dictionary of its arguments.",
+            field_value=retry_policy,
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+
+    if retry_policy.deadline is not None and retry_policy.deadline <= 0:
+        raise InvalidFieldValueError(
+            field_name="retry_policy",
+            reason="Retry policy deadline must be greater than zero.",
+            field_value=retry_policy.deadline,
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+
+
+def is_cache_ttl_valid(config: Dict[str, Any], field_name: str) -> None:
+    """
+    Checks that a cache time-to-live setting such as config.carrier_catalog_ttl is valid.
+
+    :param dict config: The config dictionary passed into `ShipEngineConfig`.
+    :param str field_name: The cache time-to-live setting to check.
+    :returns: None, only raises exceptions.
+    :rtype: None
+    """
+    if field_name in config and config[field_name] is not None and config[field_name] < 0:
+        raise InvalidFieldValueError(
+            field_name=field_name,
+            reason="Cache TTLs must be zero or greater.",
+            field_value=config[field_name],
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+
+
+def is_json_codec_valid(config: Dict[str, Any]) -> None:
+    """
+    Checks that config.json_codec is `"json"`, `"orjson"`, a `JSONCodec` or a
+    `(dumps, loads)` pair of callables, and that `orjson` is installed if requested.
+
+    :param dict config: The config dictionary passed into `ShipEngineConfig`.
+    :returns: None, only raises exceptions.
+    :rtype: None
+    """
+    codec = config.get("json_codec")
+    if codec is None or codec == "json" or isinstance(codec, JSONCodec):
+        return
+
+    if codec == "orjson":
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            raise InvalidFieldValueError(
+                field_name="json_codec",
+                reason="The orjson codec requires the orjson package to be installed.",
+                field_value=codec,
+                error_source=ErrorSource.SHIPENGINE.value,
+            )
+        return
+
+    if not (
+        isinstance(codec, (tuple, list)) and len(codec) == 2 and all(callable(f) for f in codec)
+    ):
+        raise InvalidFieldValueError(
+            field_name="json_codec",
+            reason='JSON codec must be "json", "orjson", a JSONCodec or a (dumps, loads) pair.',
+            field_value=codec,
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+
+
+def is_instrumentation_valid(config: Dict[str, Any]) -> None:
+    """
+    Checks that config.instrumentation is an `Instrumentation` or an iterable of them.
+
+    :param dict config: The config dictionary passed into `ShipEngineConfig`.
+    :returns: None, only raises exceptions.
+    :rtype: None
+    """
+    hooks = config.get("instrumentation")
+    if hooks is None or isinstance(hooks, Instrumentation):
+        return
+
+    if not (
+        isinstance(hooks, (tuple, list)) and all(isinstance(h, Instrumentation) for h in hooks)
+    ):
+        raise InvalidFieldValueError(
+            field_name="instrumentation",
+            reason="Instrumentation must be an Instrumentation or a list of them.",
+            field_value=hooks,
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+
+
+def is_tracer_valid(config: Dict[str, Any]) -> None:
+    """
+    Checks that config.tracer is shaped like an OpenTelemetry `Tracer`, with a
+    `start_as_current_span()` method.
+
+    :param dict config: The config dictionary passed into `ShipEngineConfig`.
+    :returns: None, only raises exceptions.
+    :rtype: None
+    """
+    tracer = config.get("tracer")
+    if tracer is not None and not callable(getattr(tracer, "start_as_current_span", None)):
+        raise InvalidFieldValueError(
+            field_name="tracer",
+            reason="Tracer must have a start_as_current_span() method, like OpenTelemetry's.",
+            field_value=tracer,
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+
+
+def is_transport_valid(config: Dict[str, Any]) -> None:
+    """
+    Checks that config.transport is a `Transport`, for `ShipEngine`, or an `AsyncTransport`,
+    for `AsyncShipEngine`.
+
+    :param dict config: The config dictionary passed into `ShipEngineConfig`.
+    :returns: None, only raises exceptions.
+    :rtype: None
+    """
+    from ..http_client.transport import AsyncTransport, Transport
+
+    transport = config.get("transport")
+    if transport is not None and not isinstance(transport, (Transport, AsyncTransport)):
+        raise InvalidFieldValueError(
+            field_name="transport",
+            reason="Transport must be a Transport or an AsyncTransport.",
+            field_value=transport,
+            error_source=ErrorSource.SHIPENGINE.value,
+        )
+
+
 def api_key_validation_error_assertions(error) -> None:
     """
     Helper test function that has common assertions pertaining to ValidationErrors.
@@ -179,6 +394,32 @@ def timeout_validation_error_assertions(error) -> None:
     assert error.error_source is ErrorSource.SHIPENGINE.value
 
 
+def parse_retry_after(retry_after: Optional[str], default: float = 1.0) -> float:
+    """
+    Parse a `Retry-After` header, which is either a number of seconds or an HTTP-date.
+
+    :param str retry_after: The raw header value, `None` if the header was absent.
+    :param float default: The delay to use when the header is absent or malformed.
+    :returns: The number of seconds to wait before retrying, never negative.
+    :rtype: float
+    """
+    if retry_after is None:
+        return default
+
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return default
+    if retry_at is None:
+        return default
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
 def check_response_for_errors(
     status_code: int, response_body: Dict[str, Any], response_headers, config
 ) -> None:
@@ -207,29 +448,29 @@ def check_response_for_errors(
 
     # Check if status_code is 429 and raises an error if so.
     if status_code == 429:
-        retry_after = response_headers["Retry-After"]
+        retry_after = parse_retry_after(response_headers.get("Retry-After"))
         if retry_after > config.timeout:
             raise ClientTimeoutError(
                 retry_after=config.timeout,
                 error_source=ErrorSource.SHIPENGINE.value,
-                request_id=response_body["request_id"],
+                request_id=response_body.get("request_id"),
             )
         else:
             raise RateLimitExceededError(
                 retry_after=retry_after,
                 error_source=ErrorSource.SHIPENGINE.value,
-                request_id=response_body["request_id"],
+                request_id=response_body.get("request_id"),
             )
 
-    # Check if the status code is 500 and raises an error if so.
-    if status_code == 500:
-        error = response_body["errors"][0]
+    # Check if the status code is 5xx and raises an error if so.
+    if status_code >= 500:
+        error = (response_body.get("errors") or [dict()])[0]
         raise ClientSystemError(
-            message=error["message"],
-            request_id=response_body["request_id"],
-            error_source=error["error_source"],
-            error_type=error["error_type"],
-            error_code=error["error_code"],
+            message=error.get("message", f"ShipEngine API responded with HTTP {status_code}."),
+            request_id=response_body.get("request_id"),
+            error_source=error.get("error_source", ErrorSource.SHIPENGINE.value),
+            error_type=error.get("error_type", ErrorType.SYSTEM.value),
+            error_code=error.get("error_code", ErrorCode.UNSPECIFIED.value),
         )
 
 
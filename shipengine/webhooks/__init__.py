@@ -0,0 +1,7 @@
+"""Receive ShipEngine webhooks and dispatch them to callbacks."""
+
+from .dispatcher import WebhookDispatcher
+from .events import WebhookEvent, batch_payload, decode_webhook, tracking_payload
+from .receiver import WebhookReceiver
+from .sender import WebhookSender
+from .verification import SharedSecretVerifier
@@ -0,0 +1,109 @@
+"""Delivery of received webhook events to callbacks, on worker threads behind a bounded queue."""
+
+import logging
+import queue
+import threading
+from typing import Callable, Dict, List, Optional, Union
+
+from ..enums import WebhookResourceType
+from .events import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[WebhookEvent], None]
+
+_STOP = object()
+
+
+class WebhookDispatcher:
+    DEFAULT_MAX_QUEUE: int = 1000
+    """Default number of events waiting for their callbacks before new ones are refused."""
+
+    def __init__(self, max_queue: int = DEFAULT_MAX_QUEUE, workers: int = 1) -> None:
+        """
+        Runs the callbacks registered for each received event on `workers` threads. Events wait
+        in a queue of at most `max_queue` entries; once it is full `put()` refuses new ones and
+        the receiver answers 503 so ShipEngine delivers them again later, instead of the memory
+        of a slow consumer growing without bound. With a single worker events are handled in the
+        order they were received.
+        """
+        self._callbacks: Dict[Optional[str], List[Callback]] = dict()
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._work, name=f"shipengine-webhooks-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def on(
+        self, resource_type: Union[str, WebhookResourceType, None], callback: Callback
+    ) -> Callback:
+        """
+        Register `callback` for the events of `resource_type`, or for every event when `None`.
+        A callback raising an exception is logged and does not prevent the others from running.
+        """
+        if isinstance(resource_type, WebhookResourceType):
+            resource_type = resource_type.value
+        self._callbacks.setdefault(resource_type, list()).append(callback)
+        return callback
+
+    def on_tracking(self, callback: Callback) -> Callback:
+        """Register `callback` for tracking updates, usable as a decorator."""
+        return self.on(WebhookResourceType.API_TRACK, callback)
+
+    def on_batch(self, callback: Callback) -> Callback:
+        """Register `callback` for processed batches, usable as a decorator."""
+        return self.on(WebhookResourceType.BATCH, callback)
+
+    def put(self, event: WebhookEvent) -> bool:
+        """Queue `event` for its callbacks without blocking, `False` if the queue is full."""
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            return False
+        return True
+
+    def join(self) -> None:
+        """Block until every queued event has been handled."""
+        self._queue.join()
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting events, the workers exit once the queued ones are handled."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def __enter__(self) -> "WebhookDispatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _work(self) -> None:
+        while True:
+            event = self._queue.get()
+            try:
+                if event is _STOP:
+                    return
+                self._dispatch(event)  # type: ignore[arg-type]
+            finally:
+                self._queue.task_done()
+
+    def _dispatch(self, event: WebhookEvent) -> None:
+        callbacks = self._callbacks.get(event.resource_type, list()) + self._callbacks.get(
+            None, list()
+        )
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Webhook callback %r failed on %r.", callback, event)
@@ -0,0 +1,112 @@
+"""Decoding of the webhook payloads ShipEngine sends for tracking updates and batches."""
+
+import json
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+from ..enums import BaseURL, ErrorCode, ErrorSource, ErrorType, WebhookResourceType
+from ..errors import ValidationError
+
+Payload = Dict[str, Any]
+
+
+class WebhookEvent:
+    def __init__(
+        self,
+        resource_type: str,
+        resource_url: Optional[str],
+        data: Dict[str, Any],
+        payload: Payload,
+    ) -> None:
+        """
+        A webhook received from ShipEngine. For an `API_TRACK` webhook `data` has the shape of
+        the tracking information `track_package_by_label_id` returns, plus the `carrier_code` of
+        the shipment. For a `BATCH` webhook `data` holds the `batch_id` of the processed batch.
+
+        :param str resource_type: A `WebhookResourceType` value.
+        :param Payload payload: The webhook body as sent.
+        """
+        self.resource_type = resource_type
+        self.resource_url = resource_url
+        self.data = data
+        self.payload = payload
+
+    def __repr__(self) -> str:
+        return f"WebhookEvent(resource_type={self.resource_type!r}, data={self.data!r})"
+
+
+def invalid_webhook(reason: str) -> ValidationError:
+    return ValidationError(
+        message=f"Invalid webhook payload: {reason}",
+        error_source=ErrorSource.SHIPENGINE.value,
+        error_type=ErrorType.VALIDATION.value,
+        error_code=ErrorCode.INVALID_FIELD_VALUE.value,
+    )
+
+
+def decode_webhook(body: bytes) -> WebhookEvent:
+    """
+    Decode the body of a webhook request into a `WebhookEvent`.
+
+    :raises ValidationError: If the body is not a tracking or batch webhook payload.
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise invalid_webhook("the body is not JSON.")
+    if not isinstance(payload, dict):
+        raise invalid_webhook("the body is not a JSON object.")
+
+    resource_type = payload.get("resource_type")
+    resource_url = payload.get("resource_url")
+    if resource_type == WebhookResourceType.API_TRACK.value:
+        data = tracking_data(payload.get("data"), resource_url)
+    elif resource_type == WebhookResourceType.BATCH.value:
+        data = batch_data(resource_url)
+    else:
+        raise invalid_webhook(f"unsupported resource_type [{resource_type}].")
+    return WebhookEvent(resource_type, resource_url, data, payload)
+
+
+def tracking_data(data: Any, resource_url: Optional[str]) -> Dict[str, Any]:
+    """The tracking information of an `API_TRACK` payload, in the `track_package_*` shape."""
+    if not isinstance(data, dict) or not data.get("tracking_number"):
+        raise invalid_webhook("a tracking update must carry a tracking_number.")
+    tracking = {name: value for name, value in data.items() if name != "label_url"}
+    tracking.setdefault("events", list())
+    if resource_url and "carrier_code" not in tracking:
+        carrier_codes = parse_qs(urlsplit(resource_url).query).get("carrier_code")
+        if carrier_codes:
+            tracking["carrier_code"] = carrier_codes[0]
+    return tracking
+
+
+def batch_data(resource_url: Optional[str]) -> Dict[str, Any]:
+    """The `batch_id` of a `BATCH` payload, the last segment of its `resource_url`."""
+    batch_id = urlsplit(resource_url or "").path.rstrip("/").rpartition("/")[2]
+    if not batch_id:
+        raise invalid_webhook("a batch webhook must carry the resource_url of the batch.")
+    return {"batch_id": batch_id}
+
+
+def tracking_payload(
+    tracking: Dict[str, Any], carrier_code: str, label_url: Optional[str] = None
+) -> Payload:
+    """The payload ShipEngine sends when the tracking of a shipment changes."""
+    resource_url = urljoin(
+        BaseURL.SHIPENGINE_RPC_URL.value,
+        f"v1/tracking?carrier_code={carrier_code}&tracking_number={tracking['tracking_number']}",
+    )
+    return {
+        "resource_url": resource_url,
+        "resource_type": WebhookResourceType.API_TRACK.value,
+        "data": dict(tracking, label_url=label_url),
+    }
+
+
+def batch_payload(batch_id: str) -> Payload:
+    """The payload ShipEngine sends when a batch has been processed."""
+    return {
+        "resource_url": urljoin(BaseURL.SHIPENGINE_RPC_URL.value, f"v1/batches/{batch_id}"),
+        "resource_type": WebhookResourceType.BATCH.value,
+    }
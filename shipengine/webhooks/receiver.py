@@ -0,0 +1,193 @@
+"""A WSGI and ASGI handler receiving ShipEngine webhooks, built on the standard library only."""
+
+import json
+from http import HTTPStatus
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from ..enums import ErrorSource
+from ..errors import ClientSecurityError, InvalidFieldValueError, ValidationError
+from .dispatcher import WebhookDispatcher
+from .events import decode_webhook
+from .verification import Verifier
+
+Response = Tuple[HTTPStatus, Optional[str]]
+
+
+class WebhookReceiver:
+    DEFAULT_MAX_BODY_SIZE: int = 1024 * 1024
+    """Default size in bytes above which a webhook body is refused."""
+
+    RETRY_AFTER: int = 30
+    """Seconds ShipEngine is asked to wait before redelivering a webhook refused when busy."""
+
+    def __init__(
+        self,
+        dispatcher: WebhookDispatcher,
+        verifier: Optional[Verifier] = None,
+        max_body_size: int = DEFAULT_MAX_BODY_SIZE,
+        insecure: bool = False,
+    ) -> None:
+        """
+        Accepts ShipEngine tracking and batch webhooks: each request is verified, decoded into
+        a `WebhookEvent` and queued on the dispatcher, then answered right away so a slow
+        callback never makes ShipEngine time out. The receiver is a WSGI application, and
+        `receiver.asgi` the same handler as an ASGI application, to mount in any web framework.
+
+        >>> dispatcher = WebhookDispatcher()
+        >>> dispatcher.on_tracking(lambda event: print(event.data["status_code"]))
+        >>> app = WebhookReceiver(dispatcher, verifier=SharedSecretVerifier(secret))
+
+        :param Verifier verifier: Rejects requests not sent by ShipEngine, required unless
+        `insecure`.
+        :param bool insecure: Accept every request without a `verifier`, e.g. behind a gateway
+        that authenticates ShipEngine already, or in tests.
+        :raises InvalidFieldValueError: If there is no `verifier` and `insecure` is not set.
+        """
+        if verifier is None and not insecure:
+            raise InvalidFieldValueError(
+                field_name="verifier",
+                reason="A verifier is required to accept webhooks, unless insecure=True is set.",
+                field_value=verifier,
+                error_source=ErrorSource.SHIPENGINE.value,
+            )
+        self.dispatcher = dispatcher
+        self.verifier = verifier
+        self.max_body_size = max_body_size
+
+    def handle(self, method: str, headers: Mapping[str, str], body: bytes) -> Response:
+        """
+        Process one webhook request, independently of the server interface.
+
+        :param Mapping[str, str] headers: The request headers, with lower-cased names.
+        :returns Response: The status and error message to answer with.
+        """
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, "Webhooks must be POSTed."
+        if len(body) > self.max_body_size:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "The webhook body is too large."
+        try:
+            if self.verifier is not None:
+                self.verifier(headers, body)
+            event = decode_webhook(body)
+        except ClientSecurityError as err:
+            return HTTPStatus.UNAUTHORIZED, err.message
+        except ValidationError as err:
+            return HTTPStatus.BAD_REQUEST, err.message
+        if not self.dispatcher.put(event):
+            return HTTPStatus.SERVICE_UNAVAILABLE, "Too many webhooks are waiting, retry later."
+        return HTTPStatus.NO_CONTENT, None
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        """The WSGI interface."""
+        method = environ["REQUEST_METHOD"]
+        length = content_length(environ)
+        if length is None:
+            status, message = HTTPStatus.BAD_REQUEST, "The Content-Length header is malformed."
+        elif length > self.max_body_size:
+            status, message = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "The webhook body is too large."
+        else:
+            body = environ["wsgi.input"].read(length) if length else b""
+            status, message = self.handle(method, wsgi_headers(environ), body)
+
+        content = response_body(message)
+        start_response(f"{status.value} {status.phrase}", response_headers(status, content))
+        return [content]
+
+    async def asgi(
+        self,
+        scope: Dict[str, Any],
+        receive: Callable[[], Awaitable[Dict[str, Any]]],
+        send: Callable[[Dict[str, Any]], Awaitable[None]],
+    ) -> None:
+        """The ASGI interface. The callbacks still run on the dispatcher threads."""
+        if scope["type"] == "lifespan":
+            await asgi_lifespan(receive, send)
+            return
+
+        body, too_large = bytearray(), False
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            too_large = too_large or len(body) + len(message.get("body", b"")) > self.max_body_size
+            if not too_large:
+                body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        if too_large:
+            status, error = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "The webhook body is too large."
+        else:
+            headers = {
+                name.decode("latin-1").lower(): value.decode("latin-1")
+                for name, value in scope.get("headers", list())
+            }
+            status, error = self.handle(scope["method"], headers, bytes(body))
+
+        content = response_body(error)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status.value,
+                "headers": [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in response_headers(status, content)
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": content})
+
+
+def wsgi_headers(environ: Dict[str, Any]) -> Dict[str, str]:
+    """The request headers of a WSGI `environ`, with lower-cased names."""
+    headers = {
+        name[5:].replace("_", "-").lower(): value
+        for name, value in environ.items()
+        if name.startswith("HTTP_")
+    }
+    if environ.get("CONTENT_TYPE"):
+        headers["content-type"] = environ["CONTENT_TYPE"]
+    return headers
+
+
+def content_length(environ: Dict[str, Any]) -> Optional[int]:
+    """The body size of a WSGI request, `None` when its `Content-Length` is malformed."""
+    try:
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return None
+    return length if length >= 0 else None
+
+
+def response_body(message: Optional[str]) -> bytes:
+    return json.dumps({"message": message}).encode("utf-8") if message else b""
+
+
+def response_headers(status: HTTPStatus, content: bytes) -> List[Tuple[str, str]]:
+    headers = [("Content-Length", str(len(content)))]
+    if content:
+        headers.append(("Content-Type", "application/json"))
+    if status is HTTPStatus.SERVICE_UNAVAILABLE:
+        headers.append(("Retry-After", str(WebhookReceiver.RETRY_AFTER)))
+    return headers
+
+
+async def asgi_lifespan(receive: Callable, send: Callable) -> None:
+    """Acknowledge the ASGI lifespan events, the receiver holds no resources of its own."""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
@@ -0,0 +1,45 @@
+"""A stand-in for ShipEngine sending webhooks, to exercise a webhook receiver locally."""
+
+import json
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Optional
+
+from .events import Payload, batch_payload, tracking_payload
+
+
+class WebhookSender:
+    def __init__(
+        self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 5.0
+    ) -> None:
+        """
+        POSTs webhook payloads to `url` the way ShipEngine delivers them, with the custom
+        `headers` a webhook was registered with, e.g. the secret of a `SharedSecretVerifier`.
+        """
+        self.url = url
+        self.headers = dict(headers or dict())
+        self.timeout = timeout
+
+    def send(self, payload: Payload) -> int:
+        """POST `payload` and return the HTTP status the receiver answered with."""
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers=dict(self.headers, **{"Content-Type": "application/json"}),
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status
+        except urllib.error.HTTPError as err:
+            return err.code
+
+    def send_tracking(
+        self, tracking: Dict[str, Any], carrier_code: str, label_url: Optional[str] = None
+    ) -> int:
+        """Send a tracking update, `tracking` in the shape `track_package_by_label_id` returns."""
+        return self.send(tracking_payload(tracking, carrier_code, label_url))
+
+    def send_batch(self, batch_id: str) -> int:
+        """Send the notification that a batch has been processed."""
+        return self.send(batch_payload(batch_id))
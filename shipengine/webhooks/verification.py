@@ -0,0 +1,43 @@
+"""Verification that a webhook request was sent by ShipEngine."""
+
+import hmac
+from typing import Callable, Mapping
+
+from ..enums import ErrorCode, ErrorSource, ErrorType
+from ..errors import ClientSecurityError
+
+Verifier = Callable[[Mapping[str, str], bytes], None]
+"""Called with the lower-cased request headers and the raw body, raises to reject a webhook."""
+
+
+def unverified_webhook(reason: str) -> ClientSecurityError:
+    return ClientSecurityError(
+        message=f"Webhook rejected: {reason}",
+        error_source=ErrorSource.SHIPENGINE.value,
+        error_type=ErrorType.SECURITY.value,
+        error_code=ErrorCode.UNAUTHORIZED.value,
+    )
+
+
+class SharedSecretVerifier:
+    DEFAULT_HEADER: str = "X-ShipEngine-Webhook-Secret"
+    """Default header carrying the shared secret."""
+
+    def __init__(self, secret: str, header: str = DEFAULT_HEADER) -> None:
+        """
+        Accepts the webhooks carrying `secret` in `header`. Set the same header on the webhook
+        when registering it with ShipEngine, which sends its custom headers with every delivery.
+        The secret is compared in constant time.
+        """
+        self.header = header.lower()
+        self._secret = secret.encode("utf-8")
+
+    def __call__(self, headers: Mapping[str, str], body: bytes) -> None:
+        """
+        :raises ClientSecurityError: If the header is missing or does not match the secret.
+        """
+        value = headers.get(self.header)
+        if value is None:
+            raise unverified_webhook(f"the {self.header} header is missing.")
+        if not hmac.compare_digest(value.encode("utf-8"), self._secret):
+            raise unverified_webhook(f"the {self.header} header does not match.")
@@ -0,0 +1,95 @@
+"""Testing how the SDK throughput benchmark compares its results with a baseline."""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from typing import Any, Dict
+from unittest import mock
+
+from benchmarks import sdk_throughput
+from shipengine import AsyncShipEngine, ShipEngine
+
+
+def results(calls_per_second: float, cpu_us_per_call: float) -> Dict[str, Any]:
+    return {
+        "environment": dict(),
+        "results": {
+            "sync": {
+                "validate_addresses": {
+                    "calls_per_second": calls_per_second,
+                    "cpu_us_per_call": cpu_us_per_call,
+                }
+            }
+        },
+    }
+
+
+BASELINE = results(calls_per_second=1000.0, cpu_us_per_call=100.0)
+WITHIN_TOLERANCE = results(calls_per_second=850.0, cpu_us_per_call=115.0)
+BEYOND_TOLERANCE = results(calls_per_second=700.0, cpu_us_per_call=100.0)
+
+
+class TestRegressions(unittest.TestCase):
+    def test_within_tolerance(self) -> None:
+        self.assertEqual(sdk_throughput.regressions(BASELINE, WITHIN_TOLERANCE, 0.2), [])
+
+    def test_slower_beyond_tolerance(self) -> None:
+        found = sdk_throughput.regressions(BASELINE, BEYOND_TOLERANCE, 0.2)
+        self.assertEqual(found, ["sync validate_addresses: 0.70x calls/s, 1.00x cpu/call"])
+
+    def test_more_cpu_beyond_tolerance(self) -> None:
+        current = results(calls_per_second=1000.0, cpu_us_per_call=130.0)
+        found = sdk_throughput.regressions(BASELINE, current, 0.2)
+        self.assertEqual(found, ["sync validate_addresses: 1.00x calls/s, 1.30x cpu/call"])
+
+    def test_methods_missing_from_the_baseline_are_skipped(self) -> None:
+        current = results(calls_per_second=1.0, cpu_us_per_call=1000.0)
+        current["results"]["async"] = current["results"].pop("sync")
+        self.assertEqual(sdk_throughput.regressions(BASELINE, current, 0.2), [])
+
+
+class TestCompare(unittest.TestCase):
+    def setUp(self) -> None:
+        fd, self.baseline = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(BASELINE, f)
+        self.addCleanup(os.remove, self.baseline)
+
+    def compare(self, current: Dict[str, Any], tolerance: str) -> int:
+        argv = ["--compare", self.baseline, "--tolerance", tolerance]
+        with mock.patch.object(sdk_throughput, "run", return_value=current):
+            return sdk_throughput.main(argv)
+
+    def test_passes_within_tolerance(self) -> None:
+        self.assertEqual(self.compare(WITHIN_TOLERANCE, "0.2"), 0)
+
+    def test_fails_beyond_tolerance(self) -> None:
+        with mock.patch("builtins.print") as printed:
+            self.assertEqual(self.compare(BEYOND_TOLERANCE, "0.2"), 1)
+        printed.assert_called_once_with(
+            "REGRESSION sync validate_addresses: 0.70x calls/s, 1.00x cpu/call"
+        )
+
+    def test_tolerance_is_configurable(self) -> None:
+        self.assertEqual(self.compare(BEYOND_TOLERANCE, "0.35"), 0)
+
+
+class TestMethods(unittest.TestCase):
+    def test_every_method_reaches_a_canned_endpoint(self) -> None:
+        transport = sdk_throughput.canned_transport(latency=None)
+        config = {"api_key": "TEST_benchmark_methods", "transport": transport}
+        shipengine, async_shipengine = ShipEngine(config), AsyncShipEngine(config)
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        self.addCleanup(shipengine.close)
+        for method, arguments in sdk_throughput.METHODS.items():
+            with self.subTest(method=method):
+                before = sum(transport.calls.values())
+                sdk_throughput.consume(getattr(shipengine, method)(*arguments(1)))
+                bound = getattr(async_shipengine, method)
+                loop.run_until_complete(sdk_throughput.aconsume(bound(*arguments(2))))
+                self.assertGreaterEqual(sum(transport.calls.values()) - before, 2)
+        loop.run_until_complete(async_shipengine.close())
+        self.assertEqual(set(transport.calls), set(sdk_throughput.SAMPLE_ENDPOINTS))
@@ -0,0 +1,145 @@
+"""Testing the persistent address validation cache."""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+import urllib.parse as urlparse
+
+import responses
+
+from shipengine import ShipEngine
+from shipengine.cache import AddressValidationCache, address_fingerprint
+from shipengine.enums import BaseURL, Endpoints
+from tests.util import stub_config, valid_commercial_address
+
+VALIDATE_URL = urlparse.urljoin(
+    BaseURL.SHIPENGINE_RPC_URL.value, Endpoints.ADDRESSES_VALIDATE.value
+)
+
+
+def validate_callback(request):
+    addresses = json.loads(request.body)
+    body = [
+        {"status": "verified", "original_address": address, "matched_address": address}
+        for address in addresses
+    ]
+    return 200, {}, json.dumps(body)
+
+
+def address(line1: str) -> dict:
+    return dict(valid_commercial_address()[0], address_line1=line1)
+
+
+class TestAddressFingerprint(unittest.TestCase):
+    def test_equivalent_addresses_match(self) -> None:
+        self.assertEqual(
+            address_fingerprint(address("3800 N Lamar Blvd")),
+            address_fingerprint(address("3800  north lamar Boulevard.")),
+        )
+
+    def test_different_addresses_differ(self) -> None:
+        self.assertNotEqual(
+            address_fingerprint(address("3800 N Lamar Blvd")),
+            address_fingerprint(address("3801 N Lamar Blvd")),
+        )
+
+
+class TestAddressValidationCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "addresses.sqlite3")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_results_are_shared_across_instances(self) -> None:
+        AddressValidationCache(self.path).set_many({"a": {"status": "verified"}})
+        self.assertEqual(
+            AddressValidationCache(self.path).get_many(["a", "b"]), {"a": {"status": "verified"}}
+        )
+
+    def test_expired_results_are_ignored(self) -> None:
+        cache = AddressValidationCache(self.path, ttl=-1)
+        cache.set_many({"a": {"status": "verified"}})
+        self.assertEqual(cache.get_many(["a"]), {})
+
+    def test_expired_results_are_deleted_on_write(self) -> None:
+        AddressValidationCache(self.path, ttl=-1).set_many({"a": {}, "b": {}})
+        cache = AddressValidationCache(self.path)
+        cache.set_many({"c": {}})
+
+        self.assertEqual(len(cache), 1)
+
+    def test_close_closes_every_thread_connection(self) -> None:
+        cache = AddressValidationCache(self.path)
+        worker = threading.Thread(target=cache.set_many, args=({"a": {}},))
+        worker.start()
+        worker.join()
+        connections = [conn for _, conn in cache._connections]
+
+        cache.close()
+
+        self.assertEqual(len(connections), 2)
+        for conn in connections:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+        self.assertEqual(cache.get_many(["a"]), {"a": {}})
+
+    def test_least_recently_used_are_evicted(self) -> None:
+        cache = AddressValidationCache(self.path, max_entries=2)
+        cache.set_many({"a": {}})
+        cache.set_many({"b": {}})
+        cache.set_many({"c": {}})
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(set(cache.get_many(["a", "b", "c"])), {"b", "c"})
+
+    @responses.activate
+    def test_only_misses_are_validated(self) -> None:
+        responses.add_callback(
+            responses.POST,
+            VALIDATE_URL,
+            callback=validate_callback,
+            content_type="application/json",
+        )
+        shipengine = ShipEngine(dict(stub_config(), address_cache_path=self.path))
+
+        shipengine.validate_addresses([address("1 Main Street")])
+        results = shipengine.validate_addresses(
+            [address("2 Main St"), address("1 main st."), address("2 Main Street")]
+        )
+
+        sent = [json.loads(call.request.body) for call in responses.calls]
+        self.assertEqual(len(sent), 2)
+        self.assertEqual([a["address_line1"] for a in sent[1]], ["2 Main St"])
+        self.assertEqual(
+            [r["original_address"]["address_line1"] for r in results],
+            ["2 Main St", "1 Main Street", "2 Main St"],
+        )
+
+    def test_shipengine_close_closes_its_caches(self) -> None:
+        shipengine = ShipEngine(dict(stub_config(), address_cache_path=self.path))
+        cache = shipengine._address_cache(shipengine.config)
+
+        shipengine.close()
+
+        self.assertEqual(cache._connections, [])
+        self.assertIsNot(shipengine._address_cache(shipengine.config), cache)
+
+    @responses.activate
+    def test_cache_is_disabled_by_default(self) -> None:
+        responses.add_callback(
+            responses.POST,
+            VALIDATE_URL,
+            callback=validate_callback,
+            content_type="application/json",
+        )
+        shipengine = ShipEngine(stub_config())
+
+        shipengine.validate_addresses([address("1 Main Street")])
+        shipengine.validate_addresses([address("1 Main Street")])
+
+        self.assertEqual(len(responses.calls), 2)
@@ -0,0 +1,93 @@
+"""Testing the shipment fingerprint and the rate quote cache."""
+
+import time
+import unittest
+import urllib.parse as urlparse
+
+import responses
+
+from shipengine import ShipEngine
+from shipengine.cache import TTLCache, shipment_fingerprint
+from shipengine.enums import BaseURL, Endpoints
+from tests.util import stub_config
+
+RATES_URL = urlparse.urljoin(
+    BaseURL.SHIPENGINE_RPC_URL.value, Endpoints.GET_RATE_FROM_SHIPMENT.value
+)
+
+
+def shipment(**overrides) -> dict:
+    shipment = {
+        "rate_options": {"carrier_ids": ["se-1", "se-2"]},
+        "shipment": {
+            "ship_to": {
+                "name": "Jane Doe",
+                "address_line1": "525 S Winchester Blvd",
+                "city_locality": "San Jose",
+                "state_province": "CA",
+                "postal_code": "95128",
+                "country_code": "US",
+            },
+            "packages": [{"weight": {"value": 1, "unit": "pound"}}],
+        },
+    }
+    shipment["shipment"].update(overrides)
+    return shipment
+
+
+class TestShipmentFingerprint(unittest.TestCase):
+    def test_equivalent_shipments_match(self) -> None:
+        variant = shipment(packages=[{"weight": {"unit": "ounce", "value": 16}}])
+        variant["rate_options"]["carrier_ids"].reverse()
+        variant["shipment"]["ship_to"]["address_line1"] = "525  s winchester BLVD "
+        variant["shipment"]["ship_to"] = dict(reversed(variant["shipment"]["ship_to"].items()))
+
+        self.assertEqual(shipment_fingerprint(shipment()), shipment_fingerprint(variant))
+
+    def test_different_shipments_differ(self) -> None:
+        heavier = shipment(packages=[{"weight": {"value": 2, "unit": "pound"}}])
+        self.assertNotEqual(shipment_fingerprint(shipment()), shipment_fingerprint(heavier))
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_entries_expire(self) -> None:
+        cache = TTLCache()
+        cache.set("a", 1, ttl=0.01)
+        self.assertEqual(cache.get("a"), 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        cache = TTLCache(max_entries=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+
+class TestRateCache(unittest.TestCase):
+    @responses.activate
+    def test_rates_are_cached_when_enabled(self) -> None:
+        responses.add(responses.POST, RATES_URL, json={"rate_response": {"rates": []}})
+        shipengine = ShipEngine(dict(stub_config(), rate_cache_ttl=60))
+
+        first = shipengine.get_rates_from_shipment(shipment())
+        first["rate_response"]["rates"].append("mutated by the caller")
+        second = shipengine.get_rates_from_shipment(shipment())
+
+        self.assertEqual(second, {"rate_response": {"rates": []}})
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_rates_are_not_cached_by_default(self) -> None:
+        responses.add(responses.POST, RATES_URL, json={"rate_response": {"rates": []}})
+        shipengine = ShipEngine(stub_config())
+
+        shipengine.get_rates_from_shipment(shipment())
+        shipengine.get_rates_from_shipment(shipment())
+
+        self.assertEqual(len(responses.calls), 2)
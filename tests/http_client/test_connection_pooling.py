@@ -0,0 +1,73 @@
+"""Testing that the ShipEngineClient reuses its connection pools across requests."""
+
+import json
+import unittest
+import urllib.parse as urlparse
+
+import responses
+
+from shipengine import ShipEngineConfig
+from shipengine.enums import BaseURL, Endpoints
+from shipengine.http_client import ShipEngineClient
+from tests.util import stub_config
+
+
+def stub_list_carriers_response() -> None:
+    responses.add(
+        **{
+            "method": responses.GET,
+            "url": urlparse.urljoin(
+                BaseURL.SHIPENGINE_RPC_URL.value, Endpoints.LIST_CARRIERS.value
+            ),
+            "body": json.dumps({"carriers": [], "request_id": "1"}),
+            "status": 200,
+            "content_type": "application/json",
+        }
+    )
+
+
+def session_adapter(client: ShipEngineClient, config: ShipEngineConfig):
+    session = client.sessions.get_session(url_base=BaseURL.SHIPENGINE_RPC_URL.value, config=config)
+    return session.get_adapter(BaseURL.SHIPENGINE_RPC_URL.value)
+
+
+class TestConnectionPooling(unittest.TestCase):
+    @responses.activate
+    def test_adapter_is_reused_across_requests(self) -> None:
+        stub_list_carriers_response()
+        client = ShipEngineClient()
+        config = ShipEngineConfig(stub_config())
+
+        client.get(endpoint=Endpoints.LIST_CARRIERS.value, config=config)
+        adapter = session_adapter(client, config)
+        client.get(endpoint=Endpoints.LIST_CARRIERS.value, config=config)
+
+        self.assertIs(session_adapter(client, config), adapter)
+        self.assertEqual(len(client.sessions._sessions), 1)
+
+    @responses.activate
+    def test_pool_settings_are_applied_to_adapter(self) -> None:
+        stub_list_carriers_response()
+        client = ShipEngineClient()
+        config = ShipEngineConfig(
+            dict(stub_config(), pool_connections=4, pool_maxsize=32, pool_block=True)
+        )
+
+        client.get(endpoint=Endpoints.LIST_CARRIERS.value, config=config)
+        adapter = session_adapter(client, config)
+
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertTrue(adapter._pool_block)
+
+    @responses.activate
+    def test_adapter_is_shared_across_retries_settings(self) -> None:
+        stub_list_carriers_response()
+        client = ShipEngineClient()
+        config = ShipEngineConfig(stub_config())
+
+        client.get(endpoint=Endpoints.LIST_CARRIERS.value, config=config)
+        client.get(endpoint=Endpoints.LIST_CARRIERS.value, config=config.merge({"retries": 3}))
+        client.get(endpoint=Endpoints.LIST_CARRIERS.value, config=config)
+
+        self.assertEqual(len(client.sessions._sessions), 1)
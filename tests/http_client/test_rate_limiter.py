@@ -0,0 +1,136 @@
+"""Testing the client-side token bucket rate limiter and Retry-After handling."""
+
+import os
+import unittest
+import urllib.parse as urlparse
+from email.utils import formatdate
+from time import time
+
+import responses
+
+from shipengine import ShipEngine, ShipEngineConfig
+from shipengine.enums import BaseURL, Endpoints
+from shipengine.errors import ClientTimeoutError
+from shipengine.http_client import rate_limiter
+from shipengine.http_client.rate_limiter import TokenBucket, rate_limiter_for
+from shipengine.util import parse_retry_after
+from tests.util import stub_config
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_paced(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+
+        clock.now += 1.0
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+
+    def test_unlimited_bucket_never_waits(self) -> None:
+        bucket = TokenBucket(rate=None, clock=FakeClock())
+        self.assertEqual([bucket.reserve() for _ in range(100)], [0] * 100)
+
+    def test_pause_holds_back_every_caller(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(rate=None, clock=clock)
+
+        bucket.pause(3)
+        self.assertEqual(bucket.reserve(), 3)
+        clock.now += 1
+        self.assertEqual(bucket.reserve(), 2)
+        clock.now += 2
+        self.assertEqual(bucket.reserve(), 0)
+
+    def test_bucket_is_shared_per_api_key(self) -> None:
+        config = ShipEngineConfig(dict(stub_config(), requests_per_second=5))
+        other_key = ShipEngineConfig(dict(stub_config(), api_key="TEST_other"))
+
+        self.assertIs(rate_limiter_for(config), rate_limiter_for(config.merge({"timeout": 1})))
+        self.assertIsNot(rate_limiter_for(config), rate_limiter_for(other_key))
+        self.assertEqual(rate_limiter_for(config).rate, 5)
+
+    def test_other_settings_do_not_reconfigure_a_shared_bucket(self) -> None:
+        config = ShipEngineConfig(dict(stub_config(), api_key="TEST_settings"))
+        limited = config.merge({"requests_per_second": 5, "rate_limit_burst": 2})
+        bucket = rate_limiter_for(limited)
+
+        self.assertIsNot(rate_limiter_for(config), bucket)
+        self.assertIs(rate_limiter_for(limited.merge({"timeout": 1})), bucket)
+        self.assertEqual((bucket.rate, bucket.capacity), (5, 2))
+        self.assertIsNone(rate_limiter_for(config).rate)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork()")
+    def test_locks_are_replaced_after_fork(self) -> None:
+        bucket = rate_limiter_for(ShipEngineConfig(dict(stub_config(), api_key="TEST_fork")))
+        with bucket._lock:  # Held by this thread while the process forks.
+            pid = os.fork()
+            if pid == 0:
+                acquired = bucket._lock.acquire(timeout=1) and rate_limiter._buckets_lock.acquire(
+                    timeout=1
+                )
+                os._exit(0 if acquired else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    def test_seconds(self) -> None:
+        self.assertEqual(parse_retry_after("7"), 7)
+        self.assertEqual(parse_retry_after("0.5"), 0.5)
+
+    def test_http_date(self) -> None:
+        delay = parse_retry_after(formatdate(time() + 30, usegmt=True))
+        self.assertTrue(28 <= delay <= 30)
+
+    def test_missing_or_malformed(self) -> None:
+        self.assertEqual(parse_retry_after(None), 1.0)
+        self.assertEqual(parse_retry_after("soon"), 1.0)
+        self.assertEqual(parse_retry_after("-5"), 0)
+
+
+class TestRateLimitedRequests(unittest.TestCase):
+    url = urlparse.urljoin(BaseURL.SHIPENGINE_RPC_URL.value, Endpoints.LIST_CARRIERS.value)
+
+    @responses.activate
+    def test_429_is_retried_after_retry_after(self) -> None:
+        responses.add(
+            responses.GET,
+            self.url,
+            json={"request_id": "1", "errors": []},
+            status=429,
+            headers={"Retry-After": "0"},
+        )
+        responses.add(responses.GET, self.url, json={"carriers": []}, status=200)
+
+        shipengine = ShipEngine(dict(stub_config(), api_key="TEST_rate_limited", retries=0))
+        result = shipengine.client.get(
+            endpoint=Endpoints.LIST_CARRIERS.value, config=shipengine.config.merge({"retries": 1})
+        )
+
+        self.assertEqual(result, {"carriers": []})
+
+    @responses.activate
+    def test_retry_after_longer_than_timeout_raises(self) -> None:
+        responses.add(
+            responses.GET,
+            self.url,
+            json={"request_id": "1", "errors": []},
+            status=429,
+            headers={"Retry-After": "120"},
+        )
+
+        shipengine = ShipEngine(dict(stub_config(), api_key="TEST_timeout", retries=0))
+        with self.assertRaises(ClientTimeoutError):
+            shipengine.list_carriers()
@@ -0,0 +1,56 @@
+"""Testing the precomputed request template used by the SDK HTTP clients."""
+
+import unittest
+import urllib.parse as urlparse
+
+import responses
+
+from shipengine import ShipEngine
+from shipengine.enums import BaseURL, Endpoints
+from shipengine.http_client import ShipEngineClient
+from shipengine.http_client.request_template import RequestTemplate, request_template
+from tests.util import stub_config
+
+BASE_URI = BaseURL.SHIPENGINE_RPC_URL.value
+CARRIERS_URL = urlparse.urljoin(BASE_URI, Endpoints.LIST_CARRIERS.value)
+
+
+class TestRequestTemplate(unittest.TestCase):
+    def test_templates_are_shared_per_base_uri_and_api_key(self) -> None:
+        self.assertIs(request_template(BASE_URI, "TEST_a"), request_template(BASE_URI, "TEST_a"))
+        self.assertIsNot(request_template(BASE_URI, "TEST_a"), request_template(BASE_URI, "TEST_b"))
+
+    def test_url(self) -> None:
+        template = RequestTemplate(base_uri="https://example.com/api/", api_key="TEST_a")
+
+        self.assertEqual(template.url("v1/labels"), "https://example.com/api/v1/labels")
+        self.assertEqual(template.url("/v1/labels"), "https://example.com/v1/labels")
+
+    def test_headers(self) -> None:
+        template = RequestTemplate(base_uri=BASE_URI, api_key="TEST_a")
+        request = template.prepare("POST", "v1/labels", body=b"{}", idempotency_key="abc")
+
+        self.assertEqual(request.headers["Api-Key"], "TEST_a")
+        self.assertEqual(request.headers["User-Agent"], ShipEngineClient._derive_user_agent())
+        self.assertEqual(request.headers["Content-Type"], "application/json")
+        self.assertEqual(request.headers["Content-Length"], "2")
+        self.assertEqual(request.headers["Idempotency-Key"], "abc")
+        self.assertNotIn("Idempotency-Key", template.headers)
+
+    def test_bodyless_requests(self) -> None:
+        template = RequestTemplate(base_uri=BASE_URI, api_key="TEST_a")
+        get = template.prepare("GET", "v1/carriers", body=None)
+        put = template.prepare("PUT", "v1/labels/se-1/void", body=None)
+
+        self.assertIsNone(get.body)
+        self.assertNotIn("Content-Type", get.headers)
+        self.assertNotIn("Content-Length", get.headers)
+        self.assertEqual(put.headers["Content-Length"], "0")
+
+    @responses.activate
+    def test_get_is_sent_without_a_body(self) -> None:
+        responses.add(responses.GET, CARRIERS_URL, json={"carriers": []})
+
+        ShipEngine(stub_config()).list_carriers()
+
+        self.assertIsNone(responses.calls[0].request.body)
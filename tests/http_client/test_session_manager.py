@@ -0,0 +1,81 @@
+"""Testing the thread- and fork-safety of the SessionManager."""
+
+import os
+import threading
+import unittest
+
+from shipengine import ShipEngine, ShipEngineConfig
+from shipengine.enums import BaseURL
+from shipengine.http_client.session import SessionManager
+from tests.util import stub_config
+
+BASE_URI = BaseURL.SHIPENGINE_RPC_URL.value
+
+
+class TestSessionManager(unittest.TestCase):
+    def test_threads_share_one_session(self) -> None:
+        manager = SessionManager()
+        config = ShipEngineConfig(stub_config())
+        barrier = threading.Barrier(16)
+        sessions = []
+
+        def worker() -> None:
+            barrier.wait()
+            sessions.append(manager.get_session(url_base=BASE_URI, config=config))
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(session) for session in sessions}), 1)
+
+    def test_sessions_are_rebuilt_after_pid_change(self) -> None:
+        manager = SessionManager()
+        config = ShipEngineConfig(stub_config())
+        parent_session = manager.get_session(url_base=BASE_URI, config=config)
+
+        manager._pid = os.getpid() + 1  # Simulate being the child of a fork().
+        child_session = manager.get_session(url_base=BASE_URI, config=config)
+
+        self.assertIsNot(child_session, parent_session)
+        self.assertEqual(manager._pid, os.getpid())
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork()")
+    def test_forked_child_gets_fresh_session(self) -> None:
+        manager = SessionManager()
+        config = ShipEngineConfig(stub_config())
+        parent_session = manager.get_session(url_base=BASE_URI, config=config)
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - runs in the child process
+            child_session = manager.get_session(url_base=BASE_URI, config=config)
+            os.write(write_fd, b"1" if child_session is not parent_session else b"0")
+            os._exit(0)
+
+        os.close(write_fd)
+        result = os.read(read_fd, 1)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+        self.assertEqual(result, b"1")
+
+    def test_close_discards_sessions(self) -> None:
+        manager = SessionManager()
+        config = ShipEngineConfig(stub_config())
+        session = manager.get_session(url_base=BASE_URI, config=config)
+
+        manager.close()
+
+        self.assertIsNot(manager.get_session(url_base=BASE_URI, config=config), session)
+
+    def test_shipengine_context_manager_closes_client(self) -> None:
+        with ShipEngine(stub_config()) as shipengine:
+            config = shipengine.config
+            session = shipengine.client.sessions.get_session(url_base=BASE_URI, config=config)
+
+        self.assertEqual(shipengine.client.sessions._sessions, dict())
+        self.assertIsNot(
+            shipengine.client.sessions.get_session(url_base=BASE_URI, config=config), session
+        )
@@ -0,0 +1,156 @@
+"""Testing the coalescing of identical in-flight GET requests."""
+
+import asyncio
+import threading
+import time
+import unittest
+
+import responses
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from shipengine import AsyncShipEngine, ShipEngine
+from shipengine.enums import BaseURL, Endpoints
+from shipengine.http_client.single_flight import AsyncSingleFlight, SingleFlight
+from tests.util import stub_config
+
+LIST_CARRIERS_URL = BaseURL.SHIPENGINE_RPC_URL.value + Endpoints.LIST_CARRIERS.value
+
+
+def run_threads(count: int, target) -> list:
+    """Start `count` threads running `target()` at once and return their results."""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index: int) -> None:
+        barrier.wait()
+        try:
+            results[index] = target()
+        except Exception as err:
+            results[index] = err
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_call(self) -> None:
+        single_flight = SingleFlight()
+        calls = []
+
+        def fn() -> dict:
+            calls.append(1)
+            time.sleep(0.1)
+            return {"status_code": "DE"}
+
+        results = run_threads(8, lambda: single_flight.do("key", fn))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"status_code": "DE"}] * 8)
+        self.assertEqual(len({id(result) for result in results}), 8)
+
+    def test_errors_are_shared(self) -> None:
+        single_flight = SingleFlight()
+
+        def fn() -> dict:
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        results = run_threads(4, lambda: single_flight.do("key", fn))
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_nothing_is_cached(self) -> None:
+        single_flight = SingleFlight()
+        calls = []
+
+        single_flight.do("key", lambda: calls.append(1))
+        single_flight.do("key", lambda: calls.append(1))
+
+        self.assertEqual(len(calls), 2)
+
+    @responses.activate
+    def test_list_carriers_is_coalesced(self) -> None:
+        def callback(request):
+            time.sleep(0.1)
+            return 200, {}, '{"carriers": []}'
+
+        responses.add_callback(responses.GET, LIST_CARRIERS_URL, callback=callback)
+        shipengine = ShipEngine(stub_config())
+
+        results = run_threads(8, shipengine.list_carriers)
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(results, [{"carriers": []}] * 8)
+
+    @responses.activate
+    def test_coalescing_can_be_disabled(self) -> None:
+        responses.add(responses.GET, LIST_CARRIERS_URL, json={"carriers": []})
+        shipengine = ShipEngine(dict(stub_config(), coalesce_requests=False))
+
+        run_threads(4, shipengine.list_carriers)
+
+        self.assertEqual(len(responses.calls), 4)
+
+
+class TestAsyncSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_call(self) -> None:
+        calls = []
+
+        async def fn() -> dict:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"status_code": "DE"}
+
+        async def test():
+            single_flight = AsyncSingleFlight()
+            return await asyncio.gather(*(single_flight.do("key", fn) for _ in range(8)))
+
+        results = asyncio.run(test())
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"status_code": "DE"}] * 8)
+
+    def test_cancelled_caller_does_not_cancel_the_call(self) -> None:
+        async def fn() -> dict:
+            await asyncio.sleep(0.05)
+            return {"status_code": "DE"}
+
+        async def test():
+            single_flight = AsyncSingleFlight()
+            first = asyncio.ensure_future(single_flight.do("key", fn))
+            second = asyncio.ensure_future(single_flight.do("key", fn))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(test()), {"status_code": "DE"})
+
+    def test_list_carriers_is_coalesced(self) -> None:
+        hits = []
+
+        async def list_carriers(request: web.Request) -> web.Response:
+            hits.append(1)
+            await asyncio.sleep(0.05)
+            return web.json_response({"carriers": []})
+
+        async def test():
+            app = web.Application()
+            app.router.add_get(f"/{Endpoints.LIST_CARRIERS.value}", list_carriers)
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                config = dict(stub_config(), base_uri=str(server.make_url("/")))
+                async with AsyncShipEngine(config) as shipengine:
+                    return await asyncio.gather(*(shipengine.list_carriers() for _ in range(8)))
+            finally:
+                await server.close()
+
+        results = asyncio.run(test())
+
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(results, [{"carriers": []}] * 8)
@@ -0,0 +1,127 @@
+"""Testing the AsyncShipEngine entrypoint against a local aiohttp server."""
+
+import asyncio
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from shipengine import AsyncShipEngine
+from shipengine.enums import Endpoints
+from shipengine.errors import ShipEngineError
+from shipengine.testing import StubServer
+from tests.util import stub_config
+
+
+def stub_app() -> web.Application:
+    """Return an aiohttp application serving a handful of ShipEngine endpoints."""
+
+    async def list_carriers(request: web.Request) -> web.Response:
+        return web.json_response({"carriers": [{"carrier_id": "se-656171"}], "request_id": "1"})
+
+    async def create_label(request: web.Request) -> web.Response:
+        shipment = await request.json()
+        return web.json_response(
+            {"label_id": "se-75714944", "status": "completed", "echo": shipment}
+        )
+
+    async def track(request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "tracking_number": request.query["tracking_number"],
+                "carrier_code": request.query["carrier_code"],
+                "status_code": "DE",
+            }
+        )
+
+    async def not_found(request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "request_id": "2",
+                "errors": [
+                    {
+                        "message": "Label not found.",
+                        "error_type": "validation",
+                        "error_code": "invalid_identifier",
+                    }
+                ],
+            },
+            status=404,
+        )
+
+    app = web.Application()
+    app.router.add_get(f"/{Endpoints.LIST_CARRIERS.value}", list_carriers)
+    app.router.add_post("/v1/labels", create_label)
+    app.router.add_get("/v1/tracking", track)
+    app.router.add_get("/v1/labels/{label_id}/track", not_found)
+    return app
+
+
+async def with_shipengine(test):
+    """Run `test` with an AsyncShipEngine pointed at a freshly started stub server."""
+    server = TestServer(stub_app())
+    await server.start_server()
+    try:
+        config = stub_config()
+        config["base_uri"] = str(server.make_url("/"))
+        async with AsyncShipEngine(config) as shipengine:
+            return await test(shipengine)
+    finally:
+        await server.close()
+
+
+class TestAsyncShipEngine(unittest.TestCase):
+    def test_list_carriers(self) -> None:
+        async def test(shipengine):
+            return await shipengine.list_carriers()
+
+        result = asyncio.run(with_shipengine(test))
+        self.assertEqual(result["carriers"][0]["carrier_id"], "se-656171")
+
+    def test_create_label_from_shipment_sends_body(self) -> None:
+        async def test(shipengine):
+            return await shipengine.create_label_from_shipment({"service_code": "ups_ground"})
+
+        result = asyncio.run(with_shipengine(test))
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(result["echo"], {"service_code": "ups_ground"})
+
+    def test_concurrent_tracking_requests(self) -> None:
+        async def test(shipengine):
+            return await asyncio.gather(
+                *(
+                    shipengine.track_package_by_carrier_code_and_tracking_number(
+                        carrier_code="ups", tracking_number=f"1Z{i}"
+                    )
+                    for i in range(10)
+                )
+            )
+
+        results = asyncio.run(with_shipengine(test))
+        self.assertEqual([r["tracking_number"] for r in results], [f"1Z{i}" for i in range(10)])
+
+    def test_error_response_raises(self) -> None:
+        async def test(shipengine):
+            with self.assertRaises(ShipEngineError) as ctx:
+                await shipengine.track_package_by_label_id("se-1")
+            return ctx.exception
+
+        err = asyncio.run(with_shipengine(test))
+        self.assertEqual(err.message, "Label not found.")
+
+    def test_reused_across_event_loops(self) -> None:
+        with StubServer() as server:
+            config = dict(stub_config(), base_uri=server.url, coalesce_requests=False)
+            shipengine = AsyncShipEngine(config)
+
+            async def list_carriers():
+                return await shipengine.list_carriers(), shipengine.client.transport._session
+
+            first, first_session = asyncio.run(list_carriers())
+            second, second_session = asyncio.run(list_carriers())
+            asyncio.run(shipengine.close())
+
+        self.assertEqual(first["carriers"], second["carriers"])
+        self.assertIsNot(first_session, second_session)
+        self.assertTrue(first_session.closed)
+        self.assertTrue(second_session.closed)
@@ -0,0 +1,170 @@
+"""Testing the batch workflow: creation, chunked adds, processing, polling and results."""
+
+import asyncio
+import json
+import unittest
+import urllib.parse as urlparse
+
+import responses
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from shipengine import AsyncShipEngine, ShipEngine
+from shipengine.batches import chunked, next_poll_interval
+from shipengine.enums import BaseURL
+from shipengine.errors import ClientTimeoutError, InvalidFieldValueError
+from tests.util import stub_config
+
+BASE_URI = BaseURL.SHIPENGINE_RPC_URL.value
+BATCHES_URL = urlparse.urljoin(BASE_URI, "v1/batches")
+BATCH_URL = f"{BATCHES_URL}/se-1"
+LABELS_URL = urlparse.urljoin(BASE_URI, "v1/labels")
+DOWNLOAD_URL = urlparse.urljoin(BASE_URI, "v1/downloads/10/batch-se-1.pdf")
+LABEL_FILE = b"%PDF-1.4" + b"x" * 200_000
+
+
+def batch(status: str, completed: int = 0) -> dict:
+    return {
+        "batch_id": "se-1",
+        "status": status,
+        "count": 5,
+        "completed": completed,
+        "errors": 0,
+        "label_download": {"pdf": DOWNLOAD_URL, "href": DOWNLOAD_URL},
+    }
+
+
+class TestBatchHelpers(unittest.TestCase):
+    def test_chunked(self) -> None:
+        self.assertEqual(list(chunked(iter("abcde"), 2)), [["a", "b"], ["c", "d"], ["e"]])
+        self.assertEqual(list(chunked(None, 2)), [])
+
+    def test_poll_interval_backs_off_without_progress(self) -> None:
+        idle = next_poll_interval(2, batch("processing"), batch("processing"), 1, 30)
+        busy = next_poll_interval(8, batch("processing", 3), batch("processing", 1), 1, 30)
+        capped = next_poll_interval(25, batch("queued"), batch("queued"), 1, 30)
+
+        self.assertEqual((idle, busy, capped), (3, 1, 30))
+
+
+class TestBatches(unittest.TestCase):
+    @responses.activate
+    def test_run_batch(self) -> None:
+        responses.add(responses.POST, BATCHES_URL, json=batch("open"))
+        responses.add(responses.POST, f"{BATCH_URL}/add", status=204)
+        responses.add(responses.POST, f"{BATCH_URL}/process/labels", status=204)
+        for status, completed in (("queued", 0), ("processing", 2), ("completed", 5)):
+            responses.add(responses.GET, BATCH_URL, json=batch(status, completed))
+
+        finished = ShipEngine(stub_config()).run_batch(
+            shipment_ids=(f"se-{n}" for n in range(5)),
+            process_params={"label_format": "pdf"},
+            chunk_size=2,
+            poll_interval=0.001,
+            external_batch_id="wave-42",
+        )
+
+        bodies = [json.loads(call.request.body or "null") for call in responses.calls]
+        self.assertEqual(finished["status"], "completed")
+        self.assertEqual(
+            bodies[0], {"external_batch_id": "wave-42", "shipment_ids": ["se-0", "se-1"]}
+        )
+        self.assertEqual(
+            bodies[1:3], [{"shipment_ids": ["se-2", "se-3"]}, {"shipment_ids": ["se-4"]}]
+        )
+        self.assertEqual(bodies[3], {"label_format": "pdf"})
+        self.assertEqual(len(responses.calls), 7)
+
+    @responses.activate
+    def test_run_batch_passes_max_poll_interval(self) -> None:
+        responses.add(responses.POST, BATCHES_URL, json=batch("open"))
+        responses.add(responses.POST, f"{BATCH_URL}/process/labels", status=204)
+        for _ in range(6):
+            responses.add(responses.GET, BATCH_URL, json=batch("processing"))
+        responses.add(responses.GET, BATCH_URL, json=batch("completed", 1))
+
+        # Backing off from 0.05s without progress would run past the timeout.
+        finished = ShipEngine(dict(stub_config(), coalesce_requests=False)).run_batch(
+            rate_ids=["se-7"], poll_interval=0.05, max_poll_interval=0.05, timeout=0.6
+        )
+
+        self.assertEqual(finished["status"], "completed")
+
+    @responses.activate
+    def test_wait_for_batch_times_out(self) -> None:
+        responses.add(responses.GET, BATCH_URL, json=batch("processing"))
+
+        with self.assertRaises(ClientTimeoutError):
+            ShipEngine(stub_config()).wait_for_batch("se-1", poll_interval=0.01, timeout=0.05)
+
+    @responses.activate
+    def test_results_are_streamed(self) -> None:
+        responses.add(responses.GET, LABELS_URL, json={"labels": [{"label_id": "se-9"}]})
+        responses.add(
+            responses.GET,
+            f"{BATCH_URL}/errors",
+            json={"errors": [{"shipment_id": "se-3", "error": "Invalid address."}]},
+        )
+        responses.add(responses.GET, DOWNLOAD_URL, body=LABEL_FILE, content_type="application/pdf")
+        shipengine = ShipEngine(stub_config())
+
+        labels = list(shipengine.iter_batch_labels("se-1"))
+        errors = list(shipengine.iter_batch_errors("se-1"))
+        chunks = list(shipengine.download_batch_labels(batch("completed", 5)))
+
+        self.assertEqual(labels, [{"label_id": "se-9"}])
+        self.assertIn("batch_id=se-1", responses.calls[0].request.url)
+        self.assertEqual(errors[0]["shipment_id"], "se-3")
+        self.assertIn("pagesize=", responses.calls[1].request.url)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks), LABEL_FILE)
+
+    def test_download_requires_a_processed_batch(self) -> None:
+        with self.assertRaises(InvalidFieldValueError):
+            ShipEngine(stub_config()).download_batch_labels({"batch_id": "se-1"})
+
+
+class TestAsyncBatches(unittest.TestCase):
+    def test_run_batch_and_download(self) -> None:
+        polls = []
+
+        async def create(request: web.Request) -> web.Response:
+            return web.json_response(batch("open"))
+
+        async def no_content(request: web.Request) -> web.Response:
+            return web.Response(status=204)
+
+        async def get(request: web.Request) -> web.Response:
+            polls.append(1)
+            return web.json_response(batch("completed" if len(polls) > 1 else "processing", 5))
+
+        async def download(request: web.Request) -> web.Response:
+            return web.Response(body=LABEL_FILE, content_type="application/pdf")
+
+        async def test():
+            app = web.Application()
+            app.router.add_post("/v1/batches", create)
+            app.router.add_post("/v1/batches/se-1/add", no_content)
+            app.router.add_post("/v1/batches/se-1/process/labels", no_content)
+            app.router.add_get("/v1/batches/se-1", get)
+            app.router.add_get("/v1/downloads/10/batch-se-1.pdf", download)
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                config = dict(stub_config(), base_uri=str(server.make_url("/")))
+                async with AsyncShipEngine(config) as shipengine:
+                    finished = await shipengine.run_batch(
+                        rate_ids=["se-7", "se-8", "se-9"], chunk_size=2, poll_interval=0.001
+                    )
+                    data = b"".join(
+                        [chunk async for chunk in shipengine.download_batch_labels(finished)]
+                    )
+                    return finished, data
+            finally:
+                await server.close()
+
+        finished, data = asyncio.run(test())
+
+        self.assertEqual(finished["status"], "completed")
+        self.assertEqual(len(polls), 2)
+        self.assertEqual(data, LABEL_FILE)
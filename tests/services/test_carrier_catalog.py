@@ -0,0 +1,103 @@
+"""Testing the cached, indexed carrier catalog built from list_carriers."""
+
+import time
+import unittest
+import urllib.parse as urlparse
+
+import responses
+
+from shipengine import ShipEngine
+from shipengine.carriers import CarrierCatalog
+from shipengine.enums import BaseURL, Endpoints
+from tests.util import stub_config
+
+CARRIERS_URL = urlparse.urljoin(BaseURL.SHIPENGINE_RPC_URL.value, Endpoints.LIST_CARRIERS.value)
+
+
+def carriers_response() -> dict:
+    return {
+        "carriers": [
+            {
+                "carrier_id": "se-656171",
+                "carrier_code": "stamps_com",
+                "services": [
+                    {
+                        "carrier_id": "se-656171",
+                        "carrier_code": "stamps_com",
+                        "service_code": "usps_priority_mail",
+                    },
+                ],
+                "packages": [{"package_code": "flat_rate_envelope", "name": "Flat Rate Envelope"}],
+            },
+            {
+                "carrier_id": "se-656172",
+                "carrier_code": "ups",
+                "services": [
+                    {
+                        "carrier_id": "se-656172",
+                        "carrier_code": "ups",
+                        "service_code": "ups_ground",
+                    },
+                ],
+                "packages": [{"package_code": "package", "name": "Package"}],
+            },
+            {
+                "carrier_id": "se-656173",
+                "carrier_code": "ups",
+                "services": [
+                    {
+                        "carrier_id": "se-656173",
+                        "carrier_code": "ups",
+                        "service_code": "ups_ground",
+                    },
+                ],
+                "packages": [{"package_code": "package", "name": "Package"}],
+            },
+        ],
+        "request_id": "1",
+    }
+
+
+class TestCarrierCatalog(unittest.TestCase):
+    def test_lookups(self) -> None:
+        catalog = CarrierCatalog(response=carriers_response(), ttl=60)
+
+        self.assertEqual(catalog.carrier("se-656171")["carrier_code"], "stamps_com")
+        self.assertIsNone(catalog.carrier("se-0"))
+        self.assertEqual(len(catalog.carriers_by_code("ups")), 2)
+        self.assertEqual(catalog.carrier_ids_for_service("ups_ground"), ["se-656172", "se-656173"])
+        self.assertEqual(
+            catalog.service("se-656171", "usps_priority_mail")["carrier_code"], "stamps_com"
+        )
+        self.assertIsNone(catalog.service("se-656171", "ups_ground"))
+        self.assertEqual(len(catalog.package_types("package")), 2)
+        self.assertEqual(catalog.services("fedex_ground"), [])
+
+    def test_expiry(self) -> None:
+        self.assertFalse(CarrierCatalog(response=carriers_response(), ttl=60).is_expired())
+        self.assertTrue(CarrierCatalog(response=carriers_response(), ttl=0).is_expired())
+
+    @responses.activate
+    def test_catalog_is_cached(self) -> None:
+        responses.add(responses.GET, CARRIERS_URL, json=carriers_response(), status=200)
+        shipengine = ShipEngine(stub_config())
+
+        first = shipengine.get_carrier_catalog()
+        second = shipengine.get_carrier_catalog()
+
+        self.assertIs(first, second)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_catalog_is_refreshed(self) -> None:
+        responses.add(responses.GET, CARRIERS_URL, json=carriers_response(), status=200)
+        shipengine = ShipEngine(dict(stub_config(), carrier_catalog_ttl=0.01))
+
+        first = shipengine.get_carrier_catalog()
+        time.sleep(0.02)
+        second = shipengine.get_carrier_catalog()
+        third = shipengine.get_carrier_catalog(refresh=True)
+
+        self.assertIsNot(first, second)
+        self.assertIsNot(second, third)
+        self.assertEqual(len(responses.calls), 3)
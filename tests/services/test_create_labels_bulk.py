@@ -0,0 +1,172 @@
+"""Testing bulk label creation with bounded concurrency."""
+
+import asyncio
+import json
+import re
+import threading
+import time
+import unittest
+import urllib.parse as urlparse
+
+import responses
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from shipengine import AsyncShipEngine, ShipEngine
+from shipengine.bulk import label_request
+from shipengine.enums import BaseURL
+from shipengine.errors import ClientSystemError, InvalidFieldValueError
+from tests.util import stub_config
+
+LABELS_URL = urlparse.urljoin(BaseURL.SHIPENGINE_RPC_URL.value, "v1/labels")
+RATE_LABEL_URL = re.compile(
+    re.escape(urlparse.urljoin(BaseURL.SHIPENGINE_RPC_URL.value, "v1/labels/rates/")) + ".*"
+)
+
+
+def stub_shipengine() -> ShipEngine:
+    return ShipEngine(dict(stub_config(retries=0), retry_policy=dict(backoff_base=0)))
+
+
+class TestLabelRequest(unittest.TestCase):
+    def test_inputs(self) -> None:
+        self.assertEqual(label_request("se-1"), ("v1/labels/rates/se-1", {}, None))
+        self.assertEqual(
+            label_request({"rate_id": "se-1", "label_format": "pdf"}),
+            ("v1/labels/rates/se-1", {"label_format": "pdf"}, None),
+        )
+        self.assertEqual(label_request({"shipment": {}}), ("v1/labels", {"shipment": {}}, None))
+        self.assertEqual(
+            label_request({"shipment": {}, "idempotency_key": "order-1"}),
+            ("v1/labels", {"shipment": {}}, "order-1"),
+        )
+
+
+class TestCreateLabelsBulk(unittest.TestCase):
+    def test_invalid_concurrency(self) -> None:
+        with self.assertRaises(InvalidFieldValueError):
+            stub_shipengine().create_labels_bulk([], concurrency=0)
+
+    @responses.activate
+    def test_failures_do_not_abort_the_batch(self) -> None:
+        def callback(request):
+            shipment = json.loads(request.body)["shipment"]
+            if shipment["fail"]:
+                return 500, {}, json.dumps({"request_id": "1"})
+            return 200, {}, json.dumps({"label_id": f"se-{shipment['n']}"})
+
+        responses.add_callback(responses.POST, LABELS_URL, callback=callback)
+        responses.add(responses.POST, RATE_LABEL_URL, json={"label_id": "se-rate"})
+        requests = [{"shipment": {"n": n, "fail": n == 2}} for n in range(5)] + ["se-9"]
+
+        results = sorted(stub_shipengine().create_labels_bulk(requests), key=lambda r: r.index)
+
+        self.assertEqual([r.index for r in results], list(range(6)))
+        self.assertEqual([r.ok for r in results], [True, True, False, True, True, True])
+        self.assertIsInstance(results[2].error, ClientSystemError)
+        self.assertEqual(results[4].label, {"label_id": "se-4"})
+        self.assertEqual(results[5].label, {"label_id": "se-rate"})
+        self.assertEqual(len({r.idempotency_key for r in results}), 6)
+
+    @responses.activate
+    def test_only_caller_keys_are_retried(self) -> None:
+        responses.add(responses.POST, RATE_LABEL_URL, status=503, json={"request_id": "1"})
+        responses.add(responses.POST, RATE_LABEL_URL, json={"label_id": "se-rate"})
+        shipengine = ShipEngine(dict(stub_config(retries=1), retry_policy=dict(backoff_base=0)))
+
+        (generated,) = shipengine.create_labels_bulk(["se-1"])
+        self.assertIsInstance(generated.error, ClientSystemError)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertIsNotNone(generated.idempotency_key)
+        self.assertNotIn(generated.idempotency_key, shipengine.idempotency_ledger)
+
+        responses.replace(responses.POST, RATE_LABEL_URL, status=503, json={"request_id": "2"})
+        responses.add(responses.POST, RATE_LABEL_URL, json={"label_id": "se-rate"})
+        (chosen,) = shipengine.create_labels_bulk([{"rate_id": "se-1", "idempotency_key": "o-1"}])
+        self.assertEqual(chosen.label, {"label_id": "se-rate"})
+        self.assertEqual(chosen.idempotency_key, "o-1")
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(responses.calls[2].request.headers["Idempotency-Key"], "o-1")
+        self.assertNotIn("idempotency_key", json.loads(responses.calls[2].request.body or "{}"))
+
+    @responses.activate
+    def test_malformed_inputs_do_not_abort_the_batch(self) -> None:
+        responses.add(responses.POST, RATE_LABEL_URL, json={"label_id": "se-rate"})
+
+        results = sorted(
+            stub_shipengine().create_labels_bulk(["se-1", 42, None, "se-2"]),
+            key=lambda r: r.index,
+        )
+
+        self.assertEqual([r.ok for r in results], [True, False, False, True])
+        self.assertIsInstance(results[1].error, TypeError)
+        self.assertIsInstance(results[2].error, TypeError)
+        self.assertEqual(results[3].label, {"label_id": "se-rate"})
+
+    @responses.activate
+    def test_concurrency_is_bounded_and_input_is_lazy(self) -> None:
+        lock = threading.Lock()
+        active = [0, 0]  # current, peak
+
+        def callback(request):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return 200, {}, json.dumps({"label_id": "se-1"})
+
+        responses.add_callback(responses.POST, LABELS_URL, callback=callback)
+        consumed = []
+
+        def shipments():
+            for n in range(20):
+                consumed.append(n)
+                yield {"shipment": {"n": n}}
+
+        results = stub_shipengine().create_labels_bulk(shipments(), concurrency=3)
+        next(results)
+        self.assertLessEqual(len(consumed), 4)
+
+        rest = list(results)
+        self.assertEqual(len(rest), 19)
+        self.assertLessEqual(active[1], 3)
+
+
+class TestAsyncCreateLabelsBulk(unittest.TestCase):
+    def test_results_are_streamed(self) -> None:
+        async def create_label(request: web.Request) -> web.Response:
+            shipment = (await request.json())["shipment"]
+            await asyncio.sleep(0.05 * (5 - shipment["n"]))
+            if shipment["n"] == 1:
+                return web.json_response({"request_id": "1"}, status=500)
+            return web.json_response({"label_id": f"se-{shipment['n']}"})
+
+        async def test():
+            app = web.Application()
+            app.router.add_post("/v1/labels", create_label)
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                config = dict(stub_config(retries=0), base_uri=str(server.make_url("/")))
+                async with AsyncShipEngine(config) as shipengine:
+                    requests = [{"shipment": {"n": n}} for n in range(5)]
+                    return [r async for r in shipengine.create_labels_bulk(requests, 5)]
+            finally:
+                await server.close()
+
+        results = asyncio.run(test())
+
+        self.assertEqual([r.index for r in results], [4, 3, 2, 1, 0])
+        self.assertEqual([r.ok for r in results], [True, True, True, False, True])
+
+    def test_malformed_inputs_do_not_abort_the_stream(self) -> None:
+        async def test():
+            async with AsyncShipEngine(stub_config(retries=0)) as shipengine:
+                return [r async for r in shipengine.create_labels_bulk([42, None])]
+
+        results = asyncio.run(test())
+
+        self.assertEqual(sorted(r.index for r in results), [0, 1])
+        self.assertTrue(all(isinstance(r.error, TypeError) for r in results))
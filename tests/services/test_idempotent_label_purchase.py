@@ -0,0 +1,159 @@
+"""Testing idempotency keys and the ledger used by the label purchase methods."""
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+import urllib.parse as urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+import responses
+
+from shipengine import AsyncShipEngine, ShipEngine
+from shipengine.enums import BaseURL
+from shipengine.errors import ClientSystemError
+from shipengine.idempotency import IdempotencyLedger
+from shipengine.testing import StubResponse, StubTransport
+from tests.util import stub_config
+
+LABELS_URL = urlparse.urljoin(BaseURL.SHIPENGINE_RPC_URL.value, "v1/labels")
+RATE_LABEL_URL = urlparse.urljoin(BaseURL.SHIPENGINE_RPC_URL.value, "v1/labels/rates/se-1")
+
+
+def stub_shipengine(retries: int = 2) -> ShipEngine:
+    return ShipEngine(dict(stub_config(retries=retries), retry_policy=dict(backoff_base=0)))
+
+
+class TestIdempotentLabelPurchase(unittest.TestCase):
+    @responses.activate
+    def test_idempotency_key_header_is_sent(self) -> None:
+        responses.add(responses.POST, LABELS_URL, json={"label_id": "se-1"}, status=200)
+
+        stub_shipengine().create_label_from_shipment({"shipment": {}}, idempotency_key="order-1")
+
+        self.assertEqual(responses.calls[0].request.headers["Idempotency-Key"], "order-1")
+
+    @responses.activate
+    def test_generated_key_purchase_is_sent_once(self) -> None:
+        responses.add(responses.POST, LABELS_URL, json={"request_id": "1"}, status=500)
+        responses.add(responses.POST, LABELS_URL, json={"label_id": "se-1"}, status=200)
+
+        with self.assertRaises(ClientSystemError):
+            stub_shipengine().create_label_from_shipment({"shipment": {}})
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertIn("Idempotency-Key", responses.calls[0].request.headers)
+
+    @responses.activate
+    def test_caller_key_is_reused_across_retries(self) -> None:
+        responses.add(responses.POST, LABELS_URL, json={"request_id": "1"}, status=503)
+        responses.add(responses.POST, LABELS_URL, json={"label_id": "se-1"}, status=200)
+
+        label = stub_shipengine().create_label_from_shipment(
+            {"shipment": {}}, idempotency_key="order-1"
+        )
+
+        keys = [call.request.headers["Idempotency-Key"] for call in responses.calls]
+        self.assertEqual(label, {"label_id": "se-1"})
+        self.assertEqual(keys, ["order-1", "order-1"])
+
+    @responses.activate
+    def test_generated_key_is_reused_when_retrying_non_idempotent(self) -> None:
+        responses.add(responses.POST, LABELS_URL, json={"request_id": "1"}, status=503)
+        responses.add(responses.POST, LABELS_URL, json={"label_id": "se-1"}, status=200)
+        shipengine = ShipEngine(
+            dict(
+                stub_config(retries=2), retry_policy=dict(backoff_base=0, retry_non_idempotent=True)
+            )
+        )
+
+        label = shipengine.create_label_from_shipment({"shipment": {}})
+
+        keys = [call.request.headers["Idempotency-Key"] for call in responses.calls]
+        self.assertEqual(label, {"label_id": "se-1"})
+        self.assertEqual(len(keys), 2)
+        self.assertEqual(keys[0], keys[1])
+
+    @responses.activate
+    def test_replayed_key_is_answered_from_ledger(self) -> None:
+        responses.add(responses.POST, RATE_LABEL_URL, json={"label_id": "se-1"}, status=200)
+        shipengine = stub_shipengine()
+
+        first = shipengine.create_label_from_rate_id("se-1", {}, idempotency_key="order-1")
+        second = shipengine.create_label_from_rate_id("se-1", {}, idempotency_key="order-1")
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_concurrent_purchases_with_one_key_buy_once(self) -> None:
+        sent, release = threading.Event(), threading.Event()
+
+        def callback(request):
+            sent.set()
+            release.wait(5)
+            return 200, {}, json.dumps({"label_id": "se-1"})
+
+        responses.add_callback(responses.POST, LABELS_URL, callback=callback)
+        shipengine = stub_shipengine()
+        purchase = shipengine.create_label_from_shipment
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(purchase, {"shipment": {}}, idempotency_key="order-1")
+            sent.wait(5)
+            second = pool.submit(purchase, {"shipment": {}}, idempotency_key="order-1")
+            time.sleep(0.05)  # The second purchase starts while the first is in flight.
+            release.set()
+            labels = [first.result(), second.result()]
+
+        self.assertEqual(labels, [{"label_id": "se-1"}, {"label_id": "se-1"}])
+        self.assertIsNot(labels[0], labels[1])
+        self.assertEqual(len(responses.calls), 1)
+
+    def test_concurrent_async_purchases_with_one_key_buy_once(self) -> None:
+        transport = StubTransport(latency=0.05)
+        transport.add("POST v1/labels", StubResponse({"label_id": "se-1"}))
+
+        async def test():
+            async with AsyncShipEngine(dict(stub_config(), transport=transport)) as shipengine:
+                purchases = [
+                    shipengine.create_label_from_shipment({"shipment": {}}, idempotency_key="o-1")
+                    for _ in range(3)
+                ]
+                return await asyncio.gather(*purchases)
+
+        self.assertEqual(asyncio.run(test()), [{"label_id": "se-1"}] * 3)
+        self.assertEqual(transport.calls, {"POST v1/labels": 1})
+
+    @responses.activate
+    def test_failed_purchase_is_not_recorded(self) -> None:
+        responses.add(responses.POST, LABELS_URL, json={"request_id": "1"}, status=500)
+        shipengine = stub_shipengine(retries=0)
+
+        with self.assertRaises(ClientSystemError):
+            shipengine.create_label_from_shipment({"shipment": {}}, idempotency_key="order-1")
+
+        self.assertNotIn("order-1", shipengine.idempotency_ledger)
+
+
+class TestIdempotencyLedger(unittest.TestCase):
+    def test_least_recently_used_keys_are_evicted(self) -> None:
+        ledger = IdempotencyLedger(max_entries=2)
+        ledger.record("a", {"label_id": "a"})
+        ledger.record("b", {"label_id": "b"})
+        ledger.get("a")
+        ledger.record("c", {"label_id": "c"})
+
+        self.assertIn("a", ledger)
+        self.assertNotIn("b", ledger)
+        self.assertEqual(len(ledger), 2)
+
+    def test_recorded_labels_are_copies(self) -> None:
+        ledger = IdempotencyLedger()
+        label = {"label_id": "a", "tags": []}
+        ledger.record("a", label)
+        label["tags"].append("changed")
+        ledger.get("a")["tags"].append("changed")
+
+        self.assertEqual(ledger.get("a"), {"label_id": "a", "tags": []})
@@ -0,0 +1,150 @@
+"""Testing the lazy, prefetching iterators over paginated list endpoints."""
+
+import asyncio
+import json
+import time
+import unittest
+import urllib.parse as urlparse
+
+import responses
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from shipengine import AsyncShipEngine, ShipEngine
+from shipengine.enums import BaseURL, Endpoints
+from shipengine.pagination import next_page_endpoint
+from tests.util import stub_config
+
+BASE_URI = BaseURL.SHIPENGINE_RPC_URL.value
+TOTAL = 7
+
+
+def labels_page(resource: str, key: str, query: dict) -> dict:
+    """A page of `TOTAL` fake items, linking to the next page on another host."""
+    page, page_size = int(query["page"]), int(query["page_size"])
+    pages = -(-TOTAL // page_size)
+    start = (page - 1) * page_size
+    items = [{"id": i, "status": query.get("label_status")} for i in range(start, TOTAL)]
+    links = {"next": None}
+    if page < pages:
+        next_query = dict(query, page=page + 1)
+        links["next"] = {
+            "href": f"https://other.example.com/{resource}?{urlparse.urlencode(next_query)}"
+        }
+    return {key: items[:page_size], "total": TOTAL, "page": page, "pages": pages, "links": links}
+
+
+def callback(resource: str, key: str):
+    def handle(request):
+        query = dict(urlparse.parse_qsl(urlparse.urlsplit(request.url).query))
+        return 200, {}, json.dumps(labels_page(resource, key, query))
+
+    return handle
+
+
+class TestNextPageEndpoint(unittest.TestCase):
+    def test_last_page(self) -> None:
+        page = {"page": 2, "pages": 2, "links": {"next": {"href": "https://x/v1/labels?page=3"}}}
+        self.assertIsNone(next_page_endpoint(page, "v1/labels?page=2"))
+
+    def test_next_link_keeps_path_and_query(self) -> None:
+        page = {"page": 1, "pages": 2, "links": {"next": {"href": "https://x/v1/labels?page=2"}}}
+        self.assertEqual(next_page_endpoint(page, "v1/labels?page=1"), "v1/labels?page=2")
+
+    def test_missing_link(self) -> None:
+        self.assertIsNone(next_page_endpoint({"labels": []}, "v1/labels?page=1"))
+
+    def test_missing_link_before_the_last_page(self) -> None:
+        endpoint = "v1/labels?label_status=completed&page=2&page_size=50"
+        for links in (dict(), {"next": None}, {"next": {"href": None}}):
+            page = {"page": 2, "pages": 3, "links": links}
+            self.assertEqual(
+                next_page_endpoint(page, endpoint),
+                "v1/labels?label_status=completed&page_size=50&page=3",
+            )
+
+
+class TestIterLabels(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock = responses.RequestsMock(assert_all_requests_are_fired=False)
+        self.mock.start()
+        for resource, key in (("v1/labels", "labels"), ("v1/shipments", "shipments")):
+            self.mock.add_callback(
+                responses.GET,
+                urlparse.urljoin(BASE_URI, resource),
+                callback=callback(resource, key),
+            )
+
+    def tearDown(self) -> None:
+        self.mock.stop()
+        self.mock.reset()
+
+    def test_iterates_every_page_with_page_size(self) -> None:
+        shipengine = ShipEngine(dict(stub_config(), page_size=3))
+
+        labels = list(shipengine.iter_labels(label_status="completed"))
+
+        self.assertEqual([label["id"] for label in labels], list(range(TOTAL)))
+        self.assertTrue(all(label["status"] == "completed" for label in labels))
+        self.assertEqual(len(self.mock.calls), 3)
+        self.assertIn("page_size=3", self.mock.calls[0].request.url)
+
+    def test_pages_without_next_links_are_followed(self) -> None:
+        def handle(request):
+            query = dict(urlparse.parse_qsl(urlparse.urlsplit(request.url).query))
+            page = labels_page("v1/labels", "labels", query)
+            del page["links"]
+            return 200, {}, json.dumps(page)
+
+        self.mock.reset()
+        self.mock.add_callback(responses.GET, urlparse.urljoin(BASE_URI, "v1/labels"), handle)
+        shipengine = ShipEngine(dict(stub_config(), page_size=3))
+
+        labels = list(shipengine.iter_labels(label_status="completed"))
+
+        self.assertEqual([label["id"] for label in labels], list(range(TOTAL)))
+        self.assertTrue(all(label["status"] == "completed" for label in labels))
+
+    def test_next_page_is_prefetched(self) -> None:
+        shipengine = ShipEngine(dict(stub_config(), page_size=3))
+        labels = shipengine.iter_labels()
+
+        next(labels)
+        deadline = time.monotonic() + 2
+        while len(self.mock.calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(len(self.mock.calls), 2)
+        labels.close()
+
+    def test_iter_shipments(self) -> None:
+        shipengine = ShipEngine(dict(stub_config(), page_size=5))
+
+        shipments = list(shipengine.iter_shipments())
+
+        self.assertEqual(len(shipments), TOTAL)
+        self.assertTrue(
+            self.mock.calls[0].request.url.startswith(
+                urlparse.urljoin(BASE_URI, Endpoints.LIST_SHIPMENTS.value)
+            )
+        )
+
+
+class TestAsyncIterLabels(unittest.TestCase):
+    def test_iterates_every_page(self) -> None:
+        async def list_labels(request: web.Request) -> web.Response:
+            return web.json_response(labels_page("v1/labels", "labels", dict(request.query)))
+
+        async def test():
+            app = web.Application()
+            app.router.add_get("/v1/labels", list_labels)
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                config = dict(stub_config(), base_uri=str(server.make_url("/")), page_size=2)
+                async with AsyncShipEngine(config) as shipengine:
+                    return [label["id"] async for label in shipengine.iter_labels()]
+            finally:
+                await server.close()
+
+        self.assertEqual(asyncio.run(test()), list(range(TOTAL)))
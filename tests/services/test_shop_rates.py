@@ -0,0 +1,232 @@
+"""Testing concurrent, multi-carrier rate shopping."""
+
+import asyncio
+import json
+import re
+import threading
+import time
+import unittest
+import urllib.parse as urlparse
+
+import responses
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from shipengine import AsyncShipEngine, ShipEngine
+from shipengine.enums import BaseURL, Endpoints, RateShoppingStrategy
+from shipengine.errors import InvalidFieldValueError
+from shipengine.rate_shopping import RateShoppingResult, split_by_carrier
+from tests.util import stub_config
+
+RATES_URL = urlparse.urljoin(
+    BaseURL.SHIPENGINE_RPC_URL.value, Endpoints.GET_RATE_FROM_SHIPMENT.value
+)
+
+SHIPMENT = {
+    "rate_options": {"carrier_ids": ["se-1", "se-2"], "calculate_tax_amount": False},
+    "shipment": {"ship_to": {"postal_code": "95128"}, "packages": [{"weight": {"value": 1}}]},
+}
+
+# carrier_id: (shipping amount, delivery days)
+CARRIERS = {"se-cheap": (5.0, 6), "se-fast": (20.0, 1), "se-value": (9.0, 3)}
+
+
+def rate(carrier_id: str, amount: float, days: int, **kwargs) -> dict:
+    return dict(
+        {
+            "rate_id": f"{carrier_id}-{days}",
+            "carrier_id": carrier_id,
+            "shipping_amount": {"currency": "usd", "amount": amount},
+            "insurance_amount": {"currency": "usd", "amount": 0.0},
+            "confirmation_amount": {"currency": "usd", "amount": 0.0},
+            "other_amount": {"currency": "usd", "amount": 0.0},
+            "delivery_days": days,
+            "validation_status": "valid",
+            "error_messages": [],
+        },
+        **kwargs,
+    )
+
+
+def rates_response(carrier_id: str) -> dict:
+    amount, days = CARRIERS[carrier_id]
+    return {"rate_response": {"rates": [rate(carrier_id, amount, days)], "invalid_rates": []}}
+
+
+def result(strategy: str, max_delivery_days=None) -> RateShoppingResult:
+    return RateShoppingResult(
+        {carrier_id: rates_response(carrier_id) for carrier_id in CARRIERS},
+        errors=dict(),
+        timed_out=list(),
+        strategy=RateShoppingStrategy(strategy),
+        max_delivery_days=max_delivery_days,
+    )
+
+
+class TestRateShoppingResult(unittest.TestCase):
+    def test_cheapest(self) -> None:
+        self.assertEqual(
+            [r["carrier_id"] for r in result("cheapest").rates], ["se-cheap", "se-value", "se-fast"]
+        )
+
+    def test_fastest(self) -> None:
+        self.assertEqual(
+            [r["carrier_id"] for r in result("fastest").rates], ["se-fast", "se-value", "se-cheap"]
+        )
+
+    def test_best_value(self) -> None:
+        self.assertEqual(result("best_value", max_delivery_days=3).best["carrier_id"], "se-value")
+        self.assertEqual(result("best_value", max_delivery_days=7).best["carrier_id"], "se-cheap")
+
+    def test_invalid_rates_are_not_ranked(self) -> None:
+        response = {
+            "rate_response": {
+                "rates": [rate("se-1", 1.0, 1, validation_status="invalid"), rate("se-1", 2.0, 2)],
+                "invalid_rates": [rate("se-1", 0.5, 1)],
+            }
+        }
+        shopped = RateShoppingResult({"se-1": response}, {}, [], RateShoppingStrategy.CHEAPEST)
+
+        self.assertEqual(len(shopped.rates), 1)
+        self.assertEqual(len(shopped.invalid_rates), 2)
+
+
+class TestShopRates(unittest.TestCase):
+    def test_split_by_carrier_keeps_rate_options(self) -> None:
+        requests = split_by_carrier(SHIPMENT)
+
+        self.assertEqual(list(requests), ["se-1", "se-2"])
+        self.assertEqual(
+            requests["se-2"]["rate_options"],
+            {"carrier_ids": ["se-2"], "calculate_tax_amount": False},
+        )
+        self.assertEqual(SHIPMENT["rate_options"]["carrier_ids"], ["se-1", "se-2"])
+
+    def test_best_value_requires_max_delivery_days(self) -> None:
+        with self.assertRaises(InvalidFieldValueError):
+            ShipEngine(stub_config()).shop_rates(SHIPMENT, strategy="best_value")
+
+    def test_unknown_strategy(self) -> None:
+        with self.assertRaises(InvalidFieldValueError):
+            ShipEngine(stub_config()).shop_rates(SHIPMENT, strategy="cheapest_ever")
+
+    @responses.activate
+    def test_slow_and_failing_carriers_are_dropped(self) -> None:
+        def callback(request):
+            carrier_id = json.loads(request.body)["rate_options"]["carrier_ids"][0]
+            if carrier_id == "se-slow":
+                time.sleep(0.5)
+                return 200, {}, json.dumps(rates_response("se-fast"))
+            if carrier_id == "se-broken":
+                error = {
+                    "message": "Invalid carrier.",
+                    "error_source": "shipengine",
+                    "error_type": "validation",
+                    "error_code": "invalid_identifier",
+                }
+                body = {"request_id": "1", "errors": [error]}
+                return 400, {}, json.dumps(body)
+            return 200, {}, json.dumps(rates_response(carrier_id))
+
+        responses.add_callback(responses.POST, RATES_URL, callback=callback)
+        shipengine = ShipEngine(stub_config())
+
+        shopped = shipengine.shop_rates(
+            SHIPMENT,
+            carrier_ids=["se-cheap", "se-slow", "se-broken", "se-value"],
+            carrier_timeout=0.2,
+        )
+        shipengine.close()
+
+        self.assertEqual([r["carrier_id"] for r in shopped.rates], ["se-cheap", "se-value"])
+        self.assertEqual(shopped.timed_out, ["se-slow"])
+        self.assertEqual(list(shopped.errors), ["se-broken"])
+
+    @responses.activate
+    def test_carriers_do_not_queue_behind_submitted_work(self) -> None:
+        def track(request):
+            time.sleep(0.5)
+            return 200, {}, json.dumps({"status_code": "DE"})
+
+        responses.add_callback(responses.GET, re.compile(".*/track"), callback=track)
+        responses.add_callback(
+            responses.POST,
+            RATES_URL,
+            callback=lambda request: (
+                200,
+                {},
+                json.dumps(
+                    rates_response(json.loads(request.body)["rate_options"]["carrier_ids"][0])
+                ),
+            ),
+        )
+        shipengine = ShipEngine(dict(stub_config(), max_concurrency=1))
+
+        busy = [shipengine.submit("track_package_by_label_id", f"se-{n}") for n in range(2)]
+        shopped = shipengine.shop_rates(
+            SHIPMENT, carrier_ids=["se-cheap", "se-value"], carrier_timeout=0.3
+        )
+        for future in busy:
+            future.result()
+        shipengine.close()
+
+        self.assertEqual(shopped.timed_out, [])
+        self.assertEqual([r["carrier_id"] for r in shopped.rates], ["se-cheap", "se-value"])
+
+    @responses.activate
+    def test_carriers_share_a_bounded_pool(self) -> None:
+        threads = set()
+
+        def callback(request):
+            threads.add(threading.current_thread())
+            time.sleep(0.05)
+            carrier_id = json.loads(request.body)["rate_options"]["carrier_ids"][0]
+            return 200, {}, json.dumps(rates_response(carrier_id))
+
+        responses.add_callback(responses.POST, RATES_URL, callback=callback)
+        with ShipEngine(dict(stub_config(), max_concurrency=2)) as shipengine:
+            for _ in range(3):
+                shopped = shipengine.shop_rates(SHIPMENT, carrier_ids=list(CARRIERS))
+                self.assertEqual(len(shopped.rates), len(CARRIERS))
+
+        self.assertLessEqual(len(threads), 2)
+        self.assertTrue(all(thread.name.startswith("shipengine-rates") for thread in threads))
+
+
+class TestAsyncShopRates(unittest.TestCase):
+    def test_slow_carriers_are_dropped(self) -> None:
+        async def rates(request: web.Request) -> web.Response:
+            carrier_id = (await request.json())["rate_options"]["carrier_ids"][0]
+            if carrier_id == "se-slow":
+                await asyncio.sleep(0.5)
+                carrier_id = "se-fast"
+            return web.json_response(rates_response(carrier_id))
+
+        async def test():
+            app = web.Application()
+            app.router.add_post("/v1/rates", rates)
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                config = dict(stub_config(), base_uri=str(server.make_url("/")))
+                async with AsyncShipEngine(config) as shipengine:
+                    shopped = await shipengine.shop_rates(
+                        SHIPMENT,
+                        carrier_ids=["se-slow", "se-fast", "se-value"],
+                        strategy="fastest",
+                        carrier_timeout=0.2,
+                    )
+                    pending = [
+                        task
+                        for task in asyncio.all_tasks()
+                        if "_cached_rates" in task.get_coro().__qualname__
+                    ]
+                    return shopped, pending
+            finally:
+                await server.close()
+
+        shopped, pending = asyncio.run(test())
+
+        self.assertEqual(shopped.best["carrier_id"], "se-fast")
+        self.assertEqual(shopped.timed_out, ["se-slow"])
+        self.assertEqual(pending, [])
@@ -0,0 +1,133 @@
+"""Testing the ShipEngine.submit and ShipEngine.map concurrency helpers."""
+
+import json
+import os
+import re
+import threading
+import unittest
+import urllib.parse as urlparse
+from concurrent.futures import Future
+
+import responses
+
+from shipengine import ShipEngine
+from shipengine.errors import InvalidFieldValueError, ShipEngineError
+from tests.util import stub_config
+
+
+def tracking_callback(request):
+    query = urlparse.parse_qs(urlparse.urlparse(request.url).query)
+    tracking_number = query["tracking_number"][0]
+    if tracking_number == "bad":
+        body = {
+            "request_id": "1",
+            "errors": [
+                {
+                    "message": "Invalid tracking number.",
+                    "error_type": "validation",
+                    "error_code": "invalid_identifier",
+                }
+            ],
+        }
+        return 400, {}, json.dumps(body)
+    body = {
+        "tracking_number": tracking_number,
+        "carrier_code": query["carrier_code"][0],
+        "thread": threading.current_thread().name,
+    }
+    return 200, {}, json.dumps(body)
+
+
+def stub_tracking_endpoint() -> None:
+    responses.add_callback(
+        responses.GET,
+        re.compile(r"https://api\.shipengine\.com/v1/tracking\?.*"),
+        callback=tracking_callback,
+        content_type="application/json",
+    )
+
+
+class TestSubmitAndMap(unittest.TestCase):
+    @responses.activate
+    def test_submit_returns_future(self) -> None:
+        stub_tracking_endpoint()
+        with ShipEngine(stub_config()) as shipengine:
+            future = shipengine.submit(
+                "track_package_by_carrier_code_and_tracking_number", "ups", "1Z1"
+            )
+            self.assertIsInstance(future, Future)
+            result = future.result(timeout=5)
+
+        self.assertEqual(result["tracking_number"], "1Z1")
+        self.assertTrue(result["thread"].startswith("shipengine"))
+
+    @responses.activate
+    def test_map_preserves_input_order(self) -> None:
+        stub_tracking_endpoint()
+        tracking_numbers = [f"1Z{i}" for i in range(50)]
+        with ShipEngine(dict(stub_config(), max_concurrency=4)) as shipengine:
+            results = list(
+                shipengine.map(
+                    "track_package_by_carrier_code_and_tracking_number",
+                    ["ups"] * len(tracking_numbers),
+                    tracking_numbers,
+                )
+            )
+
+        self.assertEqual([r["tracking_number"] for r in results], tracking_numbers)
+        self.assertLessEqual(len({r["thread"] for r in results}), 4)
+
+    @responses.activate
+    def test_map_return_exceptions(self) -> None:
+        stub_tracking_endpoint()
+        with ShipEngine(stub_config()) as shipengine:
+            results = list(
+                shipengine.map(
+                    "track_package_by_carrier_code_and_tracking_number",
+                    ["ups", "ups", "ups"],
+                    ["1Z1", "bad", "1Z3"],
+                    return_exceptions=True,
+                )
+            )
+
+        self.assertEqual(results[0]["tracking_number"], "1Z1")
+        self.assertIsInstance(results[1], ShipEngineError)
+        self.assertEqual(results[2]["tracking_number"], "1Z3")
+
+    @responses.activate
+    def test_map_raises_first_error(self) -> None:
+        stub_tracking_endpoint()
+        with ShipEngine(stub_config()) as shipengine:
+            with self.assertRaises(ShipEngineError):
+                list(
+                    shipengine.map(
+                        "track_package_by_carrier_code_and_tracking_number",
+                        ["ups", "ups"],
+                        ["bad", "1Z2"],
+                    )
+                )
+
+    def test_submit_rejects_unknown_method(self) -> None:
+        shipengine = ShipEngine(stub_config())
+        for method_name in ("not_a_method", "close", "_resolve_method", "config"):
+            with self.assertRaises(InvalidFieldValueError):
+                shipengine.submit(method_name)
+
+    def test_map_rejects_unknown_method_eagerly(self) -> None:
+        shipengine = ShipEngine(stub_config())
+        with self.assertRaises(InvalidFieldValueError):
+            shipengine.map("not_a_method", ["ups"])
+
+    @responses.activate
+    def test_executor_is_recreated_after_fork(self) -> None:
+        stub_tracking_endpoint()
+        with ShipEngine(stub_config()) as shipengine:
+            inherited = shipengine._get_executor()
+            shipengine._executor_pid = os.getpid() + 1  # Simulate being the child of a fork().
+            future = shipengine.submit(
+                "track_package_by_carrier_code_and_tracking_number", "ups", "1Z1"
+            )
+            self.assertIsNot(shipengine._executors["shipengine"], inherited)
+            self.assertEqual(shipengine._executor_pid, os.getpid())
+            self.assertIn("tracking_number", future.result())
+            inherited.shutdown(wait=True)
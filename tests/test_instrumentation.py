@@ -0,0 +1,153 @@
+"""Testing the request instrumentation hooks and the metrics aggregator."""
+
+import asyncio
+import unittest
+import urllib.parse as urlparse
+
+import responses
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from shipengine import AsyncShipEngine, ShipEngine
+from shipengine.enums import BaseURL
+from shipengine.errors import InvalidFieldValueError
+from shipengine.instrumentation import Instrumentation, endpoint_template
+from shipengine.metrics import Histogram, MetricsAggregator
+from tests.util import stub_config
+
+TRACK_URL = urlparse.urljoin(BaseURL.SHIPENGINE_RPC_URL.value, "v1/labels/se-1/track")
+
+
+class Recorder(Instrumentation):
+    def __init__(self) -> None:
+        self.calls = []
+
+    def on_request_start(self, event) -> None:
+        self.calls.append(("start", event.attempt))
+
+    def on_request_end(self, event) -> None:
+        self.calls.append(("end", event.attempt, event.status_code))
+        self.last = event
+
+    def on_request_retry(self, event) -> None:
+        self.calls.append(("retry", event.attempt, event.retry_delay))
+
+
+class Broken(Instrumentation):
+    def on_request_end(self, event) -> None:
+        raise RuntimeError("Broken hook.")
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_endpoint_template(self) -> None:
+        self.assertEqual(endpoint_template("v1/labels/se-28529731/track"), "v1/labels/{id}/track")
+        self.assertEqual(endpoint_template("v1/tracking?carrier_code=ups"), "v1/tracking")
+        self.assertEqual(
+            endpoint_template("https://api.shipengine.com/v1/batches/se-1/labels?page=2"),
+            "v1/batches/{id}/labels",
+        )
+        self.assertEqual(endpoint_template("v1/carriers"), "v1/carriers")
+
+    def test_invalid_instrumentation(self) -> None:
+        with self.assertRaises(InvalidFieldValueError):
+            ShipEngine(dict(stub_config(), instrumentation=[object()]))
+
+    @responses.activate
+    def test_retry_events(self) -> None:
+        responses.add(
+            responses.GET,
+            TRACK_URL,
+            json={"request_id": "1", "errors": []},
+            status=429,
+            headers={"Retry-After": "0"},
+        )
+        responses.add(
+            responses.GET,
+            TRACK_URL,
+            json={"status_code": "DE"},
+            headers={"X-Rate-Limit-Remaining": "199"},
+        )
+        recorder, metrics = Recorder(), MetricsAggregator()
+        config = dict(
+            stub_config(),
+            api_key="TEST_instrumented",
+            instrumentation=[Broken(), recorder, metrics],
+        )
+
+        ShipEngine(config).track_package_by_label_id("se-1")
+
+        self.assertEqual(
+            recorder.calls,
+            [("start", 0), ("end", 0, 429), ("retry", 0, 0), ("start", 1), ("end", 1, 200)],
+        )
+        event = recorder.last
+        self.assertEqual((event.http_method, event.endpoint), ("GET", "v1/labels/{id}/track"))
+        self.assertEqual(event.bytes_sent, 0)
+        self.assertEqual(event.bytes_received, len(b'{"status_code": "DE"}'))
+        self.assertEqual(event.rate_limit, {"X-Rate-Limit-Remaining": "199"})
+        self.assertAlmostEqual(event.duration, event.network_time + event.sdk_time)
+
+        stats = metrics.snapshot()["GET v1/labels/{id}/track"]
+        self.assertEqual(stats["statuses"], {"429": 1, "200": 1})
+        self.assertEqual((stats["requests"], stats["errors"], stats["retries"]), (2, 1, 1))
+        self.assertEqual(metrics.slowest()[0][0], "GET v1/labels/{id}/track")
+
+    def test_async_events(self) -> None:
+        async def label(request: web.Request) -> web.Response:
+            return web.json_response({"label_id": "se-2"})
+
+        async def run(recorder):
+            app = web.Application()
+            app.router.add_post("/v1/labels", label)
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                config = dict(stub_config(), instrumentation=recorder)
+                config["base_uri"] = str(server.make_url("/"))
+                async with AsyncShipEngine(config) as shipengine:
+                    await shipengine.create_label_from_shipment({"shipment": {}})
+            finally:
+                await server.close()
+
+        recorder = Recorder()
+        asyncio.run(run(recorder))
+
+        self.assertEqual(recorder.calls, [("start", 0), ("end", 0, 200)])
+        self.assertEqual(recorder.last.endpoint, "v1/labels")
+        self.assertEqual(recorder.last.bytes_sent, len(b'{"shipment":{}}'))
+        self.assertGreater(recorder.last.bytes_received, 0)
+
+
+class TestMetricsAggregator(unittest.TestCase):
+    def test_histogram_quantiles(self) -> None:
+        histogram = Histogram(buckets=(0.1, 0.2, 0.4))
+        for value in (0.05,) * 98 + (0.3, 1.0):
+            histogram.observe(value)
+
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.1 * 50 / 98)
+        self.assertAlmostEqual(histogram.quantile(0.99), 0.4)
+        self.assertEqual(histogram.quantile(1.0), 0.4)
+        self.assertIsNone(Histogram().quantile(0.5))
+
+    def test_prometheus_exposition(self) -> None:
+        metrics = MetricsAggregator(buckets=(0.1, 1.0))
+        recorder = Recorder()
+        with responses.RequestsMock() as mock:
+            mock.add(
+                responses.GET,
+                TRACK_URL,
+                json={"status_code": "DE"},
+                headers={"X-Rate-Limit-Remaining": "42"},
+            )
+            config = dict(stub_config(), instrumentation=[metrics, recorder])
+            ShipEngine(config).track_package_by_label_id("se-1")
+
+        text = metrics.to_prometheus()
+        labels = 'method="GET",endpoint="v1/labels/{id}/track"'
+        self.assertIn("# TYPE shipengine_request_duration_seconds histogram", text)
+        self.assertIn(f'shipengine_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1', text)
+        self.assertIn(f"shipengine_request_duration_seconds_count{{{labels}}} 1", text)
+        self.assertIn(f'shipengine_requests_total{{{labels},status="200"}} 1', text)
+        self.assertIn(f"shipengine_retries_total{{{labels}}} 0", text)
+        self.assertIn("shipengine_rate_limit_remaining 42", text)
+        self.assertTrue(text.endswith("\n"))
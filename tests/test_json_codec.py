@@ -0,0 +1,75 @@
+"""Testing the pluggable JSON codec used for request and response bodies."""
+
+import json
+import unittest
+import urllib.parse as urlparse
+
+import responses
+
+from shipengine import JSONCodec, ShipEngine, ShipEngineConfig
+from shipengine.enums import BaseURL, Endpoints
+from shipengine.errors import InvalidFieldValueError
+from shipengine.json_codec import STDLIB_CODEC
+from tests.util import stub_config
+
+RATES_URL = urlparse.urljoin(
+    BaseURL.SHIPENGINE_RPC_URL.value, Endpoints.GET_RATE_FROM_SHIPMENT.value
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class TestJSONCodec(unittest.TestCase):
+    def test_stdlib_codec_is_the_default(self) -> None:
+        config = ShipEngineConfig(stub_config())
+
+        self.assertIs(config.json_codec, STDLIB_CODEC)
+        self.assertEqual(config.json_codec.encode({"a": "é"}), '{"a":"é"}'.encode("utf-8"))
+
+    @unittest.skipIf(orjson is None, "requires orjson")
+    def test_orjson_codec(self) -> None:
+        config = ShipEngineConfig(dict(stub_config(), json_codec="orjson"))
+
+        self.assertEqual(config.json_codec.name, "orjson")
+        self.assertEqual(config.json_codec.decode(config.json_codec.encode([1, "a"])), [1, "a"])
+
+    def test_callable_pair_returning_str_is_encoded(self) -> None:
+        config = ShipEngineConfig(dict(stub_config(), json_codec=(json.dumps, json.loads)))
+
+        self.assertIsInstance(config.json_codec, JSONCodec)
+        self.assertEqual(config.json_codec.encode({"a": 1}), b'{"a": 1}')
+
+    def test_invalid_codec_raises(self) -> None:
+        with self.assertRaises(InvalidFieldValueError):
+            ShipEngineConfig(dict(stub_config(), json_codec="yaml"))
+
+    def test_codec_survives_merge_and_to_json(self) -> None:
+        codec = JSONCodec(dumps=json.dumps, loads=json.loads, name="mine")
+        config = ShipEngineConfig(dict(stub_config(), json_codec=codec))
+
+        self.assertIs(config.merge({"timeout": 5}).json_codec, codec)
+        self.assertEqual(json.loads(config.to_json())["json_codec"]["name"], "mine")
+
+    @responses.activate
+    def test_codec_is_used_for_requests_and_responses(self) -> None:
+        calls = []
+
+        def dumps(obj) -> bytes:
+            calls.append("dumps")
+            return json.dumps(obj).encode("utf-8")
+
+        def loads(data: bytes):
+            calls.append("loads")
+            return json.loads(data)
+
+        responses.add(responses.POST, RATES_URL, json={"rate_response": {"rates": []}})
+        shipengine = ShipEngine(dict(stub_config(), json_codec=(dumps, loads)))
+
+        result = shipengine.get_rates_from_shipment({"shipment_id": "se-1"})
+
+        self.assertEqual(calls, ["dumps", "loads"])
+        self.assertEqual(result, {"rate_response": {"rates": []}})
+        self.assertEqual(json.loads(responses.calls[0].request.body), {"shipment_id": "se-1"})
@@ -0,0 +1,130 @@
+"""Testing the RetryPolicy and how the ShipEngineClient applies it."""
+
+import time
+import unittest
+import urllib.parse as urlparse
+
+import responses
+
+from shipengine import RetryPolicy, ShipEngine, ShipEngineConfig
+from shipengine.enums import BaseURL, Endpoints, ErrorSource
+from shipengine.errors import (
+    ClientSystemError,
+    ClientTimeoutError,
+    InvalidFieldValueError,
+    RateLimitExceededError,
+    ValidationError,
+)
+from tests.util import stub_config
+
+CARRIERS_URL = urlparse.urljoin(BaseURL.SHIPENGINE_RPC_URL.value, Endpoints.LIST_CARRIERS.value)
+RATES_URL = urlparse.urljoin(
+    BaseURL.SHIPENGINE_RPC_URL.value, Endpoints.GET_RATE_FROM_SHIPMENT.value
+)
+
+
+def fast_retries(**kwargs) -> dict:
+    """A config dictionary whose retry policy does not actually wait."""
+    return dict(
+        stub_config(retries=kwargs.pop("retries", 3)),
+        retry_policy=dict(backoff_base=0, **kwargs),
+    )
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_backoff_has_full_jitter_and_cap(self) -> None:
+        policy = RetryPolicy(backoff_base=1, backoff_cap=4)
+        delays = [policy.backoff(attempt=attempt) for attempt in range(10) for _ in range(20)]
+
+        self.assertTrue(all(0 <= delay <= 4 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_retryable_errors(self) -> None:
+        policy = RetryPolicy()
+        server_error = ClientSystemError(message="Bad gateway.")
+        rate_limited = RateLimitExceededError(retry_after=3)
+
+        self.assertIsNotNone(policy.retry_delay(server_error, attempt=0, http_method="GET"))
+        self.assertEqual(policy.retry_delay(rate_limited, attempt=0, http_method="POST"), 3)
+        self.assertIsNone(policy.retry_delay(ValidationError("bad"), attempt=0, http_method="GET"))
+
+    def test_non_idempotent_requests_are_not_retried_by_default(self) -> None:
+        server_error = ClientSystemError(message="Bad gateway.")
+
+        self.assertIsNone(RetryPolicy().retry_delay(server_error, attempt=0, http_method="POST"))
+        self.assertIsNotNone(
+            RetryPolicy(retry_non_idempotent=True).retry_delay(
+                server_error, attempt=0, http_method="POST"
+            )
+        )
+
+    def test_attempt_timeout_respects_deadline(self) -> None:
+        policy = RetryPolicy(deadline=5)
+        deadline = policy.start_deadline()
+
+        self.assertLessEqual(policy.attempt_timeout(deadline, delay=2, timeout=60), 3)
+        self.assertEqual(policy.attempt_timeout(None, delay=2, timeout=60), 60)
+        with self.assertRaises(ClientTimeoutError):
+            policy.attempt_timeout(deadline, delay=10, timeout=60)
+
+    def test_config_accepts_dict_or_policy(self) -> None:
+        policy = RetryPolicy(deadline=10)
+
+        self.assertIs(
+            ShipEngineConfig(dict(stub_config(), retry_policy=policy)).retry_policy, policy
+        )
+        config = ShipEngineConfig(dict(stub_config(), retry_policy={"backoff_cap": 2}))
+        self.assertEqual(config.retry_policy.backoff_cap, 2)
+        self.assertIsInstance(config.to_json(), str)
+
+    def test_invalid_retry_policy(self) -> None:
+        with self.assertRaises(InvalidFieldValueError):
+            ShipEngineConfig(dict(stub_config(), retry_policy="fast"))
+        with self.assertRaises(InvalidFieldValueError):
+            ShipEngineConfig(dict(stub_config(), retry_policy={"deadline": 0}))
+
+
+class TestRetryingRequests(unittest.TestCase):
+    @responses.activate
+    def test_get_is_retried_after_server_error(self) -> None:
+        responses.add(responses.GET, CARRIERS_URL, body="<html>Bad Gateway</html>", status=502)
+        responses.add(responses.GET, CARRIERS_URL, json={"carriers": []}, status=200)
+
+        result = ShipEngine(fast_retries()).list_carriers()
+
+        self.assertEqual(result, {"carriers": []})
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_retries_are_not_multiplied(self) -> None:
+        responses.add(responses.GET, CARRIERS_URL, json={"request_id": "1"}, status=503)
+
+        with self.assertRaises(ClientSystemError) as ctx:
+            ShipEngine(fast_retries(retries=2)).list_carriers()
+
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(ctx.exception.error_source, ErrorSource.SHIPENGINE.value)
+
+    @responses.activate
+    def test_post_is_not_retried_after_server_error(self) -> None:
+        responses.add(responses.POST, RATES_URL, json={"request_id": "1"}, status=500)
+
+        with self.assertRaises(ClientSystemError):
+            ShipEngine(fast_retries()).get_rates_from_shipment({"shipment": {}})
+
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_deadline_bounds_total_time(self) -> None:
+        responses.add(responses.GET, CARRIERS_URL, json={"request_id": "1"}, status=503)
+        config = dict(
+            stub_config(retries=100),
+            retry_policy=dict(backoff_base=0.05, backoff_cap=0.05, deadline=0.3),
+        )
+
+        start = time.monotonic()
+        with self.assertRaises((ClientSystemError, ClientTimeoutError)):
+            ShipEngine(config).list_carriers()
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertLess(len(responses.calls), 100)
@@ -201,6 +201,25 @@ class TestShipEngineConfig:
         assert config.page_size == 50
         assert config.timeout == 60
         assert config.base_uri is BaseURL.SHIPENGINE_RPC_URL.value
+        assert config.pool_connections == 10
+        assert config.pool_maxsize == 10
+        assert config.pool_block is False
+
+    def test_invalid_pool_maxsize_provided(self) -> None:
+        """Test that a connection pool must hold at least one connection."""
+        with pytest.raises(InvalidFieldValueError) as exc_info:
+            ShipEngineConfig(dict(api_key="baz_sim", pool_maxsize=0))
+        timeout_validation_error_assertions(exc_info.value)
+        assert exc_info.value.field_name == "pool_maxsize"
+
+    def test_merge_keeps_unmodified_values(self) -> None:
+        """Test that merging a method-level config only overrides the provided values."""
+        config = ShipEngineConfig(dict(stub_config(), pool_maxsize=25))
+        merged = config.merge(dict(timeout=5))
+
+        assert merged.timeout == 5
+        assert merged.retries == config.retries
+        assert merged.pool_maxsize == 25
 
     def test_to_dict_method(self) -> None:
         """Test the to_dict convenience method."""
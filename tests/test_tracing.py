@@ -0,0 +1,118 @@
+"""Testing the spans opened around SDK requests."""
+
+import asyncio
+import unittest
+import urllib.parse as urlparse
+
+import responses
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from shipengine import AsyncShipEngine, ShipEngine
+from shipengine.enums import BaseURL
+from shipengine.errors import ClientSystemError, InvalidFieldValueError
+from shipengine.tracing import RecordingTracer
+from tests.util import stub_config
+
+TRACK_URL = urlparse.urljoin(BaseURL.SHIPENGINE_RPC_URL.value, "v1/labels/se-1/track")
+SERVER_ERROR = {
+    "request_id": "1",
+    "errors": [{"message": "Down.", "error_type": "system", "error_code": "unspecified"}],
+}
+
+
+def traced_config(api_key: str, tracer: RecordingTracer, **config):
+    return dict(
+        stub_config(),
+        api_key=api_key,
+        tracer=tracer,
+        retry_policy={"backoff_base": 0.01},
+        **config,
+    )
+
+
+class TestTracing(unittest.TestCase):
+    def test_invalid_tracer(self) -> None:
+        with self.assertRaises(InvalidFieldValueError):
+            ShipEngine(dict(stub_config(), tracer=object()))
+
+    @responses.activate
+    def test_parent_and_attempt_spans(self) -> None:
+        responses.add(
+            responses.GET,
+            TRACK_URL,
+            json={"request_id": "1", "errors": []},
+            status=429,
+            headers={"Retry-After": "0.05"},
+        )
+        responses.add(responses.GET, TRACK_URL, json=SERVER_ERROR, status=500)
+        responses.add(responses.GET, TRACK_URL, json={"status_code": "DE"})
+        tracer = RecordingTracer()
+
+        ShipEngine(traced_config("TEST_traced", tracer, retries=2)).track_package_by_label_id(
+            "se-1"
+        )
+
+        parent = tracer.spans[-1]
+        self.assertEqual(parent.name, "shipengine GET v1/labels/{id}/track")
+        self.assertIsNone(parent.parent)
+        self.assertEqual(parent.attributes["shipengine.retries"], 2)
+        self.assertGreaterEqual(parent.attributes["shipengine.rate_limit.wait"], 0.04)
+        self.assertGreater(parent.attributes["shipengine.retry.wait"], 0)
+        self.assertEqual(
+            [attributes["error.type"] for _, attributes in parent.events],
+            ["RateLimitExceededError", "ClientSystemError"],
+        )
+
+        attempts = tracer.children(parent)
+        self.assertEqual([span.name for span in attempts], ["GET", "GET", "GET"])
+        self.assertEqual(
+            [span.attributes["http.response.status_code"] for span in attempts], [429, 500, 200]
+        )
+        self.assertNotIn("http.request.resend_count", attempts[0].attributes)
+        self.assertEqual(attempts[2].attributes["http.request.resend_count"], 2)
+        self.assertEqual(attempts[2].attributes["url.full"], TRACK_URL)
+        self.assertGreaterEqual(attempts[1].attributes["shipengine.rate_limit.wait"], 0.04)
+        self.assertIn("shipengine.deserialize.duration", attempts[2].attributes)
+        self.assertEqual(attempts[0].attributes["error.type"], "RateLimitExceededError")
+
+    @responses.activate
+    def test_failed_request_records_the_error(self) -> None:
+        responses.add(responses.GET, TRACK_URL, json=SERVER_ERROR, status=500)
+        tracer = RecordingTracer()
+
+        with self.assertRaises(ClientSystemError):
+            ShipEngine(
+                traced_config("TEST_traced_error", tracer, retries=0)
+            ).track_package_by_label_id("se-1")
+
+        attempt, parent = tracer.spans
+        self.assertIs(attempt.parent, parent)
+        self.assertIsInstance(parent.exception, ClientSystemError)
+        self.assertIsInstance(attempt.exception, ClientSystemError)
+
+    def test_async_spans(self) -> None:
+        async def label(request: web.Request) -> web.Response:
+            return web.json_response({"label_id": "se-2"})
+
+        async def run(tracer):
+            app = web.Application()
+            app.router.add_post("/v1/labels", label)
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                config = traced_config("TEST_traced_async", tracer)
+                config["base_uri"] = str(server.make_url("/"))
+                async with AsyncShipEngine(config) as shipengine:
+                    await shipengine.create_label_from_shipment({"shipment": {}})
+            finally:
+                await server.close()
+
+        tracer = RecordingTracer()
+        asyncio.run(run(tracer))
+
+        attempt, parent = tracer.spans
+        self.assertEqual(parent.name, "shipengine POST v1/labels")
+        self.assertIs(attempt.parent, parent)
+        self.assertEqual(attempt.attributes["http.request.body.size"], len(b'{"shipment":{}}'))
+        self.assertEqual(attempt.attributes["http.response.status_code"], 200)
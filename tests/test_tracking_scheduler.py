@@ -0,0 +1,166 @@
+"""Testing the adaptive tracking poll scheduler."""
+
+import unittest
+import urllib.parse as urlparse
+from concurrent.futures import Future
+
+import responses
+
+from shipengine import ShipEngine, TrackingScheduler
+from shipengine.enums import BaseURL
+from shipengine.errors import ClientSystemError
+from tests.util import stub_config
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeShipEngine:
+    """Answers tracking requests from a dictionary of statuses, or errors, by tracking number."""
+
+    def __init__(self) -> None:
+        self.statuses = dict()
+        self.calls = []
+
+    def submit(self, method_name: str, *args) -> Future:
+        self.calls.append((method_name, args))
+        future: Future = Future()
+        status = self.statuses.get(args[-1], "IT")
+        if isinstance(status, Exception):
+            future.set_exception(status)
+        else:
+            status_code, _, detail = status.partition("/")
+            future.set_result({"status_code": status_code, "status_detail_code": detail or None})
+        return future
+
+
+def scheduler(requests_per_hour: float = 3600, **kwargs):
+    clock, shipengine = FakeClock(), FakeShipEngine()
+    tracking = TrackingScheduler(
+        shipengine, requests_per_hour=requests_per_hour, jitter=0, clock=clock, **kwargs
+    )
+    return tracking, shipengine, clock
+
+
+class TestTrackingScheduler(unittest.TestCase):
+    def test_poll_interval_depends_on_status(self) -> None:
+        tracking, shipengine, clock = scheduler()
+        shipengine.statuses = {"1": "IT", "2": "IT/OUT_FOR_DELIVERY", "3": "DE"}
+        shipments = [tracking.track("ups", number) for number in ("1", "2", "3")]
+
+        tracking.run_pending()
+
+        self.assertEqual(shipments[0].next_poll_at, clock.now + 6 * 60 * 60)
+        self.assertEqual(shipments[1].next_poll_at, clock.now + 30 * 60)
+        self.assertTrue(shipments[2].retired)
+        self.assertEqual(len(tracking), 2)
+        self.assertEqual(tracking.next_poll_at(), clock.now + 30 * 60)
+
+    def test_only_due_shipments_are_polled(self) -> None:
+        tracking, shipengine, clock = scheduler()
+        shipengine.statuses = {"1": "IT", "2": "IT/OUT_FOR_DELIVERY"}
+        tracking.track("ups", "1")
+        tracking.track("ups", "2")
+        tracking.run_pending()
+
+        clock.now += 31 * 60
+        polled = tracking.run_pending()
+
+        self.assertEqual([shipment.tracking_number for shipment in polled], ["2"])
+
+    def test_budget_is_respected(self) -> None:
+        tracking, shipengine, clock = scheduler(requests_per_hour=360, burst=5)
+        for number in range(20):
+            tracking.track("ups", str(number))
+
+        self.assertEqual(len(tracking.run_pending()), 5)
+        self.assertEqual(len(tracking.run_pending()), 0)
+
+        clock.now += 30  # 360 requests an hour is one every 10 seconds.
+        self.assertEqual(len(tracking.run_pending()), 3)
+        self.assertEqual(len(shipengine.calls), 8)
+
+    def test_failed_polls_are_retried_then_retired(self) -> None:
+        tracking, shipengine, clock = scheduler(max_errors=2)
+        shipengine.statuses = {"1": ClientSystemError(message="Down.")}
+        updates = []
+        tracking.on_update = lambda shipment, result: updates.append(result)
+        shipment = tracking.track("ups", "1")
+
+        tracking.run_pending()
+        self.assertEqual(shipment.next_poll_at, clock.now + tracking.error_interval)
+
+        clock.now += tracking.error_interval
+        tracking.run_pending()
+        self.assertTrue(shipment.retired)
+        self.assertEqual(updates, [None, None])
+
+    def test_unexpected_errors_are_rescheduled_with_backoff(self) -> None:
+        tracking, shipengine, clock = scheduler(max_errors=3)
+        shipengine.statuses = {"1": ValueError("Unexpected body."), "2": "IT"}
+        failing, other = tracking.track("ups", "1"), tracking.track("ups", "2")
+
+        self.assertEqual(tracking.run_pending(), [failing, other])
+        self.assertIsInstance(failing.last_error, ValueError)
+        self.assertEqual(failing.next_poll_at, clock.now + tracking.error_interval)
+        self.assertEqual(other.status_code, "IT")
+
+        clock.now += tracking.error_interval
+        tracking.run_pending()
+        self.assertEqual(failing.errors, 2)
+        self.assertEqual(failing.next_poll_at, clock.now + 2 * tracking.error_interval)
+        self.assertIn(failing, tracking)
+
+    def test_failing_callback_does_not_strand_shipments(self) -> None:
+        def on_update(shipment, result):
+            raise RuntimeError("Callback failed.")
+
+        tracking, shipengine, clock = scheduler(on_update=on_update)
+        shipments = [tracking.track("ups", number) for number in ("1", "2", "3")]
+
+        with self.assertLogs("shipengine.tracking_scheduler", level="ERROR") as logs:
+            self.assertEqual(tracking.run_pending(), shipments)
+
+        self.assertEqual(len(logs.records), 3)
+        for shipment in shipments:
+            self.assertEqual(shipment.next_poll_at, clock.now + 6 * 60 * 60)
+        clock.now += 6 * 60 * 60
+        self.assertEqual(len(tracking.run_pending()), 3)
+
+    def test_untrack_and_duplicates(self) -> None:
+        tracking, shipengine, clock = scheduler()
+        first = tracking.track_label("se-1")
+
+        self.assertIs(tracking.track_label("se-1"), first)
+        tracking.untrack(first)
+        self.assertEqual(tracking.run_pending(), [])
+        self.assertIsNone(tracking.next_poll_at())
+
+    def test_run_stops_once_every_shipment_is_retired(self) -> None:
+        tracking, shipengine, clock = scheduler()
+        shipengine.statuses = {"1": "DE"}
+        tracking.track("ups", "1")
+
+        tracking.run()
+
+        self.assertEqual(len(tracking), 0)
+
+    @responses.activate
+    def test_polls_go_through_shipengine(self) -> None:
+        responses.add(
+            responses.GET,
+            urlparse.urljoin(BaseURL.SHIPENGINE_RPC_URL.value, "v1/labels/se-1/track"),
+            json={"status_code": "DE"},
+        )
+        with ShipEngine(stub_config()) as shipengine:
+            tracking = TrackingScheduler(shipengine, requests_per_hour=100)
+            shipment = tracking.track_label("se-1")
+            tracking.run_pending()
+
+        self.assertEqual(shipment.status_code, "DE")
+        self.assertTrue(shipment.retired)
@@ -0,0 +1,133 @@
+"""Testing the record and replay of SDK traffic with cassettes."""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from shipengine import AsyncShipEngine, ShipEngine
+from shipengine.testing import (
+    CassetteMissError,
+    RecordingTransport,
+    ReplayTransport,
+    StubResponse,
+    StubTransport,
+)
+from shipengine.testing.cassette import body_hash, load_cassette
+from tests.util import stub_config
+
+SHIPMENT = {"shipment": {"carrier_id": "se-656172", "service_code": "ups_ground"}}
+
+
+def cassette_shipengine(api_key: str, transport, retries: int = 1) -> ShipEngine:
+    return ShipEngine(dict(stub_config(retries=retries), api_key=api_key, transport=transport))
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "traffic.jsonl")
+
+    def record(self, path: str, stub: StubTransport) -> dict:
+        recorder = RecordingTransport(path, transport=stub, async_transport=stub)
+        shipengine = cassette_shipengine("TEST_cassette_record", recorder)
+        responses = {
+            "carriers": shipengine.list_carriers(),
+            "label": shipengine.create_label_from_shipment(SHIPMENT),
+            "tracking": shipengine.track_package_by_label_id("se-1"),
+        }
+        recorder.close()
+        return responses
+
+    def test_body_hash_is_canonical(self) -> None:
+        self.assertEqual(body_hash(b'{"a": 1, "b": [2]}'), body_hash(b'{"b":[2],"a":1}'))
+        self.assertNotEqual(body_hash(b'{"a": 1}'), body_hash(b'{"a": 2}'))
+        self.assertIsNone(body_hash(None))
+
+    def test_record_and_replay(self) -> None:
+        recorded = self.record(self.path, StubTransport())
+        interactions = load_cassette(self.path)
+        self.assertEqual(
+            [(i.http_method, i.endpoint) for i in interactions],
+            [("GET", "v1/carriers"), ("POST", "v1/labels"), ("GET", "v1/labels/se-1/track")],
+        )
+        self.assertEqual(interactions[1].body_hash, body_hash(json.dumps(SHIPMENT).encode()))
+        self.assertIsNone(interactions[0].body_hash)
+
+        shipengine = cassette_shipengine("TEST_cassette_replay", ReplayTransport(self.path))
+        self.assertEqual(shipengine.list_carriers(), recorded["carriers"])
+        self.assertEqual(shipengine.create_label_from_shipment(SHIPMENT), recorded["label"])
+        self.assertEqual(shipengine.track_package_by_label_id("se-1"), recorded["tracking"])
+
+    def test_replay_by_endpoint_template(self) -> None:
+        recorded = self.record(self.path, StubTransport())
+        shipengine = cassette_shipengine("TEST_cassette_template", ReplayTransport(self.path))
+        self.assertEqual(shipengine.track_package_by_label_id("se-2"), recorded["tracking"])
+        label = shipengine.create_label_from_shipment({"shipment": {"service_code": "x"}})
+        self.assertEqual(label, recorded["label"])
+
+        replay = ReplayTransport(self.path, strict=True)
+        strict = cassette_shipengine("TEST_cassette_strict", replay, retries=2)
+        with mock.patch.object(replay, "match", wraps=replay.match) as match:
+            with self.assertRaises(CassetteMissError) as raised:
+                strict.track_package_by_label_id("se-2")
+        self.assertEqual(match.call_count, 1)
+        self.assertIn("v1/labels/se-2/track", raised.exception.message)
+
+    def test_recorded_errors_and_sequences(self) -> None:
+        stub = StubTransport()
+        stub.add(
+            "GET v1/carriers",
+            [StubResponse.rate_limited(retry_after=0), StubResponse({"carriers": []})],
+        )
+        recorder = RecordingTransport(self.path, transport=stub)
+        cassette_shipengine("TEST_cassette_sequence", recorder).list_carriers()
+        recorder.close()
+        self.assertEqual([i.status_code for i in load_cassette(self.path)], [429, 200])
+        self.assertEqual(load_cassette(self.path)[0].headers["Retry-After"], "0")
+
+        replay = ReplayTransport(self.path)
+        shipengine = cassette_shipengine("TEST_cassette_sequence_replay", replay)
+        self.assertEqual(shipengine.list_carriers(), {"carriers": []})
+        self.assertEqual(shipengine.list_carriers(), {"carriers": []})
+
+    def test_latency_scale(self) -> None:
+        self.record(self.path, StubTransport(latency=0.05))
+        started = time.perf_counter()
+        cassette_shipengine(
+            "TEST_cassette_fast", ReplayTransport(self.path, latency_scale=0)
+        ).list_carriers()
+        self.assertLess(time.perf_counter() - started, 0.04)
+
+        started = time.perf_counter()
+        cassette_shipengine(
+            "TEST_cassette_slow", ReplayTransport(self.path, latency_scale=2)
+        ).list_carriers()
+        self.assertGreaterEqual(time.perf_counter() - started, 0.1)
+
+    def test_gzip_cassette(self) -> None:
+        path = self.path + ".gz"
+        recorded = self.record(path, StubTransport())
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(2), b"\x1f\x8b")
+        shipengine = cassette_shipengine("TEST_cassette_gzip", ReplayTransport(path))
+        self.assertEqual(shipengine.list_carriers(), recorded["carriers"])
+
+    def test_async_replay(self) -> None:
+        recorded = self.record(self.path, StubTransport())
+
+        async def run():
+            async with AsyncShipEngine(
+                dict(
+                    stub_config(),
+                    api_key="TEST_cassette_async",
+                    transport=ReplayTransport(self.path),
+                )
+            ) as shipengine:
+                return await shipengine.list_carriers()
+
+        self.assertEqual(asyncio.run(run()), recorded["carriers"])
@@ -0,0 +1,97 @@
+"""Testing the SDK clients against the local stand-in server."""
+
+import asyncio
+import unittest
+
+from shipengine import AsyncShipEngine, ShipEngine
+from shipengine.errors import ClientSystemError
+from shipengine.testing import (
+    StubResponse,
+    StubServer,
+    StubTransport,
+    latency_distribution,
+)
+from tests.util import stub_config
+
+
+class TestStubServer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.transport = StubTransport()
+        self.server = StubServer(self.transport).start()
+        self.addCleanup(self.server.stop)
+
+    def shipengine(self, api_key: str, **config) -> ShipEngine:
+        return ShipEngine(
+            dict(
+                stub_config(retries=2),
+                api_key=api_key,
+                base_uri=self.server.url,
+                retry_policy={"backoff_base": 0.01},
+                **config,
+            )
+        )
+
+    def test_endpoints(self) -> None:
+        shipengine = self.shipengine("TEST_server_endpoints")
+        self.assertEqual(len(shipengine.list_carriers()["carriers"]), 3)
+        rates = shipengine.get_rates_from_shipment(
+            {"shipment": {}, "rate_options": {"carrier_ids": ["se-656172"]}}
+        )
+        self.assertEqual(rates["rate_response"]["rates"][0]["carrier_id"], "se-656172")
+        label = shipengine.create_label_from_rate_id(
+            rates["rate_response"]["rates"][0]["rate_id"], {}
+        )
+        self.assertIn("label_id", label)
+        self.assertIn("approved", shipengine.void_label_by_label_id(label["label_id"], {}))
+        validated = shipengine.validate_addresses([{"address_line1": "4 Jersey St"}])
+        self.assertEqual(validated[0]["status"], "verified")
+        self.assertEqual(
+            self.transport.calls,
+            {
+                "GET v1/carriers": 1,
+                "POST v1/rates": 1,
+                "POST v1/labels/rates/{id}": 1,
+                "PUT v1/labels/{id}/void": 1,
+                "POST v1/addresses/validate": 1,
+            },
+        )
+
+    def test_rate_limited_and_server_errors_are_retried(self) -> None:
+        self.transport.add(
+            "GET v1/carriers",
+            [
+                StubResponse.rate_limited(retry_after=0),
+                StubResponse.server_error(503),
+                StubResponse({"carriers": []}),
+            ],
+        )
+        shipengine = self.shipengine("TEST_server_retries")
+        self.assertEqual(shipengine.list_carriers(), {"carriers": []})
+        self.assertEqual(self.transport.calls["GET v1/carriers"], 3)
+
+    def test_server_errors(self) -> None:
+        self.transport.failures = {500: 1.0}
+        with self.assertRaises(ClientSystemError):
+            self.shipengine("TEST_server_errors", retries=0).list_carriers()
+
+    def test_async_client(self) -> None:
+        async def run():
+            async with AsyncShipEngine(
+                dict(stub_config(), api_key="TEST_server_async", base_uri=self.server.url)
+            ) as shipengine:
+                return await shipengine.track_package_by_label_id("se-28529731")
+
+        self.assertIn("events", asyncio.run(run()))
+
+
+class TestLatencyDistribution(unittest.TestCase):
+    def test_distributions(self) -> None:
+        self.assertEqual(latency_distribution("0.25")(), 0.25)
+        uniform = latency_distribution("uniform:0.1,0.2", seed=1)
+        self.assertTrue(all(0.1 <= uniform() <= 0.2 for _ in range(100)))
+        normal = latency_distribution("normal:0,1", seed=1)
+        self.assertTrue(all(normal() >= 0 for _ in range(100)))
+        lognormal = latency_distribution("lognormal:0.1,0.5", seed=1)
+        self.assertAlmostEqual(sorted(lognormal() for _ in range(1001))[500], 0.1, delta=0.01)
+        with self.assertRaises(ValueError):
+            latency_distribution("pareto:1,2")
@@ -0,0 +1,192 @@
+"""Testing the SDK clients against the in-process stub transport."""
+
+import asyncio
+import unittest
+
+import requests
+import responses
+
+from shipengine import AsyncShipEngine, ShipEngine
+from shipengine.errors import (
+    ClientSystemError,
+    InvalidFieldValueError,
+    ShipEngineError,
+)
+from shipengine.http_client.transport import (
+    AsyncTransport,
+    RequestsTransport,
+    Transport,
+    TransportRequest,
+    TransportResponse,
+)
+from shipengine.testing import StubResponse, StubTransport
+from tests.util import stub_config
+
+DOWNLOAD = "v1/downloads/10/uths7PctKUqbM4hKYcKfTQ/label-1013119.pdf"
+DOWNLOAD_ROUTE = "GET v1/downloads/{id}/{id}/{id}"
+
+
+def stub_shipengine(api_key: str, transport, retries: int = 2, **config) -> ShipEngine:
+    return ShipEngine(
+        dict(
+            stub_config(retries=retries),
+            api_key=api_key,
+            transport=transport,
+            retry_policy={"backoff_base": 0.01},
+            **config,
+        )
+    )
+
+
+class TestStubTransport(unittest.TestCase):
+    def test_invalid_transport(self) -> None:
+        with self.assertRaises(InvalidFieldValueError):
+            ShipEngine(dict(stub_config(), transport=object()))
+
+    def test_fixture_responses(self) -> None:
+        transport = StubTransport()
+        shipengine = stub_shipengine("TEST_stub_fixtures", transport)
+
+        carriers = shipengine.list_carriers()["carriers"]
+        self.assertEqual(len(carriers), 3)
+        tracking = shipengine.track_package_by_label_id("se-28529731")
+        self.assertIn("events", tracking)
+        label = shipengine.create_label_from_rate_id("se-1234", {})
+        self.assertTrue(label["label_id"].startswith("se-"))
+
+        self.assertEqual(transport.calls["GET v1/carriers"], 1)
+        self.assertEqual(transport.calls["GET v1/labels/{id}/track"], 1)
+        self.assertEqual(transport.calls["POST v1/labels/rates/{id}"], 1)
+
+    def test_shop_rates(self) -> None:
+        shipengine = stub_shipengine("TEST_stub_shop_rates", StubTransport())
+        result = shipengine.shop_rates(
+            {"shipment": {}}, carrier_ids=["se-656171", "se-656172", "se-656173"]
+        )
+        self.assertEqual(result.errors, dict())
+        self.assertEqual(len(result.responses), 3)
+        self.assertEqual(
+            {rate["carrier_id"] for rate in result.rates}, {"se-656171", "se-656172", "se-656173"}
+        )
+
+    def test_routes_override_fixtures(self) -> None:
+        transport = StubTransport(
+            routes={"GET v1/carriers": StubResponse({"carriers": [], "request_id": "1"})}
+        )
+        shipengine = stub_shipengine("TEST_stub_routes", transport)
+        self.assertEqual(shipengine.list_carriers()["carriers"], [])
+
+    def test_response_sequence_is_retried(self) -> None:
+        transport = StubTransport()
+        transport.add(
+            "GET v1/carriers",
+            [
+                StubResponse.rate_limited(retry_after=0),
+                StubResponse.server_error(503),
+                StubResponse({"carriers": [{"carrier_id": "se-1"}]}),
+            ],
+        )
+        shipengine = stub_shipengine("TEST_stub_sequence", transport)
+        self.assertEqual(shipengine.list_carriers()["carriers"], [{"carrier_id": "se-1"}])
+        self.assertEqual(transport.calls["GET v1/carriers"], 3)
+
+    def test_unknown_route(self) -> None:
+        shipengine = stub_shipengine("TEST_stub_unknown", StubTransport(fixtures_fallback=False))
+        with self.assertRaises(ShipEngineError) as err:
+            shipengine.list_carriers()
+        self.assertEqual(err.exception.error_code, "not_found")
+
+    def test_injected_failures(self) -> None:
+        transport = StubTransport(failures={500: 1.0})
+        shipengine = stub_shipengine("TEST_stub_failures", transport, retries=1)
+        with self.assertRaises(ClientSystemError):
+            shipengine.list_carriers()
+        self.assertEqual(transport.calls["GET v1/carriers"], 2)
+
+    def test_custom_transport(self) -> None:
+        class EchoTransport(Transport):
+            def __init__(self) -> None:
+                self.requests = list()
+
+            def send(self, request: TransportRequest) -> TransportResponse:
+                self.requests.append(request)
+                return TransportResponse(200, {}, request.body)
+
+        transport = EchoTransport()
+        shipengine = stub_shipengine("TEST_stub_custom", transport)
+        address = [{"address_line1": "4 Jersey St"}]
+        self.assertEqual(shipengine.validate_addresses(address), address)
+        self.assertEqual(transport.requests[0].http_method, "POST")
+        self.assertEqual(transport.requests[0].endpoint, "v1/addresses/validate")
+        self.assertEqual(transport.requests[0].headers["Api-Key"], "TEST_stub_custom")
+
+    def test_transports_are_abstract(self) -> None:
+        class Incomplete(Transport):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+        with self.assertRaises(TypeError):
+            AsyncTransport()
+
+    def test_downloads_go_through_the_transport(self) -> None:
+        transport = StubTransport()
+        transport.add(DOWNLOAD_ROUTE, StubResponse(b"%PDF-1.4 labels"))
+        shipengine = stub_shipengine("TEST_stub_download", transport)
+
+        chunks = list(shipengine.client.download(DOWNLOAD, shipengine.config, chunk_size=4))
+
+        self.assertEqual(b"".join(chunks), b"%PDF-1.4 labels")
+        self.assertEqual(chunks[0], b"%PDF")
+        self.assertEqual(transport.calls[DOWNLOAD_ROUTE], 1)
+        with self.assertRaises(ShipEngineError):
+            list(shipengine.client.download("v1/downloads/missing", shipengine.config))
+
+    @responses.activate
+    def test_requests_transport_errors_keep_their_cause(self) -> None:
+        responses.add(
+            responses.GET,
+            "https://api.shipengine.com/v1/carriers",
+            body=requests.ConnectionError("Connection refused by the stub."),
+        )
+        shipengine = stub_shipengine("TEST_requests_cause", RequestsTransport(), retries=0)
+
+        with self.assertRaises(ClientSystemError) as raised:
+            shipengine.list_carriers()
+
+        self.assertIn("Connection refused by the stub.", raised.exception.message)
+
+
+class TestAsyncStubTransport(unittest.TestCase):
+    def test_async_client(self) -> None:
+        transport = StubTransport(latency=0.01)
+
+        async def run():
+            async with AsyncShipEngine(
+                dict(stub_config(), api_key="TEST_stub_async", transport=transport)
+            ) as shipengine:
+                return await asyncio.gather(
+                    shipengine.list_carriers(),
+                    shipengine.track_package_by_label_id("se-28529731"),
+                )
+
+        carriers, tracking = asyncio.run(run())
+        self.assertEqual(len(carriers["carriers"]), 3)
+        self.assertIn("events", tracking)
+        self.assertEqual(transport.calls["GET v1/carriers"], 1)
+        self.assertEqual(transport.calls["GET v1/labels/{id}/track"], 1)
+
+    def test_async_download(self) -> None:
+        transport = StubTransport()
+        transport.add(DOWNLOAD_ROUTE, StubResponse(b"%PDF-1.4 labels"))
+
+        async def run():
+            async with AsyncShipEngine(
+                dict(stub_config(), api_key="TEST_stub_async_download", transport=transport)
+            ) as shipengine:
+                return [
+                    chunk async for chunk in shipengine.client.download(DOWNLOAD, shipengine.config)
+                ]
+
+        self.assertEqual(b"".join(asyncio.run(run())), b"%PDF-1.4 labels")
+        self.assertEqual(transport.calls[DOWNLOAD_ROUTE], 1)
@@ -0,0 +1,168 @@
+"""Testing the webhook receiver, its dispatcher and the stand-in sender."""
+
+import asyncio
+import io
+import json
+import threading
+import unittest
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+from shipengine.errors import InvalidFieldValueError
+from shipengine.webhooks import (
+    SharedSecretVerifier,
+    WebhookDispatcher,
+    WebhookReceiver,
+    WebhookSender,
+    batch_payload,
+    decode_webhook,
+    tracking_payload,
+)
+
+SECRET_HEADERS = {"X-ShipEngine-Webhook-Secret": "s3cret"}
+
+TRACKING = {
+    "tracking_number": "1Z932R800392060079",
+    "status_code": "DE",
+    "status_description": "Delivered",
+    "events": [{"occurred_at": "2021-07-07T16:31:18Z", "status_code": "DE"}],
+}
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+
+def body(payload) -> bytes:
+    return json.dumps(payload).encode("utf-8")
+
+
+class TestWebhookReceiver(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dispatcher = WebhookDispatcher()
+        self.events = []
+        self.dispatcher.on(None, self.events.append)
+        self.receiver = WebhookReceiver(self.dispatcher, verifier=SharedSecretVerifier("s3cret"))
+
+    def tearDown(self) -> None:
+        self.dispatcher.close()
+
+    def test_decode_tracking_and_batch_payloads(self) -> None:
+        event = decode_webhook(body(tracking_payload(TRACKING, "ups", label_url="https://l")))
+        self.assertEqual(event.resource_type, "API_TRACK")
+        self.assertEqual(event.data, dict(TRACKING, carrier_code="ups"))
+
+        event = decode_webhook(body(batch_payload("se-1013119")))
+        self.assertEqual(event.data, {"batch_id": "se-1013119"})
+
+    def test_rejected_requests(self) -> None:
+        headers = {"x-shipengine-webhook-secret": "s3cret"}
+        payload = body(batch_payload("se-1"))
+
+        self.assertEqual(self.receiver.handle("GET", headers, b"")[0], 405)
+        self.assertEqual(self.receiver.handle("POST", dict(), payload)[0], 401)
+        self.assertEqual(
+            self.receiver.handle("POST", {"x-shipengine-webhook-secret": "guess"}, payload)[0],
+            401,
+        )
+        self.assertEqual(self.receiver.handle("POST", headers, b"not json")[0], 400)
+        self.assertEqual(
+            self.receiver.handle("POST", headers, body({"resource_type": "X"}))[0], 400
+        )
+        self.dispatcher.join()
+        self.assertEqual(self.events, [])
+
+    def test_verifier_is_required(self) -> None:
+        with self.assertRaises(InvalidFieldValueError):
+            WebhookReceiver(self.dispatcher)
+
+        receiver = WebhookReceiver(self.dispatcher, insecure=True)
+        self.assertEqual(receiver.handle("POST", dict(), body(batch_payload("se-1")))[0], 204)
+        self.dispatcher.join()
+        self.assertEqual(self.events[0].data, {"batch_id": "se-1"})
+
+    def test_wsgi_malformed_content_length(self) -> None:
+        for content_length in ("abc", "-1"):
+            statuses = []
+            environ = {
+                "REQUEST_METHOD": "POST",
+                "CONTENT_LENGTH": content_length,
+                "HTTP_X_SHIPENGINE_WEBHOOK_SECRET": "s3cret",
+                "wsgi.input": io.BytesIO(body(batch_payload("se-1"))),
+            }
+            content = self.receiver(environ, lambda status, headers: statuses.append(status))
+            self.assertEqual(statuses, ["400 Bad Request"])
+            self.assertIn(b"Content-Length", b"".join(content))
+        self.dispatcher.join()
+        self.assertEqual(self.events, [])
+
+    def test_full_queue_is_refused(self) -> None:
+        started, release = threading.Event(), threading.Event()
+        dispatcher = WebhookDispatcher(max_queue=1)
+        dispatcher.on_batch(lambda event: started.set() or release.wait(5))
+        receiver = WebhookReceiver(dispatcher, insecure=True)
+        payload = body(batch_payload("se-1"))
+        try:
+            self.assertEqual(receiver.handle("POST", dict(), payload)[0], 204)
+            started.wait(5)
+            self.assertEqual(receiver.handle("POST", dict(), payload)[0], 204)  # Queued.
+            self.assertEqual(receiver.handle("POST", dict(), payload)[0], 503)
+        finally:
+            release.set()
+            dispatcher.close()
+
+    def test_failing_callback_does_not_stop_dispatch(self) -> None:
+        self.dispatcher.on_tracking(lambda event: 1 / 0)
+        self.receiver.handle(
+            "POST",
+            {"x-shipengine-webhook-secret": "s3cret"},
+            body(tracking_payload(TRACKING, "ups")),
+        )
+        self.receiver.handle(
+            "POST", {"x-shipengine-webhook-secret": "s3cret"}, body(batch_payload("se-1"))
+        )
+        self.dispatcher.join()
+
+        self.assertEqual([event.resource_type for event in self.events], ["API_TRACK", "BATCH"])
+
+    def test_wsgi_with_stand_in_sender(self) -> None:
+        server = make_server("127.0.0.1", 0, self.receiver, handler_class=QuietHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_port}/webhooks"
+        try:
+            sender = WebhookSender(url, headers=SECRET_HEADERS)
+            self.assertEqual(sender.send_tracking(TRACKING, "ups"), 204)
+            self.assertEqual(sender.send_batch("se-1013119"), 204)
+            self.assertEqual(WebhookSender(url).send_batch("se-1013119"), 401)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.dispatcher.join()
+
+        self.assertEqual(self.events[0].data["status_code"], "DE")
+        self.assertEqual(self.events[1].data["batch_id"], "se-1013119")
+        self.assertEqual(len(self.events), 2)
+
+    def test_asgi(self) -> None:
+        payload = body(tracking_payload(TRACKING, "ups"))
+        chunks = [payload[:10], payload[10:]]
+        sent = []
+
+        async def receive():
+            chunk = chunks.pop(0)
+            return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "headers": [(b"x-shipengine-webhook-secret", b"s3cret")],
+        }
+        asyncio.run(self.receiver.asgi(scope, receive, send))
+        self.dispatcher.join()
+
+        self.assertEqual(sent[0]["status"], 204)
+        self.assertEqual(self.events[0].data["tracking_number"], TRACKING["tracking_number"])